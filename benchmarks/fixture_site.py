@@ -0,0 +1,294 @@
+"""
+Local stand-in for pracuj.pl and justjoin.it used by the benchmarks.
+
+Pages are rendered from the templates in `benchmarks/templates`, which mirror
+the markup the scrapers' locators and parsers expect. A saved copy of a real
+page can be dropped into `benchmarks/recorded/<host>/<path>.html` and is served
+instead of the template, e.g. `recorded/www.pracuj.pl/praca/x,oferta,1.html`.
+
+Requests are addressed as `http://127.0.0.1:<port>/<host><path>`. The browser
+and the HTTP client are pointed at the server with `route_context` and
+`RewriteTransport`, so the scrapers keep using the real site URLs.
+"""
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from string import Template
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import httpx
+
+BENCHMARKS_DIR = Path(__file__).parent
+TEMPLATES_DIR = BENCHMARKS_DIR / "templates"
+RECORDED_DIR = BENCHMARKS_DIR / "recorded"
+
+SITE_HOSTS = ("pracuj.pl", "www.pracuj.pl", "justjoin.it", "api.justjoin.it")
+
+EMPLOYERS = ["Acme", "Beta Software", "Gamma Labs", "Delta IT", "Epsilon Data"]
+POSITIONS = ["Python Developer", "Test Automation Engineer", "Data Engineer", "Backend Developer", "QA Engineer"]
+SKILLS = ["Python", "Django", "pytest", "Playwright", "Docker", "PostgreSQL", "AWS", "Kubernetes"]
+
+
+@dataclass(frozen=True)
+class FixtureOffer:
+    """Offer served by the fixture site, generated from its number."""
+    number: int
+
+    @property
+    def employer(self) -> str:
+        return EMPLOYERS[self.number % len(EMPLOYERS)]
+
+    @property
+    def position(self) -> str:
+        return POSITIONS[self.number % len(POSITIONS)]
+
+    @property
+    def low(self) -> int:
+        return 8000 + 500 * (self.number % 20)
+
+    @property
+    def skills(self) -> list[str]:
+        start = self.number % len(SKILLS)
+        return (SKILLS * 2)[start:start + 3]
+
+    @property
+    def slug(self) -> str:
+        return f"{self.employer}-{self.position}-{self.number}".lower().replace(" ", "-")
+
+    @property
+    def pracuj_url(self) -> str:
+        return f"https://www.pracuj.pl/praca/{self.slug},oferta,{100000 + self.number}"
+
+
+@dataclass
+class FaultProfile:
+    """
+    Latency and failures injected into responses.
+
+    Args:
+        latency (float): Base delay of every response in seconds.
+        jitter (float): Random extra delay, up to this many seconds.
+        failure_rate (float): Share of offer requests (pages and API) answered with a 503.
+        seed (int): Seed of the random generator, runs with the same seed fail the same way.
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    failure_rate: float = 0.0
+    seed: int = 0
+
+
+class FixtureSite:
+    """Renders listing and offer pages of both sites for a fixed number of offers."""
+
+    def __init__(self, offers: int = 100, pracuj_page_size: int = 50, jjit_page_size: int = 20) -> None:
+        self.offers = [FixtureOffer(number) for number in range(offers)]
+        self.pracuj_page_size = pracuj_page_size
+        self.jjit_page_size = jjit_page_size
+        self.templates = {path.stem: Template(path.read_text(encoding="utf-8"))
+                          for path in TEMPLATES_DIR.glob("*.html")}
+
+    @staticmethod
+    def is_offer_request(host: str, path: str) -> bool:
+        return ",oferta," in path or path.startswith("/job-offer/") or host == "api.justjoin.it"
+
+    def render(self, host: str, path: str, query: dict[str, list[str]]) -> tuple[int, str, str]:
+        """
+        Return status, content type and body for a request.
+
+        Args:
+            host (str): Host of the original URL.
+            path (str): Path of the original URL.
+            query (dict): Parsed query string.
+        """
+        recorded = RECORDED_DIR / host / (path.strip("/") + ".html")
+        if path.strip("/") and recorded.is_file():
+            return 200, "text/html", recorded.read_text(encoding="utf-8")
+        if host.endswith("pracuj.pl"):
+            return self.render_pracuj(path, query)
+        if host == "api.justjoin.it":
+            return self.render_jjit_api(path)
+        return self.render_jjit(path, query)
+
+    def render_pracuj(self, path: str, query: dict) -> tuple[int, str, str]:
+        if path in ("", "/"):
+            return 200, "text/html", self.templates["pracuj_home"].substitute()
+        match = re.search(r",oferta,(\d+)$", path)
+        if match:
+            number = int(match.group(1)) - 100000
+            if not 0 <= number < len(self.offers):
+                return 404, "text/html", "<html><body>Oferta wygasła</body></html>"
+            return 200, "text/html", self.pracuj_offer(self.offers[number])
+        if re.search(r";kw(/[^/]+;wp)?$", path):
+            page_number = int(query.get("pn", ["1"])[0])
+            max_page = max(1, -(-len(self.offers) // self.pracuj_page_size))
+            start = (page_number - 1) * self.pracuj_page_size
+            links = "\n".join(f'<a data-test="link-offer" href="{offer.pracuj_url}?s=bench">{offer.position}</a>'
+                              for offer in self.offers[start:start + self.pracuj_page_size])
+            return 200, "text/html", self.templates["pracuj_results"].substitute(
+                page_number=page_number, max_page=max_page, offers=links)
+        return 404, "text/html", "<html><body>Not found</body></html>"
+
+    def pracuj_offer(self, offer: FixtureOffer) -> str:
+        salary = f"{offer.low:,}–{offer.low + 4000:,} zł brutto / mies.".replace(",", " ")
+        ld_json = json.dumps({
+            "@context": "https://schema.org", "@type": "JobPosting", "title": offer.position,
+            "hiringOrganization": {"@type": "Organization", "name": offer.employer},
+            "skills": offer.skills,
+            "baseSalary": {"@type": "MonetaryAmount", "currency": "PLN",
+                           "value": {"minValue": offer.low, "maxValue": offer.low + 4000, "unitText": "MONTH"}},
+        }, ensure_ascii=False)
+        requirements = "\n".join(f"<li>{skill}</li>" for skill in offer.skills)
+        return self.templates["pracuj_offer"].substitute(
+            position=offer.position, employer=offer.employer, salary=salary,
+            requirements=f"<ul>{requirements}</ul>", ld_json=ld_json)
+
+    def render_jjit(self, path: str, query: dict) -> tuple[int, str, str]:
+        if path in ("", "/"):
+            return 200, "text/html", self.templates["jjit_home"].substitute()
+        if path.startswith("/job-offers"):
+            return 200, "text/html", self.templates["jjit_results"].substitute()
+        if path == "/api/offers":
+            page_number = int(query.get("page", ["1"])[0])
+            start = (page_number - 1) * self.jjit_page_size
+            items = [{"slug": offer.slug, "title": offer.position, "companyName": offer.employer}
+                     for offer in self.offers[start:start + self.jjit_page_size]]
+            total_pages = max(1, -(-len(self.offers) // self.jjit_page_size))
+            return 200, "application/json", json.dumps({"data": items, "meta": {"page": page_number,
+                                                                                "totalPages": total_pages}})
+        if path.startswith("/job-offer/"):
+            offer = self.offer_by_slug(path.rsplit("/", 1)[-1])
+            if offer is None:
+                return 404, "text/html", "<html><body>Offer expired</body></html>"
+            return 200, "text/html", self.templates["jjit_offer"].substitute(
+                position=offer.position, employer=offer.employer, employer_slug=offer.employer.lower(),
+                salary=f"{offer.low} - {offer.low + 4000} PLN",
+                requirements="".join(f"<h4>{skill}</h4>" for skill in offer.skills))
+        return 404, "text/html", "<html><body>Not found</body></html>"
+
+    def render_jjit_api(self, path: str) -> tuple[int, str, str]:
+        offer = self.offer_by_slug(path.rsplit("/", 1)[-1])
+        if offer is None:
+            return 404, "application/json", "{}"
+        return 200, "application/json", json.dumps({
+            "title": offer.position, "companyName": offer.employer, "requiredSkills": offer.skills,
+            "employmentTypes": [{"from": offer.low, "to": offer.low + 4000, "currency": "pln", "type": "b2b",
+                                 "unit": "month"}],
+        })
+
+    def offer_by_slug(self, slug: str) -> FixtureOffer | None:
+        number = slug.rsplit("-", 1)[-1]
+        if not number.isdigit() or not int(number) < len(self.offers):
+            return None
+        offer = self.offers[int(number)]
+        return offer if offer.slug == slug else None
+
+
+class FixtureServer:
+    """Threaded HTTP server serving a FixtureSite with injected latency and failures."""
+
+    def __init__(self, site: FixtureSite, faults: FaultProfile = FaultProfile()) -> None:
+        self.site = site
+        self.faults = faults
+        self.random = random.Random(faults.seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.httpd: ThreadingHTTPServer | None = None
+        self.thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def local_url(self, url: str) -> str:
+        """Translate a real site URL to the address of the fixture server."""
+        parts = urlsplit(url)
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{self.base_url}/{parts.netloc}{parts.path or '/'}{query}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                host, _, path = self.path.lstrip("/").partition("/")
+                parts = urlsplit("/" + path)
+                path = unquote(parts.path)
+                with server.lock:
+                    server.requests += 1
+                    delay = server.faults.latency + server.random.uniform(0, server.faults.jitter)
+                    fail = (server.site.is_offer_request(host, path)
+                            and server.random.random() < server.faults.failure_rate)
+                    if fail:
+                        server.failures += 1
+                time.sleep(delay)
+                if fail:
+                    status, content_type, body = 503, "text/html", "<html><body>Service unavailable</body></html>"
+                else:
+                    status, content_type, body = server.site.render(host, path, parse_qs(parts.query))
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FixtureServer":
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+class RewriteTransport(httpx.AsyncBaseTransport):
+    """Sends requests for the real sites to the fixture server."""
+
+    def __init__(self, server: FixtureServer) -> None:
+        self.server = server
+        self.transport = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host in SITE_HOSTS:
+            request.url = httpx.URL(self.server.local_url(str(request.url)))
+            request.headers["Host"] = request.url.netloc.decode("ascii")
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+async def route_context(context, server: FixtureServer) -> None:
+    """Serve the real sites' URLs of a browser context from the fixture server, block everything else."""
+
+    async def handle(route):
+        if urlsplit(route.request.url).hostname in SITE_HOSTS:
+            response = await route.fetch(url=server.local_url(route.request.url))
+            await route.fulfill(response=response)
+        else:
+            await route.abort()
+
+    await context.route("**/*", handle)
@@ -0,0 +1,82 @@
+"""
+Time and check near-duplicate detection on generated offers.
+
+    python -m benchmarks.near_duplicates --offers 20000 --reposts 0.1
+
+Requirements are random sentences over a Zipf-distributed vocabulary, so
+unrelated offers share common words as real ones do. A share of the offers
+is reposted under a justjoin.it URL with one requirement line dropped and
+the lines shuffled. Reported are build time, offers per second and how many
+reposts were found and how many originals were wrongly marked.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from benchmarks.fixture_site import EMPLOYERS, POSITIONS
+from scrapers.near_duplicates import NearDuplicateIndex
+
+VOCABULARY = [f"word{number}" for number in range(3000)]
+
+
+def make_offers(count: int, seed: int = 0) -> list[tuple[str, str, str, str]]:
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, len(VOCABULARY) + 1)
+    words = rng.choice(len(VOCABULARY), size=(count, 8, 10), p=weights / weights.sum())
+    offers = []
+    for number in range(count):
+        requirements = "\n".join(" ".join(VOCABULARY[word] for word in line) for line in words[number])
+        offers.append((f"https://www.pracuj.pl/praca/offer,oferta,{number}", POSITIONS[number % len(POSITIONS)],
+                       EMPLOYERS[number % len(EMPLOYERS)], requirements))
+    return offers
+
+
+def make_reposts(offers: list[tuple], share: float, seed: int = 1) -> list[tuple[str, str, str, str]]:
+    rng = np.random.default_rng(seed)
+    reposts = []
+    for number in rng.choice(len(offers), size=int(len(offers) * share), replace=False):
+        url, position, employer, requirements = offers[number]
+        lines = requirements.split("\n")
+        del lines[rng.integers(len(lines))]
+        rng.shuffle(lines)
+        reposts.append((f"https://justjoin.it/job-offer/repost-{number}", position, employer, "\n".join(lines)))
+    return reposts
+
+
+def run(count: int, share: float, threshold: float) -> dict:
+    offers = make_offers(count)
+    reposts = make_reposts(offers, share)
+    index = NearDuplicateIndex(threshold=threshold)
+    start = time.perf_counter()
+    false_positives = sum(original is not None for original in index.add_many(offers))
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    # As the pipeline sees them, in batches of 20
+    found = sum(original is not None for batch in range(0, len(reposts), 20)
+                for original in index.add_many(reposts[batch:batch + 20]))
+    batch_seconds = time.perf_counter() - start
+    return {
+        "offers": count,
+        "reposts": len(reposts),
+        "build_seconds": round(build_seconds, 2),
+        "build_offers_per_second": round(count / build_seconds),
+        "pipeline_ms_per_offer": round(batch_seconds / max(1, len(reposts)) * 1000, 3),
+        "reposts_found": found,
+        "originals_marked": false_positives,
+        "clusters": len(index.clusters()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time and check near-duplicate detection on generated offers.")
+    parser.add_argument("--offers", type=int, default=20000)
+    parser.add_argument("--reposts", type=float, default=0.1, help="share of offers reposted")
+    parser.add_argument("--threshold", type=float, default=0.7)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.offers, args.reposts, args.threshold), indent=2))
+
+
+if __name__ == "__main__":
+    main()
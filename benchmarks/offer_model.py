@@ -0,0 +1,107 @@
+"""
+Compare memory and serialization time of the offer representations.
+
+    python -m benchmarks.offer_model --offers 100000
+
+JobOffer (pydantic) is measured against OfferRecord (slotted dataclass) and
+OfferBatch (columns). The baseline serializations are the ones the sinks used
+before OfferBatch: `model_dump()` per offer for sheet rows and JSON lines.
+"""
+import argparse
+import gc
+import io
+import json
+import time
+import tracemalloc
+
+from benchmarks.fixture_site import FixtureOffer
+from scrapers.models import JobOffer, OfferRecord
+from scrapers.offer_batch import SHEET_COLUMNS, OfferBatch
+
+
+def make_offers(count: int) -> list[JobOffer]:
+    offers = []
+    for number in range(count):
+        fixture = FixtureOffer(number)
+        offers.append(JobOffer(employer=fixture.employer, position=fixture.position,
+                               salary=f"{fixture.low} - {fixture.low + 4000} PLN",
+                               requirements="\n".join(fixture.skills), url=fixture.pracuj_url))
+    return offers
+
+
+def bytes_per_offer(build, count: int) -> float:
+    """Memory allocated by `build()` and still held by its result, per offer."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return (after - before) / count
+
+
+def best_of(function, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def dict_sheet_rows(offers: list[JobOffer]) -> list[list]:
+    rows = []
+    for offer in offers:
+        offer_dict = offer.model_dump()
+        rows.append([offer_dict.get(col, "") for col in SHEET_COLUMNS])
+    return rows
+
+
+def dict_jsonl(offers: list[JobOffer]) -> str:
+    f = io.StringIO()
+    for offer in offers:
+        f.write(json.dumps({"site": "pracuj", **offer.model_dump()}, ensure_ascii=False) + "\n")
+    return f.getvalue()
+
+
+def batch_jsonl(batch: OfferBatch) -> str:
+    f = io.StringIO()
+    batch.write_jsonl(f, site="pracuj")
+    return f.getvalue()
+
+
+def run(count: int) -> dict:
+    # Strings are shared by all representations, so only the containers are measured
+    offers = make_offers(count)
+    fields = [(o.employer, o.position, o.salary, o.requirements, o.url) for o in offers]
+    batch = OfferBatch.from_offers(offers)
+    assert dict_sheet_rows(offers) == batch.sheet_rows()
+    assert dict_jsonl(offers) == batch_jsonl(batch)
+    return {
+        "offers": count,
+        "bytes_per_offer": {
+            "JobOffer": round(bytes_per_offer(lambda: [JobOffer.model_construct(
+                employer=e, position=p, salary=s, requirements=r, url=u) for e, p, s, r, u in fields], count)),
+            "OfferRecord": round(bytes_per_offer(lambda: [OfferRecord(*row) for row in fields], count)),
+            "OfferBatch": round(bytes_per_offer(lambda: OfferBatch.from_rows(fields), count)),
+        },
+        "seconds": {
+            "sheet_rows model_dump": round(best_of(lambda: dict_sheet_rows(offers)), 4),
+            "sheet_rows OfferBatch": round(best_of(batch.sheet_rows), 4),
+            "jsonl model_dump": round(best_of(lambda: dict_jsonl(offers)), 4),
+            "jsonl OfferBatch": round(best_of(lambda: batch_jsonl(batch)), 4),
+            "csv OfferBatch": round(best_of(lambda: batch.write_csv(io.StringIO())), 4),
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare memory and serialization time of offer representations.")
+    parser.add_argument("--offers", type=int, default=100000)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.offers), indent=2))
+
+
+if __name__ == "__main__":
+    main()
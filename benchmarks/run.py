@@ -0,0 +1,198 @@
+"""
+Benchmark the scrapers against the local fixture site.
+
+    python -m benchmarks.run --offers 200 --latency 0.05 --failure-rate 0.02 --label "lookahead 3"
+    python -m benchmarks.run --compare
+
+Every run drives the real PracujScraper and JustJoinItScraper through
+`main.run_scraper` with a fresh in-memory offer store. Results are appended to
+`benchmarks/results.jsonl`, so runs of different commits can be compared.
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import time
+import tracemalloc
+from dataclasses import asdict, replace
+from pathlib import Path
+
+import httpx
+from loguru import logger
+
+from benchmarks.fixture_site import FaultProfile, FixtureServer, FixtureSite, RewriteTransport, route_context
+from main import run_scraper
+from scrapers.browser_pool import BrowserPool, CONTEXT_ARGS
+from scrapers.config import ScraperConfig, SearchQuery
+from scrapers.justjoinit_scraper import JustJoinItScraper
+from scrapers.metrics import REGISTRY, percentile
+from scrapers.offer_store import OfferStore
+from scrapers.pipeline import OfferPipeline, StoreSink
+from scrapers.pracuj_scraper import PracujScraper
+from scrapers.scheduler import CrawlScheduler
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SITES = {"pracuj": PracujScraper, "justjoinit": JustJoinItScraper}
+RESULTS_PATH = Path(__file__).parent / "results.jsonl"
+QUERY = SearchQuery("python", "Łódź")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process in MB (Linux reports KB), 0 where unsupported."""
+    if resource is None:
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def stage_latencies() -> dict:
+    stages = {}
+    for name, series in REGISTRY.timers.items():
+        for labels, values in series.items():
+            key = ",".join([name, *(value for _, value in labels)])
+            stages[key] = {"count": len(values), "p50": percentile(values, 0.5), "p95": percentile(values, 0.95),
+                           "p99": percentile(values, 0.99)}
+    return stages
+
+
+async def run_benchmark(args) -> dict:
+    """Scrape the fixture site once and return the measured results."""
+    REGISTRY.reset()
+    faults = FaultProfile(args.latency, args.jitter, args.failure_rate, args.seed)
+    config = ScraperConfig(max_open_pages=args.max_open_pages, listing_lookahead=args.listing_lookahead,
+                           http_fast_path=args.fast_path, listing_capture=False, revisit=False,
+                           page_pool=args.page_pool, searches=[QUERY])
+    if args.requests_per_second:
+        config.domain_policies = {domain: replace(policy, requests_per_second=args.requests_per_second)
+                                  for domain, policy in config.domain_policies.items()}
+    store = OfferStore()
+    scheduler = CrawlScheduler.from_config(config)
+    results = {}
+    if args.trace_memory:
+        tracemalloc.start()
+    with FixtureServer(FixtureSite(args.offers), faults) as server:
+        http_client = None
+        if args.fast_path:
+            http_client = httpx_client(server, config)
+        start = time.perf_counter()
+        try:
+            async with OfferPipeline([StoreSink(store)], batch_size=config.pipeline_batch_size) as pipeline:
+                async with BrowserPool(headless=True) as pool:
+                    for site in args.sites:
+                        await route_context(await pool.acquire(site), server)
+                        site_start = time.perf_counter()
+                        found = await run_scraper(SITES[site], QUERY, store, config, pool, pipeline, scheduler,
+                                                  http_client)
+                        elapsed = time.perf_counter() - site_start
+                        results[site] = {"offers": found, "seconds": round(elapsed, 3),
+                                         "offers_per_second": round(found / elapsed, 2) if elapsed else 0.0}
+                        await pool.release(site)
+        finally:
+            if http_client:
+                await http_client.aclose()
+        elapsed = time.perf_counter() - start
+        requests, failures = server.requests, server.failures
+    python_peak = tracemalloc.get_traced_memory()[1] if args.trace_memory else 0
+    tracemalloc.stop()
+    offers = sum(site["offers"] for site in results.values())
+    store.close()
+    return {
+        "label": args.label,
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": {"offers": args.offers, "sites": args.sites, "faults": asdict(faults),
+                   "max_open_pages": args.max_open_pages, "listing_lookahead": args.listing_lookahead,
+                   "fast_path": args.fast_path, "page_pool": args.page_pool,
+                   "requests_per_second": args.requests_per_second},
+        "offers": offers,
+        "seconds": round(elapsed, 3),
+        "offers_per_second": round(offers / elapsed, 2) if elapsed else 0.0,
+        "sites": results,
+        "server": {"requests": requests, "injected_failures": failures},
+        "memory": {"python_peak_mb": round(python_peak / 2 ** 20, 1), "process_peak_rss_mb": round(peak_rss_mb(), 1)},
+        "stages": stage_latencies(),
+        "counters": REGISTRY.to_json()["counters"],
+    }
+
+
+def httpx_client(server: FixtureServer, config: ScraperConfig) -> httpx.AsyncClient:
+    """Client like `create_http_client` but talking to the fixture server."""
+    limits = httpx.Limits(max_connections=config.http_max_connections)
+    return httpx.AsyncClient(transport=RewriteTransport(server), limits=limits, follow_redirects=True,
+                             headers={"User-Agent": CONTEXT_ARGS["user_agent"]},
+                             timeout=config.page_load_timeout / 1000)
+
+
+def save_result(result: dict, path: Path = RESULTS_PATH) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+def load_results(path: Path = RESULTS_PATH) -> list[dict]:
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def comparison_table(results: list[dict]) -> str:
+    """Format stored runs side by side, newest last."""
+    header = f"{'timestamp':<20} {'commit':<8} {'label':<24} {'offers':>6} {'offers/s':>9} {'offer p95':>9} {'rss MB':>7}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        offer = [stage["p95"] for key, stage in result["stages"].items()
+                 if key.startswith(("offer_goto", "offer_http"))]
+        lines.append(f"{result['timestamp']:<20} {result['commit']:<8} {result['label'][:24]:<24} "
+                     f"{result['offers']:>6} {result['offers_per_second']:>9.2f} "
+                     f"{max(offer, default=0.0):>8.2f}s {result['memory']['process_peak_rss_mb']:>7.0f}")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers against a local fixture site.")
+    parser.add_argument("--sites", nargs="+", choices=list(SITES), default=list(SITES))
+    parser.add_argument("--offers", type=int, default=100, help="offers served per site")
+    parser.add_argument("--latency", type=float, default=0.05, help="base response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="random extra delay in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of offer requests answered with 503")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-open-pages", type=int, default=5)
+    parser.add_argument("--listing-lookahead", type=int, default=2)
+    parser.add_argument("--requests-per-second", type=float, default=0.0,
+                        help="override the per-domain rate limit, 0 keeps the default policies")
+    parser.add_argument("--no-fast-path", dest="fast_path", action="store_false",
+                        help="scrape every offer with the browser")
+    parser.add_argument("--no-page-pool", dest="page_pool", action="store_false",
+                        help="open and close a tab per offer instead of reusing tabs")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="also measure peak Python heap with tracemalloc, slows the run down")
+    parser.add_argument("--label", default="", help="name of the run in the results file")
+    parser.add_argument("--compare", action="store_true", help="print stored results instead of running")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.compare:
+        print(comparison_table(load_results()))
+        return
+    result = asyncio.run(run_benchmark(args))
+    save_result(result)
+    logger.info(f"Benchmark summary:\n{REGISTRY.summary_table()}")
+    print(json.dumps({key: result[key] for key in ("offers", "seconds", "offers_per_second", "sites", "memory")},
+                     indent=2))
+
+
+if __name__ == "__main__":
+    main()
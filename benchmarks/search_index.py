@@ -0,0 +1,77 @@
+"""
+Time queries of the offer search index.
+
+    python -m benchmarks.search_index --offers 100000
+
+Offers are generated from the fixture site and spread over a few cities, then
+indexed, saved and loaded back memory-mapped. Queries run against the loaded
+snapshot, as `main.py --search` does.
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.fixture_site import FixtureOffer
+from scrapers.offer_index import OfferIndex
+
+CITIES = ["lodz", "warszawa", "krakow", "wroclaw", "gdansk", "poznan", "zdalnie"]
+QUERIES = [
+    "python AND django, salary >= 20k, Łódź",
+    "python",
+    "salary >= 20k",
+    "python, -django, warszawa",
+    "selenium AND pytest AND krakow, salary <= 15k",
+]
+
+
+def build(count: int) -> OfferIndex:
+    index = OfferIndex()
+    for number in range(count):
+        fixture = FixtureOffer(number)
+        slug = fixture.position.lower().replace(" ", "-")
+        index.add(f"https://www.pracuj.pl/praca/{slug}-{CITIES[number % len(CITIES)]},oferta,{number}",
+                  fixture.position, fixture.employer, "\n".join(fixture.skills), ",".join(fixture.skills),
+                  fixture.low, fixture.low + 4000, f"{number:016x}")
+    return index
+
+
+def timings(index: OfferIndex, query: str, repeat: int) -> dict:
+    index.search(query)
+    seconds = sorted(index.search(query).seconds for _ in range(repeat))
+    return {"matches": index.search(query).total, "p50_ms": round(seconds[len(seconds) // 2] * 1000, 3),
+            "p99_ms": round(seconds[int(len(seconds) * 0.99) - 1] * 1000, 3)}
+
+
+def run(count: int, repeat: int) -> dict:
+    start = time.perf_counter()
+    index = build(count)
+    build_seconds = time.perf_counter() - start
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "index")
+        start = time.perf_counter()
+        index.save(path)
+        save_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = OfferIndex.load(path)
+        load_seconds = time.perf_counter() - start
+        queries = {query: timings(loaded, query, repeat) for query in QUERIES}
+        del loaded
+    return {
+        "offers": count,
+        "seconds": {"build": round(build_seconds, 2), "save": round(save_seconds, 3), "load": round(load_seconds, 4)},
+        "queries": queries,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time queries of the offer search index.")
+    parser.add_argument("--offers", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=200, help="runs of each query")
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.offers, args.repeat), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,17 @@
+import json
 import os
+import random
+import time
 from loguru import logger
 import gspread
 from gspread import Worksheet, WorksheetNotFound, SpreadsheetNotFound
+from gspread.exceptions import APIError
+from requests.exceptions import RequestException
+
+from scrapers.metrics import REGISTRY
+from scrapers.rate_limit import TokenBucket
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
 class GoogleSheetClient:
     def __init__(self, credentials_path=None) -> None:
@@ -12,6 +22,8 @@ class GoogleSheetClient:
                                     "Set GOOGLE_CREDENTIALS_PATH env variable")
         self.gc = gspread.service_account(creds_path)
         self.spreadsheet = None
+        # Shared by all writers, the write quota is counted per user and project
+        self.rate_limiter = TokenBucket(rate=1.0, capacity=10)
 
     def open_spreadsheet(self, sheet_name) -> None:
         try:
@@ -28,3 +40,107 @@ class GoogleSheetClient:
         except WorksheetNotFound:
             logger.error(f'Worksheet at index: {index} not found.')
             raise
+
+    def get_writer(self, index: int, spool_dir: str = "spool", chunk_size: int = 500) -> "SheetWriter":
+        """Return a rate limited writer appending rows to the worksheet at given index."""
+        worksheet = self.get_worksheet(index)
+        spool_path = os.path.join(spool_dir, f"worksheet_{index}.jsonl")
+        return SheetWriter(worksheet, spool_path, self.rate_limiter, chunk_size=chunk_size)
+
+
+class SheetWriter:
+    """
+    Appends rows to a worksheet in chunks, within the Sheets API write quota.
+
+    Each chunk is one `append_rows` call guarded by a token bucket. Quota (429),
+    server and network errors are retried with exponential backoff. Rows that still
+    can't be written are spooled to a JSONL file and sent first on the next write.
+
+    Writes are blocking and run in a worker thread (`asyncio.to_thread`), which
+    sleeps through the backoff. Each delay is capped at `max_delay`.
+    """
+
+    def __init__(self, worksheet: Worksheet, spool_path: str, rate_limiter: TokenBucket,
+                 chunk_size: int = 500, max_retries: int = 5, base_delay: float = 1.0,
+                 max_delay: float = 10.0) -> None:
+        """
+        Args:
+            worksheet (Worksheet): Target worksheet.
+            spool_path (str): JSONL file for rows that failed to be written.
+            rate_limiter (TokenBucket): Limits API calls, one token per call.
+            chunk_size (int): Maximum rows sent in a single API call.
+            max_retries (int): Retries of a single chunk before it is spooled.
+            base_delay (float): First backoff delay in seconds, doubled on each retry.
+            max_delay (float): Longest backoff delay in seconds.
+        """
+        self.worksheet = worksheet
+        self.spool_path = spool_path
+        self.rate_limiter = rate_limiter
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def write(self, rows: list[list]) -> int:
+        """
+        Append previously spooled rows and the given rows to the worksheet.
+
+        Args:
+            rows (list[list]): Rows to append.
+
+        Returns:
+            int: Number of rows written, rows that were spooled are not counted.
+        """
+        rows = self._read_spool() + list(rows)
+        written = 0
+        for start in range(0, len(rows), self.chunk_size):
+            chunk = rows[start:start + self.chunk_size]
+            try:
+                self._append_with_retry(chunk)
+            except (APIError, RequestException) as e:
+                remaining = rows[start:]
+                logger.error(f"Writing to '{self.worksheet.title}' failed: {e}. "
+                             f"Spooling {len(remaining)} rows to {self.spool_path}.")
+                self._write_spool(remaining)
+                return written
+            written += len(chunk)
+        self._write_spool([])
+        logger.info(f"Wrote {written} rows to '{self.worksheet.title}'.")
+        return written
+
+    def _append_with_retry(self, chunk: list[list]) -> None:
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                with REGISTRY.timer("sheet_write"):
+                    self.worksheet.append_rows(chunk, value_input_option="RAW", insert_data_option="INSERT_ROWS")
+                return
+            except (APIError, RequestException) as e:
+                REGISTRY.inc("sheet_write_errors")
+                retryable = not isinstance(e, APIError) or e.code in RETRYABLE_STATUS_CODES
+                if not retryable or attempt == self.max_retries:
+                    raise
+                delay = min(self.max_delay, self.base_delay * 2 ** attempt) + random.uniform(0, self.base_delay)
+                logger.warning(f"Sheets write failed ({e}), retrying in {delay:.1f}s.")
+                time.sleep(delay)
+
+    def _read_spool(self) -> list[list]:
+        if not os.path.exists(self.spool_path):
+            return []
+        with open(self.spool_path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        if rows:
+            logger.info(f"Retrying {len(rows)} spooled rows from {self.spool_path}.")
+        return rows
+
+    def _write_spool(self, rows: list[list]) -> None:
+        if not rows:
+            if os.path.exists(self.spool_path):
+                os.remove(self.spool_path)
+            return
+        os.makedirs(os.path.dirname(self.spool_path) or ".", exist_ok=True)
+        tmp_path = self.spool_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.spool_path)
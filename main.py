@@ -1,65 +1,264 @@
+import argparse
 import os
 
 from google_sheets_client import GoogleSheetClient
+from scrapers.browser_pool import BrowserPool
+from scrapers.checkpoint import CheckpointJournal, CheckpointSink, ResumedOffers
 from scrapers.config import ScraperConfig
+from scrapers.http_extractors import create_http_client
+from scrapers.metrics import REGISTRY
 from scrapers.justjoinit_scraper import JustJoinItScraper
+from scrapers.near_duplicates import NearDuplicateIndex
+from scrapers.offer_index import OfferIndex
+from scrapers.offer_store import OfferStore
+from scrapers.pipeline import IndexSink, OfferPipeline, SheetSink, StoreSink, JsonlSink
 from scrapers.pracuj_scraper import PracujScraper
+from scrapers.revisit import OfferRevisitor, write_events
+from scrapers.session_state import SessionStateManager
+from scrapers.scheduler import CrawlScheduler
+from scrapers.work_queue import WorkQueue
 import asyncio
-from playwright.async_api import async_playwright
-
-async def run_scraper(scraper_class, urls, config, sem=None):
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False,                                          args=[
-                                              "--disable-blink-features=AutomationControlled",
-                                              "--no-sandbox",
-                                              "--disable-infobars"
-                                          ])
-        context_args = {
-            "viewport": {"width": 1920, "height": 1080},
-            "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-            "locale": "pl-PL"
-        }
-        # TODO: resolve captcha
-        if os.path.exists("state.json") and scraper_class==PracujScraper:
-            print("Loading cookies from 'state.json'")
-            context_args["storage_state"] = "state.json"
-        context = await browser.new_context(
-            **context_args
-        )
-        scraper = scraper_class(context, browser, 10)
-        await scraper.navigate()
-        await scraper.accept_cookies()
-        await scraper.search(config.search_keywords, config.search_location)
-        await scraper.sort_offers_from_newest()
-        found_jobs = await scraper.extract_job_data(urls)
-        await browser.close()
-        return found_jobs
-
-
-async def main():
+from loguru import logger
+
+SCRAPERS = [PracujScraper, JustJoinItScraper]
+
+def storage_state_for(scraper_class):
+    """Fallback storage state of a site's context, BrowserPool.acquire logs which state it loads."""
+    # TODO: resolve captcha
+    if os.path.exists("state.json") and scraper_class==PracujScraper:
+        return "state.json"
+    return None
+
+
+def session_manager_for(config):
+    """Saved browser sessions of every site, None when SESSION_DIR is empty."""
+    if not config.session_dir:
+        return None
+    return SessionStateManager(config.session_dir, config.session_slots, config.session_max_age_hours * 3600,
+                               config.session_challenge_cooldown_hours * 3600)
+
+
+def page_pool_for(pool, site, config):
+    """Shared offer tab pool of the site's context, None when page reuse is disabled."""
+    if not config.page_pool:
+        return None
+    return pool.page_pool(site, config.max_open_pages, config.page_max_uses, config.page_max_heap_mb)
+
+
+def near_duplicate_index_for(config, store):
+    """Near-duplicate index seeded with recently stored offers, None when detection is disabled."""
+    if not config.near_duplicates:
+        return None
+    return NearDuplicateIndex.from_store(store, config.near_duplicate_max_age_days * 86400,
+                                         threshold=config.near_duplicate_threshold)
+
+
+def create_sinks(config, gc, store, index=None, near_duplicates=None):
+    writers = {scraper_class.site: gc.get_writer(i, config.sheet_spool_dir, config.sheet_chunk_size)
+               for i, scraper_class in enumerate(SCRAPERS)}
+    sinks = [SheetSink(writers), StoreSink(store, near_duplicates)]
+    if index is not None:
+        sinks.append(IndexSink(index))
+    if config.jsonl_output_path:
+        sinks.append(JsonlSink(config.jsonl_output_path))
+    return sinks
+
+
+def open_index(config, store):
+    """Load the search index snapshot and catch it up with the store, None when the index is disabled."""
+    if not config.index_path:
+        return None
+    index = OfferIndex.load(config.index_path)
+    index.sync_from_store(store)
+    return index
+
+
+async def run_scraper(scraper_class, query, known_offers, config, pool, pipeline, scheduler, http_client=None,
+                      claimed=None, work_queue=None, checkpoint=None):
+    if checkpoint and checkpoint.progress.finished:
+        logger.info(f"{scraper_class.site} '{query}' finished before the interruption, skipping.")
+        return 0
+    context = await pool.acquire(scraper_class.site, storage_state_for(scraper_class))
+    scraper = scraper_class(context, pool.browser, config.max_open_pages, config, http_client, scheduler, claimed)
+    scraper.work_queue = work_queue
+    scraper.checkpoint = checkpoint
+    scraper.page_pool = page_pool_for(pool, scraper_class.site, config)
+    scraper.sessions = pool.sessions
+    found_jobs = 0
+    try:
+        if checkpoint:
+            pending = checkpoint.pending(known_offers)
+            if pending:
+                logger.info(f"Resuming {len(pending)} {scraper_class.site} offers discovered before the interruption.")
+            async for offer in scraper.scrape_offers(pending):
+                await pipeline.put(scraper_class.site, offer)
+                found_jobs += 1
+        site = scraper_class.site
+        with REGISTRY.timer("navigate", site=site):
+            await scraper.navigate()
+        if pool.sessions and pool.sessions.known_good(site):
+            # Consent was given in the saved session, the banner would only cost a wait
+            REGISTRY.inc("cookie_consent_skipped", site=site)
+        else:
+            with REGISTRY.timer("accept_cookies", site=site):
+                await scraper.accept_cookies()
+        with REGISTRY.timer("search", site=site):
+            await scraper.search(query.keywords, query.location)
+        with REGISTRY.timer("sort", site=site):
+            await scraper.sort_offers_from_newest()
+        async for offer in scraper.extract_job_data(known_offers):
+            await pipeline.put(scraper_class.site, offer)
+            found_jobs += 1
+        if checkpoint:
+            checkpoint.finished()
+    finally:
+        if scraper.page:
+            await scraper.page.close()
+        await pool.release(scraper_class.site)
+    return found_jobs
+
+
+async def run_searches(config, store, pool, pipeline, scheduler, http_client=None, work_queue=None, journal=None):
+    """
+    Run every search of the query matrix on every site.
+
+    Searches share the browser contexts, the offer store, the scheduler and the
+    set of claimed offers, so an offer found by several searches is scraped once.
+    At most `concurrent_searches` search pages are open at the same time.
+    With a work queue, offers are queued for worker processes instead.
+    With a checkpoint journal, progress is recorded, and searches of a resumed
+    run continue where the interrupted run stopped.
+
+    Returns:
+        list[tuple]: (scraper class, query, found offers or exception) per search.
+    """
+    limit = asyncio.Semaphore(max(1, config.concurrent_searches))
+    # Offers discovered before an interruption are resumed from the journal, not rediscovered
+    claimed = journal.discovered_keys() if journal else set()
+    known_offers = ResumedOffers(store, set(claimed)) if claimed else store
+
+    async def run(scraper_class, query):
+        checkpoint = journal.search(scraper_class.site, str(query)) if journal else None
+        async with limit:
+            return await run_scraper(scraper_class, query, known_offers, config, pool, pipeline, scheduler,
+                                     http_client, claimed, work_queue, checkpoint)
+
+    jobs = [(scraper_class, query) for query in config.searches for scraper_class in SCRAPERS]
+    results = await asyncio.gather(*(run(*job) for job in jobs), return_exceptions=True)
+    return [(scraper_class, query, result) for (scraper_class, query), result in zip(jobs, results)]
+
+
+async def revisit_offers(site, extractor, store, config, scheduler):
+    revisitor = OfferRevisitor(store, extractor, scheduler, max_age=config.revisit_max_age_days * 86400,
+                               interval=config.revisit_interval_hours * 3600, limit=config.revisit_limit)
+    events = []
+    async for event in revisitor.revisit(site):
+        if event.kind != "unchanged":
+            logger.info(f"Offer {event.kind}: {event.url}")
+        events.append(event)
+    if config.revisit_events_path:
+        write_events(config.revisit_events_path, events)
+
+
+async def main(coordinator=False, resume=False):
     config = ScraperConfig.from_env()
     gc = GoogleSheetClient(config.credentials_path)
     gc.open_spreadsheet(config.spreadsheet_name)
-    worksheet = gc.spreadsheet.get_worksheet(0)
-    pracuj_urls = worksheet.col_values(5)
-    worksheet = gc.spreadsheet.get_worksheet(1)
-    justjoinit_urls = worksheet.col_values(5)
-    tasks = [
-        run_scraper(PracujScraper, pracuj_urls, config),
-        run_scraper(JustJoinItScraper, justjoinit_urls, config)
-    ]
-    jobs = await asyncio.gather(*tasks)
-
-    for i, job_list in enumerate(jobs):
-        columns = ["employer", "position", "salary", "requirements", "url",
-                   "status"]
-        rows = []
-        for offer in job_list:
-            offer_dict = offer.model_dump()
-            row = [offer_dict.get(col, "") for col in columns]
-            rows.append(row)
-
-        worksheet = gc.spreadsheet.get_worksheet(i)
-        worksheet.insert_rows(rows, 2)
+    store = OfferStore(config.offer_store_path)
+    for i, scraper_class in enumerate(SCRAPERS):
+        store.sync_from_sheet(scraper_class.site, gc.spreadsheet.get_worksheet(i))
+    store.enrich_missing()
+    index = open_index(config, store)
+    near_duplicates = near_duplicate_index_for(config, store)
+    journal = CheckpointJournal(config.checkpoint_path, resume)
+    sinks = create_sinks(config, gc, store, index, near_duplicates) + [CheckpointSink(journal)]
+    work_queue = WorkQueue(config.work_queue_path, config.work_queue_shards) if coordinator else None
+    http_client = create_http_client(config) if config.http_fast_path else None
+    scheduler = CrawlScheduler.from_config(config)
+    try:
+        async with OfferPipeline(sinks, config.pipeline_queue_size, config.pipeline_batch_size,
+                                 config.pipeline_flush_interval, near_duplicates) as pipeline:
+            async with BrowserPool(headless=config.headless, sessions=session_manager_for(config)) as pool:
+                results = await run_searches(config, store, pool, pipeline, scheduler, http_client, work_queue,
+                                             journal)
+        for scraper_class, query, result in results:
+            if isinstance(result, Exception):
+                logger.error(f"{scraper_class.site} scraper failed for '{query}': {result!r}")
+            else:
+                logger.info(f"{scraper_class.site} '{query}': {result} new offers.")
+        if config.revisit and http_client:
+            await asyncio.gather(*(revisit_offers(scraper_class.site, scraper_class.get_http_extractor(http_client),
+                                                  store, config, scheduler)
+                                   for scraper_class in SCRAPERS))
+        if work_queue:
+            logger.info(f"Work queue: {work_queue.counts()}")
+        logger.info(f"Scheduler state: {scheduler.snapshot()}")
+    finally:
+        logger.info(f"Run summary:\n{REGISTRY.summary_table()}")
+        REGISTRY.export(config.metrics_prometheus_path, config.metrics_json_path)
+        if http_client:
+            await http_client.aclose()
+        if work_queue:
+            work_queue.close()
+        journal.close()
+        if index is not None:
+            # Picks up revisit results and offers scraped by worker processes
+            index.sync_from_store(store)
+            index.save(config.index_path)
+        store.close()
+
+
+def export_offers(path, site=None):
+    """Write the offers of the local store to a .jsonl, .csv or .parquet file."""
+    config = ScraperConfig.from_env()
+    store = OfferStore(config.offer_store_path)
+    try:
+        batch = store.offer_batch(site)
+        batch.export(path)
+    finally:
+        store.close()
+    logger.info(f"Exported {len(batch)} offers to '{path}'.")
+
+
+def search_offers(query, limit=20):
+    """Print the newest stored offers matching the query, e.g. "python AND django, salary >= 20k, Łódź"."""
+    config = ScraperConfig.from_env()
+    store = OfferStore(config.offer_store_path)
+    try:
+        # Without INDEX_PATH the index is built from the store for this search only
+        index = OfferIndex.load(config.index_path) if config.index_path else OfferIndex()
+        if index.sync_from_store(store) and config.index_path:
+            index.save(config.index_path)
+    finally:
+        store.close()
+    result = index.search(query, limit)
+    for hit in result.hits:
+        salary = f"{hit.salary_min:,.0f}-{hit.salary_max:,.0f}" if hit.salary_min is not None else "-"
+        print(f"{hit.position} | {hit.employer} | {salary} | {hit.url}")
+    print(f"{result.total} offers match, {len(result.hits)} shown ({result.seconds * 1000:.2f} ms).")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape job offers into Google Sheets.")
+    parser.add_argument("--coordinator", action="store_true",
+                        help="only discover offers and queue them for worker.py processes")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run from its checkpoint journal")
+    parser.add_argument("--export", metavar="PATH",
+                        help="write stored offers to a .jsonl, .csv or .parquet file instead of scraping")
+    parser.add_argument("--site", choices=[scraper_class.site for scraper_class in SCRAPERS],
+                        help="only export offers of this site")
+    parser.add_argument("--search", metavar="QUERY",
+                        help='search stored offers instead of scraping, e.g. "python AND django, salary >= 20k, Łódź"')
+    parser.add_argument("--limit", type=int, default=20, help="number of search results shown")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    if args.export:
+        export_offers(args.export, args.site)
+    elif args.search:
+        search_offers(args.search, args.limit)
+    else:
+        asyncio.run(main(coordinator=args.coordinator, resume=args.resume))
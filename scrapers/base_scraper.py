@@ -1,12 +1,24 @@
 import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Optional, Dict
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Container, AsyncIterator, Iterable
 
 import playwright.async_api
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from loguru import logger
 
+from scrapers.config import ScraperConfig
+from scrapers.listing_capture import ListingApi, ListingCapture
+from scrapers.metrics import REGISTRY
 from scrapers.models import JobOffer
+from scrapers.offer_store import offer_key
+from scrapers.page_pool import PagePool, PooledPage
+from scrapers.resilience import CaptchaDetected, RetryPolicy, detect_captcha, failure_reason, is_transient
+from scrapers.routing import RequestBlocker
+from scrapers.scheduler import CrawlScheduler
+from scrapers.session_state import SessionStateManager
+from scrapers.waits import Waits
 
 
 class BaseScraper(ABC):
@@ -18,25 +30,57 @@ class BaseScraper(ABC):
     and pagination.
     """
     cookie_locator: str = None
-    def __init__(self, context, browser, semaphore_value=5) -> None:
+    site: str = None
+    listing_api: ListingApi = None
+    def __init__(self, context, browser, semaphore_value=5, config: ScraperConfig | None = None,
+                 http_client=None, scheduler: CrawlScheduler | None = None, claimed: set[str] | None = None) -> None:
         """
         Initialize the scraper with a Playwright page instance.
 
         Args:
             page: Playwright Page object used for web interactions.
+            semaphore_value: Open page budget of a private scheduler, used when
+                no shared scheduler is given.
+            config: Scraper configuration, defaults are used when not provided.
+            http_client: Shared httpx client enabling the browserless fast path.
+            scheduler: Shared crawl scheduler limiting pages and request rates.
+            claimed: Keys of offers already taken by searches of this run,
+                shared so an offer found by several searches is scraped once.
         """
         self.context = context
         self.browser = browser
+        self.config = config or ScraperConfig()
         self.page = None
         self.url = None
         self.nav_locators = None
         self.all_jobs = []
-        self.sem = asyncio.Semaphore(semaphore_value)
+        self.scheduler = scheduler or CrawlScheduler(semaphore_value, self.config.domain_policies)
+        self.claimed = claimed if claimed is not None else set()
+        # Set by the coordinator, offers are then queued for worker processes instead of scraped
+        self.work_queue = None
+        # Set by run_scraper, records discovered offers and pagination for --resume
+        self.checkpoint = None
+        # Set by run_scraper, offer tabs of the context are then reused instead of opened per offer
+        self.page_pool: PagePool | None = None
+        # Set by run_scraper, bot challenges are reported so the site's saved session is rotated
+        self.sessions: SessionStateManager | None = None
+        self.waits = Waits(self.config.element_wait_timeout)
+        self.retry = RetryPolicy(self.config.retry_attempts, self.config.retry_base_delay, self.config.retry_max_delay)
+        self.listing_capture = (ListingCapture(self.listing_api)
+                                if self.config.listing_capture and self.listing_api else None)
+        rules = self.config.routing.get(self.site)
+        self.blocker = RequestBlocker(rules) if self.config.block_resources and rules else None
+        self.http_extractor = self.get_http_extractor(http_client) if http_client else None
 
     async def navigate(self):
         if not self.page:
             self.page = await self.context.new_page()
+            self.page.set_default_navigation_timeout(self.config.page_load_timeout)
+            if self.listing_capture:
+                self.listing_capture.attach(self.page)
         await self.go_to_page(self.url)
+        if self.sessions and await detect_captcha(self.page):
+            self.sessions.challenged(self.site)
 
     @abstractmethod
     async def search(self, keywords, location) -> None:
@@ -63,7 +107,12 @@ class BaseScraper(ABC):
         ...
 
     @abstractmethod
-    async def extract_job_data(self, offer_links_from_sheet: list):
+    def extract_job_data(self, known_offers: Container[str]) -> AsyncIterator[JobOffer]:
+        """
+        Scrape offers that are not in `known_offers` (a set of URLs or an OfferStore).
+
+        Yields offers as soon as they are parsed.
+        """
         ...
 
     async def accept_cookies(self):
@@ -122,40 +171,161 @@ class BaseScraper(ABC):
     def get_parser(self, page):
         ...
 
-    async def scrape_single_offer(self, url: str) -> JobOffer|None:
+    @classmethod
+    def get_http_extractor(cls, client):
+        """Return the browserless extractor for this site, None if there is none."""
+        return None
+
+    def claim(self, url: str) -> bool:
+        """
+        Reserve an offer for scraping in this run.
+
+        Returns:
+            bool: False if another search already took the offer.
+        """
+        key = offer_key(url)
+        if key in self.claimed:
+            logger.debug(f"Offer already taken by another search: {url}")
+            REGISTRY.inc("offers_deduped", site=self.site)
+            return False
+        self.claimed.add(key)
+        REGISTRY.inc("offers_discovered", site=self.site)
+        if self.checkpoint:
+            self.checkpoint.discovered(url)
+        return True
+
+    async def scrape_single_offer(self, url: str) -> JobOffer | None:
         """
-               Scrapes data from a single job offer page.
+        Scrape a single job offer.
 
-               The method opens a new browser page, accepts cookies, and extracts
-               relevant information about the job offer such as employer name,
-               position, salary, and requirements. After scraping, the page is closed
-               and the extracted data is returned as a dictionary.
+        Offers fully described by captured listing data are returned without
+        any request. In coordinator mode other offers are queued for the
+        workers and None is returned. Otherwise the offer is fetched with the
+        HTTP fast path, if enabled, and parsed in a browser tab (a reused tab
+        of the page pool, if set) when that fails. Timeouts and network errors
+        are retried with jittered backoff, captchas and open circuits are not.
 
-               Args:
-                   url (str): URL of the job offer page to scrape.
+        Args:
+            url (str): URL of the job offer page to scrape.
 
-               Returns:
-                   Optional[Dict]: A dictionary containing the scraped job data with the keys:
-                       - "employer" (str | None): Name of the employer.
-                       - "position" (str | None): Name of the job position.
-                       - "earning" (str | None): Salary or earning information.
-                       - "requirements" (List[str] | None): List of job requirements.
-                       - "url" (str): The original job offer URL.
-                     Returns None if scraping fails or no data is found.
+        Returns:
+            JobOffer | None: The scraped offer, None if it was queued or scraping failed.
         """
-        async with self.sem:
-            offer_page = await self.context.new_page()
-            try:
-                await offer_page.goto(url)
-                parser = self.get_parser(offer_page)
-                job_data = await parser.parse()
+        if self.listing_capture:
+            job_data = self.listing_capture.get(url)
+            if job_data:
+                logger.info(f"Scraped (listing): {job_data}")
+                REGISTRY.inc("offers_scraped", site=self.site, source="listing")
+                return job_data
+        if self.work_queue is not None:
+            self.work_queue.enqueue(self.site, [url])
+            return None
+        attempt = 0
+        try:
+            if self.http_extractor:
+                async with self.scheduler.slot(url, uses_page=False):
+                    with REGISTRY.timer("offer_http", site=self.site):
+                        job_data = await self.http_extractor.extract(url)
+                if job_data:
+                    logger.info(f"Scraped (http): {job_data}")
+                    REGISTRY.inc("offers_scraped", site=self.site, source="http")
+                    return job_data
+                REGISTRY.inc("http_fallbacks", site=self.site)
+            while True:
+                attempt += 1
+                try:
+                    job_data = await self.scrape_with_browser(url)
+                except Exception as e:
+                    reason = failure_reason(e)
+                    if attempt >= self.retry.attempts or not is_transient(reason):
+                        raise
+                    delay = self.retry.delay(attempt)
+                    REGISTRY.inc("offer_retries", site=self.site, reason=reason)
+                    logger.warning(f"Retrying {url} in {delay:.1f}s after attempt {attempt} failed ({reason}): {e}")
+                    # Back off without holding a page or a domain slot
+                    await asyncio.sleep(delay)
+                    continue
                 logger.info(f"Scraped: {job_data}")
+                REGISTRY.inc("offers_scraped", site=self.site, source="browser")
                 return job_data
-            except Exception as e:
-                logger.error(f"Failed to scrape {url}: {e}")
-                return None
+        except Exception as e:
+            reason = failure_reason(e)
+            if reason == "captcha" and self.sessions:
+                self.sessions.challenged(self.site)
+            REGISTRY.inc("offer_give_ups", site=self.site, reason=reason)
+            REGISTRY.inc("offers_timed_out" if reason == "timeout" else "offers_failed", site=self.site)
+            logger.error(f"Failed to scrape {url} after {attempt} attempt(s) ({reason}): {e}")
+            return None
+
+    async def scrape_with_browser(self, url: str) -> JobOffer:
+        """
+        Open the offer in a browser tab and parse it, a single attempt.
+
+        The navigation timeout follows the domain's recent load times and
+        element waits are capped by `element_wait_timeout`, so a stuck page
+        frees its slot early.
+
+        Raises:
+            CaptchaDetected: The site answered with a bot challenge.
+            CircuitOpenError: The domain is paused after repeated failures.
+        """
+        state = self.scheduler.domain(url)
+        async with self.scheduler.slot(url), self.offer_page() as pooled:
+            offer_page = pooled.page
+            offer_page.set_default_navigation_timeout(state.timeout.current())
+            offer_page.set_default_timeout(self.config.element_wait_timeout)
+            if self.blocker and pooled.data is None:
+                # Routes stay installed on a pooled page, attach once per tab
+                pooled.data = await self.blocker.attach(offer_page)
+            block_stats = pooled.data
+            try:
+                start = time.monotonic()
+                with REGISTRY.timer("offer_goto", site=self.site):
+                    await offer_page.goto(url)
+                state.timeout.observe(time.monotonic() - start)
+                if await detect_captcha(offer_page):
+                    raise CaptchaDetected(f"bot challenge at {offer_page.url}")
+                parser = self.get_parser(offer_page)
+                with REGISTRY.timer("offer_parse", site=self.site):
+                    return await parser.parse()
             finally:
-                await offer_page.close()
+                if block_stats:
+                    self.blocker.log_stats(url, block_stats)
+                    block_stats.reset()
+
+    @asynccontextmanager
+    async def offer_page(self) -> AsyncIterator[PooledPage]:
+        """Borrow a tab from the page pool, or open a new one closed after use when there is no pool."""
+        if self.page_pool:
+            async with self.page_pool.page() as pooled:
+                yield pooled
+            return
+        pooled = PooledPage(await self.context.new_page(), uses=1)
+        try:
+            yield pooled
+        finally:
+            await pooled.page.close()
+
+    async def scrape_offers(self, urls: Iterable[str]) -> AsyncIterator[JobOffer]:
+        """
+        Scrape offers concurrently and yield them in completion order.
+
+        Args:
+            urls (Iterable[str]): URLs of job offer pages.
+        """
+        tasks = [asyncio.create_task(self.scrape_single_offer(url)) for url in urls]
+        try:
+            for task in asyncio.as_completed(tasks):
+                try:
+                    job_data = await task
+                except Exception as e:
+                    logger.error(f"Failed to scrape offer: {e}")
+                    continue
+                if job_data:
+                    yield job_data
+        finally:
+            for task in tasks:
+                task.cancel()
 
     @staticmethod
     def _validate_scraper_params(keywords, location) -> tuple[str, str]:
@@ -0,0 +1,180 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from loguru import logger
+from playwright.async_api import Browser, BrowserContext, async_playwright
+
+from scrapers.page_pool import PagePool
+from scrapers.session_state import SessionStateManager
+
+LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--no-sandbox",
+    "--disable-infobars",
+]
+
+CONTEXT_ARGS = {
+    "viewport": {"width": 1920, "height": 1080},
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "locale": "pl-PL",
+}
+
+
+@dataclass
+class PoolTimings:
+    """Wall-clock timings (in seconds) collected by the browser pool."""
+    launch: float = 0.0
+    acquire: list[float] = field(default_factory=list)
+    release: list[float] = field(default_factory=list)
+
+    def summary(self) -> str:
+        def avg(values):
+            return sum(values) / len(values) if values else 0.0
+        return (f"launch={self.launch:.3f}s "
+                f"acquire(n={len(self.acquire)}, avg={avg(self.acquire):.3f}s) "
+                f"release(n={len(self.release)}, avg={avg(self.release):.3f}s)")
+
+
+class BrowserPool:
+    """
+    Single browser process shared by all scrapers.
+
+    Launches Chromium once and hands out one isolated BrowserContext per site.
+    Contexts are kept open after release, so a long-lived worker pays the
+    launch and context setup cost only once for many searches. Each context
+    can have a PagePool of offer tabs shared by all scrapers of the site.
+    With a SessionStateManager, contexts start from a warm saved session and
+    save it back when they are closed. A challenged context is closed on
+    release, so the next search of the site starts from another session.
+    """
+
+    def __init__(self, headless: bool = True, launch_args: Optional[list[str]] = None,
+                 context_args: Optional[dict] = None, sessions: Optional[SessionStateManager] = None) -> None:
+        """
+        Args:
+            headless (bool): Run Chromium without a visible window.
+            launch_args (list[str] | None): Extra Chromium command line flags.
+            context_args (dict | None): Keyword arguments for `browser.new_context`.
+            sessions (SessionStateManager | None): Saved sessions contexts start from.
+        """
+        self.headless = headless
+        self.sessions = sessions
+        self.launch_args = launch_args or LAUNCH_ARGS
+        self.context_args = context_args or CONTEXT_ARGS
+        self.browser: Optional[Browser] = None
+        self.timings = PoolTimings()
+        self._playwright = None
+        self._contexts: dict[str, BrowserContext] = {}
+        self._page_pools: dict[str, PagePool] = {}
+        self._users: dict[str, int] = {}
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> Browser:
+        """Launch the browser if it is not running yet."""
+        async with self._lock:
+            if self.browser is None:
+                start = time.perf_counter()
+                self._playwright = await async_playwright().start()
+                self.browser = await self._playwright.chromium.launch(headless=self.headless,
+                                                                      args=self.launch_args)
+                self.timings.launch = time.perf_counter() - start
+                logger.info(f"Browser launched in {self.timings.launch:.3f}s (headless={self.headless})")
+        return self.browser
+
+    async def acquire(self, site: str, storage_state: Optional[str] = None) -> BrowserContext:
+        """
+        Return the context assigned to the given site, creating it on first use.
+
+        Args:
+            site (str): Site name, every site gets its own cookies and storage.
+            storage_state (str | None): Path to a Playwright storage state file
+                used when the context is created and no saved session is usable.
+
+        Returns:
+            BrowserContext: Context shared by all users of the site.
+        """
+        await self.start()
+        start = time.perf_counter()
+        async with self._lock:
+            context = self._contexts.get(site)
+            if context is None:
+                context_args = dict(self.context_args)
+                if self.sessions:
+                    storage_state = self.sessions.choose(site) or storage_state
+                if storage_state:
+                    logger.info(f"Loading storage state for {site} from '{storage_state}'")
+                    context_args["storage_state"] = storage_state
+                context = await self.browser.new_context(**context_args)
+                self._contexts[site] = context
+            self._users[site] = self._users.get(site, 0) + 1
+        elapsed = time.perf_counter() - start
+        self.timings.acquire.append(elapsed)
+        logger.debug(f"Context for {site} acquired in {elapsed:.3f}s")
+        return context
+
+    def page_pool(self, site: str, size: int = 5, max_uses: int = 50, max_heap_mb: float = 150.0) -> PagePool:
+        """
+        Return the page pool of an acquired site context, creating it on first use.
+
+        Args:
+            site (str): Site name used in `acquire`.
+            size (int): Idle tabs kept for reuse.
+            max_uses (int): Offers scraped in a tab before it is replaced.
+            max_heap_mb (float): JS heap size above which a tab is replaced.
+        """
+        if site not in self._page_pools:
+            self._page_pools[site] = PagePool(self._contexts[site], size, max_uses, max_heap_mb, name=site)
+        return self._page_pools[site]
+
+    async def release(self, site: str, close: bool = False) -> None:
+        """
+        Give back the context of the given site.
+
+        Args:
+            site (str): Site name used in `acquire`.
+            close (bool): Close the context when no one else uses it, instead of
+                keeping it for the next run.
+        """
+        start = time.perf_counter()
+        async with self._lock:
+            self._users[site] = max(self._users.get(site, 0) - 1, 0)
+            challenged = self.sessions is not None and self.sessions.is_challenged(site)
+            if (close or challenged) and not self._users[site] and site in self._contexts:
+                await self._close_context(site)
+        elapsed = time.perf_counter() - start
+        self.timings.release.append(elapsed)
+        logger.debug(f"Context for {site} released in {elapsed:.3f}s")
+
+    async def _close_context(self, site: str) -> None:
+        if site in self._page_pools:
+            await self._page_pools.pop(site).close()
+        context = self._contexts.pop(site)
+        if self.sessions:
+            await self.sessions.save(site, context)
+            self.sessions.forget(site)
+        await context.close()
+
+    async def close(self) -> None:
+        """Close all contexts (saving their sessions), the browser and the Playwright driver."""
+        for site in list(self._contexts):
+            await self._close_context(site)
+        for page_pool in self._page_pools.values():
+            await page_pool.close()
+        self._page_pools.clear()
+        self._users.clear()
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+        logger.info(f"Browser pool closed: {self.timings.summary()}")
+
+    async def __aenter__(self) -> "BrowserPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
@@ -0,0 +1,144 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Container, Iterable
+
+from loguru import logger
+
+from scrapers.models import JobOffer
+from scrapers.offer_store import offer_key
+from scrapers.pipeline import OfferSink
+
+
+@dataclass
+class SearchProgress:
+    """What a single search of a site got done before the run stopped."""
+    discovered: list[str] = field(default_factory=list)
+    last_page: int = 0
+    finished: bool = False
+
+
+class CheckpointJournal:
+    """
+    Append-only JSON lines journal of the run's progress.
+
+    Records offer URLs as they are discovered, offers as they are written and
+    the last fully processed results page of every search. A resumed run reads
+    the journal back and continues where the interrupted one stopped. A new run
+    starts with an empty journal.
+    """
+
+    def __init__(self, path: str, resume: bool = False) -> None:
+        """
+        Args:
+            path (str): Journal file.
+            resume (bool): Load and extend the existing journal instead of starting a new one.
+        """
+        self.path = path
+        self.searches: dict[tuple[str, str], SearchProgress] = {}
+        self.done: set[str] = set()
+        if resume:
+            self._load()
+        self.file = open(path, "a" if resume else "w", encoding="utf-8")
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            logger.warning(f"No checkpoint at '{self.path}', starting from scratch.")
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Last line of a killed run may be cut off
+                    continue
+                if record["event"] == "done":
+                    self.done.add(offer_key(record["url"]))
+                    continue
+                progress = self.progress(record["site"], record["query"])
+                if record["event"] == "discovered":
+                    progress.discovered.append(record["url"])
+                elif record["event"] == "page":
+                    progress.last_page = max(progress.last_page, record["page"])
+                elif record["event"] == "finished":
+                    progress.finished = True
+        logger.info(f"Loaded checkpoint: {len(self.searches)} searches, {len(self.done)} offers done.")
+
+    def _write(self, **record) -> None:
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def progress(self, site: str, query: str) -> SearchProgress:
+        return self.searches.setdefault((site, query), SearchProgress())
+
+    def search(self, site: str, query: str) -> "SearchCheckpoint":
+        """Return the checkpoint of a single search."""
+        return SearchCheckpoint(self, site, query)
+
+    def discovered_keys(self) -> set[str]:
+        """Return keys of all offers discovered by the journaled run."""
+        return {offer_key(url) for progress in self.searches.values() for url in progress.discovered}
+
+    def mark_done(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self.done.add(offer_key(url))
+            self._write(event="done", url=url)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class SearchCheckpoint:
+    """Progress of one search on one site, recorded as the search runs."""
+
+    def __init__(self, journal: CheckpointJournal, site: str, query: str) -> None:
+        self.journal = journal
+        self.site = site
+        self.query = query
+        self.progress = journal.progress(site, query)
+
+    def discovered(self, url: str) -> None:
+        self.progress.discovered.append(url)
+        self.journal._write(event="discovered", site=self.site, query=self.query, url=url)
+
+    def page_done(self, page_number: int) -> None:
+        """Record that all offers of the results page were discovered."""
+        self.progress.last_page = page_number
+        self.journal._write(event="page", site=self.site, query=self.query, page=page_number)
+
+    def finished(self) -> None:
+        self.progress.finished = True
+        self.journal._write(event="finished", site=self.site, query=self.query)
+
+    def pending(self, known_offers: Container[str]) -> list[str]:
+        """Return discovered offers that were neither written nor stored before the run stopped."""
+        return [url for url in self.progress.discovered
+                if offer_key(url) not in self.journal.done and url not in known_offers]
+
+
+class ResumedOffers:
+    """
+    Known offers of a resumed run.
+
+    Offers discovered by the interrupted run are already stored or pending, but
+    they are new to the search, so they do not count as known. Otherwise the
+    stop-on-known logic would end the search at the first offer it resumes past.
+    """
+
+    def __init__(self, known_offers: Container[str], discovered_keys: set[str]) -> None:
+        self.known_offers = known_offers
+        self.discovered_keys = discovered_keys
+
+    def __contains__(self, url: str) -> bool:
+        return offer_key(url) not in self.discovered_keys and url in self.known_offers
+
+
+class CheckpointSink(OfferSink):
+    """Journals written offers, must follow the sinks that persist them."""
+    keeps_duplicates = True
+
+    def __init__(self, journal: CheckpointJournal) -> None:
+        self.journal = journal
+
+    async def write(self, site: str, offers: list[JobOffer]) -> None:
+        self.journal.mark_done(offer.url for offer in offers)
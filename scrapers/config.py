@@ -1,7 +1,46 @@
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
+from scrapers.routing import RoutingRules, PRACUJ_ROUTING, JJIT_ROUTING
+from scrapers.scheduler import DomainPolicy, DEFAULT_POLICIES
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """A single keywords and location search, run on every site."""
+    keywords: str
+    location: str
+
+    def __str__(self) -> str:
+        return f"{self.keywords} @ {self.location}"
+
+
+def parse_searches(value: str) -> list[SearchQuery]:
+    """
+    Parse a query matrix like "python, java @ Łódź, Warszawa; golang @ Kraków".
+
+    Searches are separated by ";". Every search is expanded to all combinations
+    of its comma separated keywords and locations, duplicates are dropped.
+
+    Args:
+        value (str): Query matrix, usually the SEARCHES environment variable.
+
+    Returns:
+        list[SearchQuery]: Searches in the given order.
+    """
+    queries = []
+    for entry in value.split(";"):
+        if not entry.strip():
+            continue
+        keywords, _, locations = entry.partition("@")
+        for keyword in keywords.split(","):
+            for location in locations.split(","):
+                query = SearchQuery(keyword.strip(), location.strip())
+                if query.keywords and query.location and query not in queries:
+                    queries.append(query)
+    return queries
+
+
 @dataclass
 class ScraperConfig:
     """Configuration for all jobs scrapers"""
@@ -9,17 +48,99 @@ class ScraperConfig:
     credentials_path: str = os.getenv("GOOGLE_CREDENTIALS_PATH", "credentials.json")
     spreadsheet_name: str = os.getenv("SPREADSHEET_NAME", "job-offers")
 
+    # Rows that could not be written to the sheet wait here for the next run
+    sheet_spool_dir: str = os.getenv("SHEET_SPOOL_DIR", "spool")
+    sheet_chunk_size: int = int(os.getenv("SHEET_CHUNK_SIZE", "500"))
+
+    # Streaming of scraped offers to the sheet, the store and an optional JSONL file
+    pipeline_queue_size: int = int(os.getenv("PIPELINE_QUEUE_SIZE", "100"))
+    pipeline_batch_size: int = int(os.getenv("PIPELINE_BATCH_SIZE", "20"))
+    pipeline_flush_interval: float = float(os.getenv("PIPELINE_FLUSH_INTERVAL", "5"))
+    jsonl_output_path: str = os.getenv("JSONL_OUTPUT_PATH", "")
+
+    # Local offer store used for deduplication
+    offer_store_path: str = os.getenv("OFFER_STORE_PATH", "offers.db")
+    # Snapshot directory of the offer search index (`main.py --search`), empty disables the index
+    index_path: str = os.getenv("INDEX_PATH", "offer_index")
+    # Near-duplicates (cross-site posts, reposts under new URLs) are stored but not written to the sheet
+    near_duplicates: bool = os.getenv("NEAR_DUPLICATES", "true").lower() == "true"
+    near_duplicate_threshold: float = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.7"))
+    near_duplicate_max_age_days: float = float(os.getenv("NEAR_DUPLICATE_MAX_AGE_DAYS", "30"))
+    # Progress journal of the current run, read by `main.py --resume`
+    checkpoint_path: str = os.getenv("CHECKPOINT_PATH", "checkpoint.jsonl")
+
     # Search params
     search_keywords: str = os.getenv("SEARCH_KEYWORDS", 'python test')
     search_location: str = os.getenv("SEARCH_LOCATION", "Łódź")
+    # Query matrix, the single search above is used when empty
+    searches: list[SearchQuery] = field(default_factory=lambda: parse_searches(os.getenv("SEARCHES", "")))
+    concurrent_searches: int = int(os.getenv("CONCURRENT_SEARCHES", "2"))
 
-    # Scraping
+    # Scraping, all sites share the page budget, every domain has its own politeness policy
     max_open_pages: int = int(os.getenv("MAX_OPEN_PAGES", '5'))
+    domain_policies: dict[str, DomainPolicy] = field(default_factory=lambda: dict(DEFAULT_POLICIES))
     scroll_step: int = 400
+    stop_after_known: int = int(os.getenv("STOP_AFTER_KNOWN", "1"))
+    # Milliseconds to wait for new offer links after a scroll, the end of the list waits this long twice
+    scroll_idle_timeout: int = int(os.getenv("SCROLL_IDLE_TIMEOUT", "1500"))
+    listing_lookahead: int = int(os.getenv("LISTING_LOOKAHEAD", "2"))
+    headless: bool = os.getenv("HEADLESS", "true").lower() == "true"
+
+    # Offers complete in search result payloads are stored without visiting their pages
+    listing_capture: bool = os.getenv("LISTING_CAPTURE", "true").lower() == "true"
+
+    # Request blocking on offer pages, rules are keyed by scraper site name
+    block_resources: bool = os.getenv("BLOCK_RESOURCES", "true").lower() == "true"
+    routing: dict[str, RoutingRules] = field(default_factory=lambda: {
+        "pracuj": PRACUJ_ROUTING,
+        "justjoinit": JJIT_ROUTING,
+    })
+
+    # Saved browser sessions per site, rotated when a site shows a bot challenge. Empty SESSION_DIR disables them.
+    session_dir: str = os.getenv("SESSION_DIR", "sessions")
+    session_slots: int = int(os.getenv("SESSION_SLOTS", "3"))
+    session_max_age_hours: float = float(os.getenv("SESSION_MAX_AGE_HOURS", "168"))
+    session_challenge_cooldown_hours: float = float(os.getenv("SESSION_CHALLENGE_COOLDOWN_HOURS", "6"))
+
+    # Offer tabs are reused, a tab is replaced after PAGE_MAX_USES offers or when its JS heap exceeds PAGE_MAX_HEAP_MB
+    page_pool: bool = os.getenv("PAGE_POOL", "true").lower() == "true"
+    page_max_uses: int = int(os.getenv("PAGE_MAX_USES", "50"))
+    page_max_heap_mb: float = float(os.getenv("PAGE_MAX_HEAP_MB", "150"))
+
+    # HTTP fast path, offers are fetched without a browser when possible
+    http_fast_path: bool = os.getenv("HTTP_FAST_PATH", "true").lower() == "true"
+    http_max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+
+    # Revisits of recently scraped offers, catch salary changes and expired postings
+    revisit: bool = os.getenv("REVISIT", "true").lower() == "true"
+    revisit_max_age_days: float = float(os.getenv("REVISIT_MAX_AGE_DAYS", "14"))
+    revisit_interval_hours: float = float(os.getenv("REVISIT_INTERVAL_HOURS", "24"))
+    revisit_limit: int = int(os.getenv("REVISIT_LIMIT", "200"))
+    revisit_events_path: str = os.getenv("REVISIT_EVENTS_PATH", "")
+
+    # Worker mode, the coordinator queues offer URLs that worker processes scrape
+    work_queue_path: str = os.getenv("WORK_QUEUE_PATH", "work_queue.db")
+    work_queue_shards: int = int(os.getenv("WORK_QUEUE_SHARDS", "1"))
+    work_lease_seconds: float = float(os.getenv("WORK_LEASE_SECONDS", "300"))
+    work_max_attempts: int = int(os.getenv("WORK_MAX_ATTEMPTS", "3"))
+    work_poll_interval: float = float(os.getenv("WORK_POLL_INTERVAL", "5"))
+
+    # Run metrics, written at the end of every run when a path is set
+    metrics_prometheus_path: str = os.getenv("METRICS_PROMETHEUS_PATH", "")
+    metrics_json_path: str = os.getenv("METRICS_JSON_PATH", "")
+
+    # Timeouts in ms, offer pages adapt their navigation timeout to observed load times up to page_load_timeout
+    page_load_timeout: int = int(os.getenv("PAGE_LOAD_TIMEOUT", "30000"))
+    element_wait_timeout: int = int(os.getenv("ELEMENT_WAIT_TIMEOUT", "5000"))
+
+    # Retries of offer pages failing with a timeout or network error, backoff in seconds
+    retry_attempts: int = int(os.getenv("RETRY_ATTEMPTS", "3"))
+    retry_base_delay: float = float(os.getenv("RETRY_BASE_DELAY", "1"))
+    retry_max_delay: float = float(os.getenv("RETRY_MAX_DELAY", "15"))
 
-    # Timeouts
-    page_load_timeout: int = 30000
-    element_wait_timeout: int = 5000
+    def __post_init__(self):
+        if not self.searches:
+            self.searches = [SearchQuery(self.search_keywords, self.search_location)]
 
     @classmethod
     def from_env(cls):
@@ -0,0 +1,310 @@
+"""
+Numeric salary columns and a normalized tech stack derived from scraped offers.
+
+Salaries arrive as display text, e.g. "12 000–18 000 zł brutto / mies." from
+pracuj.pl or "18000–24000 PLN / b2b month\n15000–20000 PLN / permanent month"
+from justjoin.it. Every amount range in the text becomes one salary with its
+currency, period and contract type, taken from the text up to the next range.
+Requirements are matched against TECH_VOCABULARY.
+"""
+import re
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+# Thousands separated by spaces (also non-breaking), commas or dots, optional decimals
+AMOUNT = r"\d{1,3}(?:[   ,.]\d{3})+(?:[.,]\d{1,2})?|\d+(?:[.,]\d{1,2})?"
+CURRENCY = r"zł|pln|eur|€|usd|\$|gbp|£|chf"
+# Matched against lowercased text, IGNORECASE makes the pattern several times slower
+SALARY_RE = re.compile(
+    rf"(?P<low>{AMOUNT})\s*(?P<low_k>k\b)?\s*(?:[-–—]|\bdo\b|\bto\b)\s*(?P<high>{AMOUNT})\s*(?P<high_k>k\b)?"
+    rf"|(?P<single>{AMOUNT})\s*(?P<single_k>k\b)?(?=\s*(?:{CURRENCY}))"
+)
+CURRENCY_RE = re.compile(CURRENCY)
+CURRENCIES = {"zł": "PLN", "pln": "PLN", "eur": "EUR", "€": "EUR", "usd": "USD", "$": "USD", "gbp": "GBP",
+              "£": "GBP", "chf": "CHF"}
+
+# Keywords of salary periods and contract types, looked up as substrings of the lowercased text.
+# Earlier entries win, e.g. "umowa zlecenie ... brutto" is a mandate contract.
+PERIOD_KEYWORDS = [
+    ("hour", ("godz", "hour", "/ h", "/h")),
+    ("day", ("dzień", "dzien", "dniówk", "daily", "/ day", "per day")),
+    ("year", ("rok", "rocz", "year", "annual")),
+    ("month", ("mies", "month", "mth")),
+]
+CONTRACT_KEYWORDS = [
+    ("b2b", ("b2b", "+ vat", "+vat", "kontrakt", "contract")),
+    ("mandate", ("zleceni", "mandate")),
+    ("specific_task", ("o dzieło", "o dzielo", "specific task", "specific-task")),
+    ("employment", ("o pracę", "o prace", "uop", "permanent", "employment", "gross", "brutto")),
+]
+# Multiplier from a salary of the period to a monthly one
+MONTHLY_FACTOR = {"hour": 168.0, "day": 21.0, "month": 1.0, "year": 1 / 12}
+
+# Canonical technology name and its lowercase spellings
+TECH_VOCABULARY = {
+    "Python": ("python", "python3", "python 3"),
+    "Django": ("django", "django rest framework", "drf"),
+    "Flask": ("flask",),
+    "FastAPI": ("fastapi",),
+    "pytest": ("pytest", "py.test"),
+    "Selenium": ("selenium", "selenium webdriver"),
+    "Playwright": ("playwright",),
+    "Cypress": ("cypress",),
+    "Robot Framework": ("robot framework", "robotframework"),
+    "Pandas": ("pandas",),
+    "NumPy": ("numpy",),
+    "Spark": ("spark", "pyspark", "apache spark"),
+    "Airflow": ("airflow", "apache airflow"),
+    "Kafka": ("kafka", "apache kafka"),
+    "Java": ("java",),
+    "Kotlin": ("kotlin",),
+    "Scala": ("scala",),
+    "Spring": ("spring", "spring boot"),
+    "JavaScript": ("javascript", "js", "ecmascript"),
+    "TypeScript": ("typescript", "ts"),
+    "Node.js": ("node.js", "nodejs", "node"),
+    "React": ("react", "react.js", "reactjs"),
+    "Angular": ("angular",),
+    "Vue": ("vue", "vue.js", "vuejs"),
+    "C#": ("c#", "csharp"),
+    ".NET": (".net", "dotnet", ".net core", "asp.net"),
+    "C++": ("c++", "cpp"),
+    "C": ("c",),
+    "Go": ("go", "golang"),
+    "Rust": ("rust",),
+    "PHP": ("php",),
+    "Ruby": ("ruby", "ruby on rails", "rails"),
+    "R": ("r",),
+    "SQL": ("sql",),
+    "PostgreSQL": ("postgresql", "postgres", "psql"),
+    "MySQL": ("mysql", "mariadb"),
+    "MongoDB": ("mongodb", "mongo"),
+    "Redis": ("redis",),
+    "Elasticsearch": ("elasticsearch", "elastic search", "opensearch"),
+    "Docker": ("docker",),
+    "Kubernetes": ("kubernetes", "k8s"),
+    "Terraform": ("terraform",),
+    "Ansible": ("ansible",),
+    "AWS": ("aws", "amazon web services"),
+    "Azure": ("azure", "microsoft azure"),
+    "GCP": ("gcp", "google cloud", "google cloud platform"),
+    "Linux": ("linux", "unix"),
+    "Git": ("git",),
+    "CI/CD": ("ci/cd", "ci / cd", "jenkins", "github actions", "gitlab ci"),
+    "REST": ("rest", "rest api", "restful"),
+    "GraphQL": ("graphql",),
+    "Jira": ("jira",),
+    "Power BI": ("power bi", "powerbi"),
+    "Tableau": ("tableau",),
+    "Machine Learning": ("machine learning", "ml"),
+}
+# Spellings that are common words, only recognized as a whole requirement line ("Go", "C", "R")
+LINE_ONLY_ALIASES = {"go", "c", "r", "rest", "ml", "ts", "node", "spring", "rust", "ruby"}
+
+TECH_NAMES = list(TECH_VOCABULARY)
+TECH_ALIASES = {alias: name for name, aliases in TECH_VOCABULARY.items() for alias in aliases}
+TECH_INDEX = {name: index for index, name in enumerate(TECH_NAMES)}
+# Longest first, so "ruby on rails" wins over "ruby"; boundaries allow names like "c++" and ".net"
+TECH_RE = re.compile(
+    r"(?<![\w+#.])(?:"
+    + "|".join(re.escape(alias) for alias in sorted(TECH_ALIASES, key=len, reverse=True)
+               if alias not in LINE_ONLY_ALIASES)
+    + r")(?![\w+#])"
+)
+LINE_SPLIT_RE = re.compile(r"[\n,;|•]+")
+
+
+SPACES = str.maketrans("", "", "   ")
+THOUSANDS_RE = re.compile(r"[.,](?=\d{3}(?:\D|$))")
+
+
+def _amount(text: str, thousands: str | None) -> float:
+    """Parse "12 000", "12,000", "12.000,50" or "12.5"; `thousands` is the `k` suffix."""
+    if not text.isdigit():
+        # Separators followed by three digits are thousands separators, the rest is a decimal point
+        text = THOUSANDS_RE.sub("", text.translate(SPACES)).replace(",", ".")
+    value = float(text)
+    return value * 1000 if thousands else value
+
+
+def _keyword(keywords: list[tuple[str, tuple[str, ...]]], text: str) -> str | None:
+    """Return the first name whose keywords occur in the (lowercased) text."""
+    return next((name for name, words in keywords if any(word in text for word in words)), None)
+
+
+@dataclass
+class SalaryColumns:
+    """
+    Salaries found in a batch of offers, one entry per amount range.
+
+    An offer with a B2B and an employment salary has two entries with the
+    same `offer` index. Amounts are NaN-free, `high` equals `low` for a
+    single amount.
+    """
+    offer: np.ndarray  # int64, index of the offer in the parsed batch
+    low: np.ndarray  # float64, in the stated period
+    high: np.ndarray
+    currency: np.ndarray  # object, "PLN", "EUR", ... or None
+    period: np.ndarray  # object, "hour", "day", "month" or "year"
+    contract: np.ndarray  # object, "b2b", "employment", "mandate", "specific_task" or None
+
+    def __len__(self) -> int:
+        return len(self.offer)
+
+    def monthly(self) -> tuple[np.ndarray, np.ndarray]:
+        """Low and high amounts converted to a monthly salary."""
+        factor = np.array([MONTHLY_FACTOR[period] for period in self.period], dtype=np.float64)
+        return self.low * factor, self.high * factor
+
+
+def guess_period(amount: float) -> str:
+    """Period of a salary without one in its text, from the size of the amount."""
+    if amount < 1000:
+        return "hour"
+    if amount >= 100000:
+        return "year"
+    return "month"
+
+
+def parse_salary(text: str) -> list[tuple[float, float, str | None, str, str | None]]:
+    """Return (low, high, currency, period, contract) of every amount range in a salary text."""
+    text = text.lower()
+    matches = list(SALARY_RE.finditer(text))
+    salaries = []
+    for position, match in enumerate(matches):
+        end = matches[position + 1].start() if position + 1 < len(matches) else len(text)
+        # Labels before the first amount (e.g. "umowa zlecenie: 30 - 40 zł") belong to it
+        context = text[match.start() if position else 0:end]
+        if match.group("single"):
+            low = high = _amount(match.group("single"), match.group("single_k"))
+        else:
+            low = _amount(match.group("low"), match.group("low_k") or match.group("high_k"))
+            high = _amount(match.group("high"), match.group("high_k"))
+        currency = CURRENCY_RE.search(context)
+        salaries.append((low, high, CURRENCIES[currency.group()] if currency else None,
+                         _keyword(PERIOD_KEYWORDS, context) or guess_period(low),
+                         _keyword(CONTRACT_KEYWORDS, context)))
+    return salaries
+
+
+def parse_salaries(texts: Iterable[str | None]) -> SalaryColumns:
+    """
+    Parse salary texts of a batch of offers into columns.
+
+    Each distinct text is parsed once, offers of the same company or search
+    often share their salary text.
+
+    Args:
+        texts (Iterable[str | None]): Salary text of each offer, empty or None without salary.
+    """
+    parsed: dict[str, list[tuple]] = {}
+    offers, salaries = [], []
+    for index, text in enumerate(texts):
+        if not text:
+            continue
+        if text not in parsed:
+            parsed[text] = parse_salary(text)
+        offers.extend([index] * len(parsed[text]))
+        salaries.extend(parsed[text])
+    lows, highs, currencies, periods, contracts = zip(*salaries) if salaries else ((),) * 5
+    return SalaryColumns(np.array(offers, dtype=np.int64), np.array(lows, dtype=np.float64),
+                         np.array(highs, dtype=np.float64), np.array(currencies, dtype=object),
+                         np.array(periods, dtype=object), np.array(contracts, dtype=object))
+
+
+def tech_stack(requirements: str | None) -> list[str]:
+    """Return canonical names of technologies in requirements, whole-line mentions first, without duplicates."""
+    if not requirements:
+        return []
+    lowered = requirements.lower()
+    found = []
+    for line in LINE_SPLIT_RE.split(lowered):
+        name = TECH_ALIASES.get(line.strip())
+        if name:
+            found.append(name)
+    found.extend(TECH_ALIASES[match.group()] for match in TECH_RE.finditer(lowered))
+    return list(dict.fromkeys(found))
+
+
+@dataclass
+class OfferEnrichment:
+    """
+    Per-offer columns derived from a batch of offers.
+
+    Salaries are monthly, the range spans all salaries of the offer (e.g. the
+    lowest employment and the highest B2B amount). `tech` is a boolean matrix
+    of offers by TECH_NAMES.
+    """
+    salary_min: np.ndarray  # float64, NaN without a salary
+    salary_max: np.ndarray
+    currency: np.ndarray  # object
+    period: np.ndarray  # object, period the salary was stated in
+    contracts: np.ndarray  # object, comma separated contract types
+    tech: np.ndarray  # bool, shape (offers, len(TECH_NAMES))
+
+    def __len__(self) -> int:
+        return len(self.salary_min)
+
+    def has(self, *names: str) -> np.ndarray:
+        """Mask of offers mentioning all of the given technologies."""
+        return self.tech[:, [TECH_INDEX[name] for name in names]].all(axis=1)
+
+    def tech_names(self, index: int) -> list[str]:
+        return [TECH_NAMES[column] for column in np.flatnonzero(self.tech[index])]
+
+    def tech_counts(self) -> dict[str, int]:
+        """Number of offers per technology, most common first."""
+        counts = self.tech.sum(axis=0)
+        return {TECH_NAMES[column]: int(counts[column]) for column in np.argsort(-counts, kind="stable")
+                if counts[column]}
+
+    def rows(self) -> list[tuple]:
+        """Values per offer for the enrichment columns of the offer store."""
+        return [
+            (None if np.isnan(low) else float(low), None if np.isnan(high) else float(high), currency, period,
+             contracts, ",".join(self.tech_names(index)) or None)
+            for index, (low, high, currency, period, contracts)
+            in enumerate(zip(self.salary_min, self.salary_max, self.currency, self.period, self.contracts))
+        ]
+
+
+def enrich(salaries: Iterable[str | None], requirements: Iterable[str | None]) -> OfferEnrichment:
+    """
+    Derive salary and tech stack columns for a batch of offers.
+
+    Args:
+        salaries (Iterable[str | None]): Salary text of each offer.
+        requirements (Iterable[str | None]): Requirements text of each offer.
+    """
+    requirements = list(requirements)
+    count = len(requirements)
+    parsed = parse_salaries(salaries)
+    low, high = parsed.monthly()
+    salary_min = np.full(count, np.nan)
+    salary_max = np.full(count, np.nan)
+    np.fmin.at(salary_min, parsed.offer, low)
+    np.fmax.at(salary_max, parsed.offer, high)
+
+    # Currency and period of the first salary of each offer
+    currency = np.full(count, None, dtype=object)
+    period = np.full(count, None, dtype=object)
+    offers, first = np.unique(parsed.offer, return_index=True)
+    currency[offers] = parsed.currency[first]
+    period[offers] = parsed.period[first]
+    contracts = np.full(count, None, dtype=object)
+    for offer, contract in zip(parsed.offer, parsed.contract):
+        if contract and not (contracts[offer] and contract in contracts[offer].split(",")):
+            contracts[offer] = f"{contracts[offer]},{contract}" if contracts[offer] else contract
+
+    tech = np.zeros((count, len(TECH_NAMES)), dtype=bool)
+    stacks: dict[str | None, list[int]] = {}
+    rows, columns = [], []
+    for index, text in enumerate(requirements):
+        if text not in stacks:
+            stacks[text] = [TECH_INDEX[name] for name in tech_stack(text)]
+        rows.extend([index] * len(stacks[text]))
+        columns.extend(stacks[text])
+    tech[rows, columns] = True
+    return OfferEnrichment(salary_min, salary_max, currency, period, contracts, tech)
@@ -0,0 +1,158 @@
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Container
+
+from loguru import logger
+from playwright.async_api import Page
+
+from scrapers.waits import Waits
+
+# Collects hrefs of list items in the page as they are rendered. A virtualized
+# list recycles nodes, so both added nodes and changed href attributes are read.
+INSTALL_JS = """
+(selector) => {
+    if (window.__harvester) {
+        return;
+    }
+    const state = {seen: new Set(), pending: []};
+    const add = element => {
+        const href = element.getAttribute("href");
+        if (href && !state.seen.has(href)) {
+            state.seen.add(href);
+            state.pending.push(href);
+        }
+    };
+    const collect = root => {
+        if (root.nodeType !== Node.ELEMENT_NODE) {
+            return;
+        }
+        if (root.matches(selector)) {
+            add(root);
+        }
+        root.querySelectorAll(selector).forEach(add);
+    };
+    state.observer = new MutationObserver(records => {
+        for (const record of records) {
+            if (record.type === "attributes") {
+                collect(record.target);
+            } else {
+                record.addedNodes.forEach(collect);
+            }
+        }
+    });
+    state.observer.observe(document.body, {childList: true, subtree: true, attributes: true, attributeFilter: ["href"]});
+    collect(document.body);
+    window.__harvester = state;
+}
+"""
+
+TAKE_JS = """
+() => {
+    const state = window.__harvester;
+    const hrefs = state.pending;
+    state.pending = [];
+    return {hrefs: hrefs, atBottom: window.innerHeight + window.scrollY >= document.body.scrollHeight - 2};
+}
+"""
+
+PENDING_JS = "() => window.__harvester !== undefined && window.__harvester.pending.length > 0"
+
+
+@dataclass
+class HarvestMetrics:
+    """Counters of a single harvest."""
+    scrolls: int = 0
+    round_trips: int = 0
+    harvested: int = 0
+    new_urls: int = 0
+    known_urls: int = 0
+    elapsed: float = 0.0
+    stop_reason: str = ""
+
+
+class InfiniteScrollHarvester:
+    """
+    Collects offer links from an infinite scroll list.
+
+    A MutationObserver in the page records every href once, so each step reads
+    only the links rendered since the previous step. Cost per step no longer
+    grows with the length of the list. Links captured from listing payloads
+    are taken first, they arrive before the list renders them.
+    """
+
+    def __init__(self, selector: str, base_url: str, waits: Waits, max_scrolls: int = 400,
+                 max_idle_scrolls: int = 2, stop_after_known: int = 1, idle_timeout: int = 1500) -> None:
+        """
+        Args:
+            selector (str): CSS selector of offer links.
+            base_url (str): Prefix of relative hrefs.
+            waits (Waits): Used to wait for newly rendered links after a scroll.
+            max_scrolls (int): Upper bound of scroll steps.
+            max_idle_scrolls (int): Stop after this many scrolls in a row that
+                rendered nothing new at the bottom of the list.
+            stop_after_known (int): Stop after this many already known offers,
+                the list is sorted from the newest so the rest is known too.
+            idle_timeout (int): Milliseconds to wait for new links after a scroll.
+                Every harvest ends with `max_idle_scrolls` waits this long.
+        """
+        self.selector = selector
+        self.base_url = base_url
+        self.waits = waits
+        self.max_scrolls = max_scrolls
+        self.max_idle_scrolls = max_idle_scrolls
+        self.stop_after_known = stop_after_known
+        self.idle_timeout = idle_timeout
+        self.metrics = HarvestMetrics()
+
+    def to_url(self, href: str) -> str:
+        href = href.split("?", 1)[0]
+        return href if href.startswith("http") else self.base_url + href
+
+    async def harvest(self, page: Page, known_offers: Container[str],
+                      captured: Callable[[], list[str]] | None = None) -> AsyncIterator[str]:
+        """
+        Scroll the list and yield offer URLs that are not known yet.
+
+        Args:
+            page (Page): Page showing the offer list.
+            known_offers (Container[str]): URLs already scraped.
+            captured (Callable | None): Returns offer URLs captured from listing
+                payloads since the previous call, e.g. `ListingCapture.take_discovered`.
+        """
+        self.metrics = HarvestMetrics()
+        start = time.perf_counter()
+        await page.evaluate(INSTALL_JS, self.selector)
+        idle_scrolls = 0
+        seen = set()
+        try:
+            while True:
+                taken = await page.evaluate(TAKE_JS)
+                self.metrics.round_trips += 1
+                urls = [url for url in map(self.to_url, (captured() if captured else []) + taken["hrefs"])
+                        if not (url in seen or seen.add(url))]
+                self.metrics.harvested += len(urls)
+                for url in urls:
+                    if url in known_offers:
+                        self.metrics.known_urls += 1
+                        if self.metrics.known_urls >= self.stop_after_known:
+                            self.metrics.stop_reason = f"known offer {url}"
+                            return
+                        continue
+                    self.metrics.new_urls += 1
+                    yield url
+
+                idle_scrolls = 0 if urls or not taken["atBottom"] else idle_scrolls + 1
+                if idle_scrolls >= self.max_idle_scrolls:
+                    self.metrics.stop_reason = "end of list"
+                    return
+                if self.metrics.scrolls >= self.max_scrolls:
+                    self.metrics.stop_reason = "scroll limit"
+                    return
+                await page.evaluate("window.scrollBy(0, window.innerHeight)")
+                self.metrics.scrolls += 1
+                # Reading the pending list is cheap enough to check on every animation frame
+                await self.waits.for_condition(page, PENDING_JS, "new offer links", polling="raf",
+                                               timeout=self.idle_timeout)
+        finally:
+            self.metrics.elapsed = time.perf_counter() - start
+            logger.info(f"Harvest finished: {self.metrics}")
@@ -0,0 +1,226 @@
+import json
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Iterator, Optional
+
+import httpx
+from loguru import logger
+
+from scrapers.browser_pool import CONTEXT_ARGS
+from scrapers.config import ScraperConfig
+from scrapers.models import JobOffer
+
+LD_JSON_RE = re.compile(
+    r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.S | re.I)
+NEXT_DATA_RE = re.compile(
+    r'<script[^>]+id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.S | re.I)
+
+
+def create_http_client(config: ScraperConfig) -> httpx.AsyncClient:
+    """
+    Create a pooled HTTP client shared by all fast path extractors.
+
+    Args:
+        config (ScraperConfig): Provides connection limits and timeouts.
+
+    Returns:
+        httpx.AsyncClient: Client keeping connections alive between offers.
+    """
+    limits = httpx.Limits(max_connections=config.http_max_connections,
+                          max_keepalive_connections=config.http_max_connections)
+    headers = {
+        "User-Agent": CONTEXT_ARGS["user_agent"],
+        "Accept-Language": "pl-PL,pl;q=0.9,en;q=0.8",
+    }
+    return httpx.AsyncClient(limits=limits, headers=headers, follow_redirects=True,
+                             timeout=config.page_load_timeout / 1000)
+
+
+def iter_dicts(data: Any) -> Iterator[dict]:
+    """Yield every dictionary nested in decoded JSON data."""
+    if isinstance(data, dict):
+        yield data
+        for value in data.values():
+            yield from iter_dicts(value)
+    elif isinstance(data, list):
+        for item in data:
+            yield from iter_dicts(item)
+
+
+def join_texts(value: Any) -> str:
+    """Flatten a string, a list of strings or a list of named objects into lines."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return join_texts(value.get("name") or value.get("value"))
+    if isinstance(value, list):
+        return "\n".join(text for text in (join_texts(item) for item in value) if text)
+    return str(value)
+
+
+def format_salary_range(low: Any, high: Any, currency: Optional[str], unit: Optional[str]) -> str:
+    if low is None and high is None:
+        return ""
+    amount = "–".join(str(value) for value in (low, high) if value is not None)
+    return " ".join(part for part in (amount, currency, f"/ {unit}" if unit else None) if part)
+
+
+class HttpOfferExtractor(ABC):
+    """
+    Extracts offer data from raw HTML/JSON without opening a browser page.
+
+    `extract` returns None whenever the fast path can not produce a complete
+    offer, so the caller can fall back to the browser based parser.
+    """
+
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self.client = client
+
+    def request_url(self, url: str) -> str:
+        """Return the URL that holds offer data for the given offer page."""
+        return url
+
+    async def extract(self, url: str) -> JobOffer | None:
+        """
+        Fetch and parse a single offer.
+
+        Args:
+            url (str): URL of the job offer page.
+
+        Returns:
+            JobOffer | None: Parsed offer or None if the fast path failed.
+        """
+        try:
+            response = await self.client.get(self.request_url(url))
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.debug(f"HTTP fast path failed for {url}: {e}")
+            return None
+        return self.try_parse(url, response.text)
+
+    def try_parse(self, url: str, body: str) -> JobOffer | None:
+        """
+        Parse a response body, treating any failure as missing data.
+
+        Payloads of an unexpected shape fail with all kinds of errors, e.g.
+        AttributeError when a list comes where an object was expected.
+        """
+        try:
+            return self.parse(url, body)
+        except Exception as e:
+            logger.debug(f"Could not parse offer data of {url}: {type(e).__name__}: {e}")
+            return None
+
+    @abstractmethod
+    def parse(self, url: str, body: str) -> JobOffer | None:
+        """Turn the response body into a JobOffer, or None if data is missing."""
+        ...
+
+
+class PracujHttpExtractor(HttpOfferExtractor):
+    """Reads server side rendered offer data (JSON-LD, then __NEXT_DATA__)."""
+
+    def parse(self, url: str, body: str) -> JobOffer | None:
+        return self._parse_ld_json(url, body) or self._parse_next_data(url, body)
+
+    @staticmethod
+    def _parse_ld_json(url: str, html: str) -> JobOffer | None:
+        for match in LD_JSON_RE.finditer(html):
+            try:
+                data = json.loads(match.group(1))
+            except json.JSONDecodeError:
+                continue
+            posting = next((item for item in iter_dicts(data) if item.get("@type") == "JobPosting"), None)
+            if not posting or not posting.get("title"):
+                continue
+            requirements = join_texts(posting.get("skills")) or join_texts(posting.get("qualifications"))
+            if not requirements:
+                continue
+            return JobOffer(
+                employer=join_texts(posting.get("hiringOrganization")) or None,
+                position=posting["title"].strip(),
+                salary=PracujHttpExtractor._ld_salary(posting.get("baseSalary")),
+                requirements=requirements,
+                url=url,
+            )
+        return None
+
+    @staticmethod
+    def _ld_salary(base_salary: Any) -> str:
+        if not isinstance(base_salary, dict):
+            return ""
+        value = base_salary.get("value") or {}
+        if not isinstance(value, dict):
+            return format_salary_range(value, None, base_salary.get("currency"), None)
+        return format_salary_range(value.get("minValue", value.get("value")), value.get("maxValue"),
+                                   base_salary.get("currency"), value.get("unitText"))
+
+    @staticmethod
+    def _parse_next_data(url: str, html: str) -> JobOffer | None:
+        match = NEXT_DATA_RE.search(html)
+        if not match:
+            return None
+        data = json.loads(match.group(1))
+        offer = next((item for item in iter_dicts(data) if item.get("jobTitle")), None)
+        if not offer:
+            return None
+        requirements = [
+            join_texts(section.get("textElements"))
+            for section in iter_dicts(offer.get("textSections", []))
+            if str(section.get("sectionType", "")).startswith("requirements")
+        ]
+        requirements = "\n".join(text for text in requirements if text)
+        if not requirements:
+            return None
+        employer = offer.get("employerName") or join_texts(offer.get("employer")) or None
+        salaries = [
+            format_salary_range(salary.get("from"), salary.get("to"),
+                                join_texts((salary.get("currency") or {}).get("code")),
+                                join_texts((salary.get("timeUnit") or {}).get("longForm")))
+            for salary in (contract.get("salary") for contract in iter_dicts(offer.get("employment", {})))
+            if isinstance(salary, dict)
+        ]
+        return JobOffer(
+            employer=employer,
+            position=offer["jobTitle"].strip(),
+            salary="\n".join(salary for salary in salaries if salary),
+            requirements=requirements,
+            url=url,
+        )
+
+
+class JustJoinItHttpExtractor(HttpOfferExtractor):
+    """Reads offers from the JustJoin.it offer JSON API."""
+    API_URL = "https://api.justjoin.it/v2/user-panel/offers/{slug}"
+
+    def request_url(self, url: str) -> str:
+        slug = url.rstrip("/").rsplit("/", 1)[-1]
+        return self.API_URL.format(slug=slug)
+
+    def parse(self, url: str, body: str) -> JobOffer | None:
+        return self.offer_from_json(url, json.loads(body))
+
+    @staticmethod
+    def offer_from_json(url: str, data: dict) -> JobOffer | None:
+        """Build an offer from JustJoin.it offer JSON, also used for listing items."""
+        if not data.get("title"):
+            return None
+        skills = data.get("requiredSkills") or data.get("skills") or []
+        requirements = join_texts(skills)
+        if not requirements:
+            return None
+        salaries = [
+            format_salary_range(employment.get("from"), employment.get("to"),
+                                str(employment.get("currency") or "").upper() or None,
+                                " ".join(str(employment.get(key)) for key in ("type", "unit") if employment.get(key)))
+            for employment in data.get("employmentTypes", [])
+        ]
+        return JobOffer(
+            employer=data.get("companyName"),
+            position=data["title"].strip(),
+            salary="\n".join(salary for salary in salaries if salary),
+            requirements=requirements,
+            url=url,
+        )
@@ -1,10 +1,14 @@
 import asyncio
-from typing import Any, Coroutine
+from typing import Coroutine, Container, AsyncIterator
 
 from loguru import logger
 from .base_scraper import BaseScraper, handle_exceptions
-from .config import ScraperConfig
+from .harvester import InfiniteScrollHarvester
+from .http_extractors import JustJoinItHttpExtractor
+from .listing_capture import JJIT_LISTING_API
 from .locators import JJIT_OFFER, JJIT_NAV
+from .metrics import REGISTRY
+from .models import JobOffer
 from .parsers import PracujOfferParser, JustJoinItOfferParser
 
 
@@ -15,15 +19,23 @@ class JustJoinItScraper(BaseScraper):
     Handles navigation, job search, cookie acceptance, retrieving job listings,
     extracting job details, and pagination.
     """
+    site = "justjoinit"
+    listing_api = JJIT_LISTING_API
 
-    def __init__(self, context, browser, semaphore_value=5):
-        super().__init__(context, browser, semaphore_value)
+    def __init__(self, context, browser, semaphore_value=5, config=None, http_client=None, scheduler=None,
+                 claimed=None):
+        super().__init__(context, browser, semaphore_value, config, http_client, scheduler, claimed)
         self.url = "https://justjoin.it/"
+        self.base_url = "https://justjoin.it"
         self.nav_locators = JJIT_NAV
 
     def get_parser(self, page):
         return JustJoinItOfferParser(page, locators=JJIT_OFFER)
 
+    @classmethod
+    def get_http_extractor(cls, client):
+        return JustJoinItHttpExtractor(client)
+
     def get_location_dropdown(self, location):
         return self.page.get_by_role("option", name=location)
 
@@ -37,7 +49,7 @@ class JustJoinItScraper(BaseScraper):
         """
         keywords, location = self._validate_scraper_params(keywords, location)
         await self.page.locator(self.nav_locators.search_input).click()
-        await self.page.wait_for_timeout(100)
+        await self.waits.for_input_focus(self.page, "search input focus")
         await self.page.locator(self.nav_locators.search_input).type('a ' + keywords)
         await self.page.locator(self.nav_locators.location_input).type(location)
         await self.get_location_dropdown(location).click()
@@ -57,48 +69,52 @@ class JustJoinItScraper(BaseScraper):
         for offer_locator in all_offers:
             href = await offer_locator.get_attribute("href")
             if href:
-                urls.append('https://justjoin.it' + self.strip_url(href))
+                urls.append(self.base_url + self.strip_url(href))
 
         return urls
 
+    @staticmethod
+    def is_listing_response(response) -> bool:
+        """Match the fetch/XHR call that loads the offer list."""
+        return response.request.resource_type in ("fetch", "xhr") and "offers" in response.url
+
     async def sort_offers_from_newest(self):
-        await self.page.wait_for_timeout(500)
+        offers = self.page.locator(self.nav_locators.offers_list)
+        await self.waits.for_locator(offers, "search results")
         dropdown = self.page.locator("[name='sort_filter_button']").first
         await dropdown.click()
-        await self.page.locator("[role='menuitem']", has_text='Latest').click()
-        await self.page.wait_for_timeout(2000)
-
-    async def extract_job_data(self, offer_links_from_sheet: list) -> list[Any]:
+        latest = self.page.locator("[role='menuitem']", has_text='Latest')
+        if self.listing_capture:
+            # Offers of the unsorted list would be harvested first and stop at a known offer
+            self.listing_capture.take_discovered()
+        await self.waits.for_response(self.page, self.is_listing_response, latest.click, "sorted offers response")
+        await self.waits.for_locator(offers, "sorted offers")
+
+    async def extract_job_data(self, known_offers: Container[str]) -> AsyncIterator[JobOffer]:
         """
-        Iterate through all pages and offers to extract job data.
+        Scroll through the offer list and extract job data.
 
-        Stores extracted jobs in the `all_jobs` attribute.
+        Offers are scheduled for scraping as soon as their links are harvested,
+        while the list is still being scrolled. Yields offers as they are scraped.
         """
-        MAX_SCROLL_ATTEMPTS = ScraperConfig.scroll_step
-        scroll_count = 0
-        latest_jobs = await self.jobs_list()
-        new_jobs = []
-        urls = []
-        if set(latest_jobs).issubset(set(offer_links_from_sheet)):
-            logger.info(f"No new jobs to scrape.")
-        else:
-            while scroll_count < MAX_SCROLL_ATTEMPTS:
-                await self.page.evaluate("window.scrollBy(0, 400)")
-                await self.page.wait_for_timeout(300)
-                jobs = await self.jobs_list()
-
-                if latest_jobs == jobs:
-                    break
-                else:
-                    latest_jobs = jobs
-                    urls.extend(jobs)
-                scroll_count += 1
-            urls = set(urls)
-            urls = urls.difference(set(offer_links_from_sheet))
-            logger.info(f"Urls to scrape {urls}")
-            tasks = [self.scrape_single_offer(url) for url in urls]
-            results = await asyncio.gather(*tasks)
-            for job_data in results:
+        harvester = InfiniteScrollHarvester(self.nav_locators.offers_list, self.base_url, self.waits,
+                                            max_scrolls=self.config.scroll_step,
+                                            stop_after_known=self.config.stop_after_known,
+                                            idle_timeout=self.config.scroll_idle_timeout)
+        tasks = []
+        try:
+            captured = self.listing_capture.take_discovered if self.listing_capture else None
+            async for url in harvester.harvest(self.page, known_offers, captured):
+                if self.claim(url):
+                    tasks.append(asyncio.create_task(self.scrape_single_offer(url)))
+            if not tasks:
+                logger.info(f"No new jobs to scrape.")
+            for task in asyncio.as_completed(tasks):
+                job_data = await task
                 if job_data:
-                    new_jobs.append(job_data)
-        return new_jobs
+                    yield job_data
+        finally:
+            REGISTRY.observe("listing_harvest", harvester.metrics.elapsed, site=self.site)
+            REGISTRY.inc("offers_known", harvester.metrics.known_urls, site=self.site)
+            for task in tasks:
+                task.cancel()
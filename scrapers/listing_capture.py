@@ -0,0 +1,164 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from loguru import logger
+from playwright.async_api import Page, Response
+from pydantic import ValidationError
+
+from scrapers.http_extractors import NEXT_DATA_RE, JustJoinItHttpExtractor, iter_dicts, join_texts
+from scrapers.models import JobOffer, OfferRecord
+from scrapers.offer_store import offer_key
+
+
+@dataclass(frozen=True)
+class ListingApi:
+    """
+    Where a site delivers its search results and how to read them.
+
+    `parse` receives the decoded payload and returns offers found in it keyed
+    by URL, with None for offers whose listing data is not complete.
+    """
+    url_pattern: str
+    resource_types: tuple[str, ...]
+    body_format: str  # "json" or "next_data" (HTML with an embedded __NEXT_DATA__ script)
+    parse: Callable[[Any], dict[str, JobOffer | None]]
+
+
+def parse_jjit_listing(data: Any) -> dict[str, JobOffer | None]:
+    offers = {}
+    for item in iter_dicts(data):
+        if item.get("slug") and item.get("title"):
+            url = f"https://justjoin.it/job-offer/{item['slug']}"
+            offers[url] = JustJoinItHttpExtractor.offer_from_json(url, item)
+    return offers
+
+
+def parse_pracuj_listing(data: Any) -> dict[str, JobOffer | None]:
+    offers = {}
+    for item in iter_dicts(data):
+        if not item.get("jobTitle") or not isinstance(item.get("offers"), list):
+            continue
+        requirements = join_texts(item.get("technologies"))
+        for offer in item["offers"]:
+            url = offer.get("offerAbsoluteUri") if isinstance(offer, dict) else None
+            if not url:
+                continue
+            url = url.split("?", 1)[0]
+            offers[url] = JobOffer(
+                employer=item.get("companyName"),
+                position=item["jobTitle"].strip(),
+                salary=item.get("salaryDisplayText") or "",
+                requirements=requirements,
+                url=url,
+            ) if requirements else None
+    return offers
+
+
+PRACUJ_LISTING_API = ListingApi(
+    url_pattern="pracuj.pl/praca/",
+    resource_types=("document",),
+    body_format="next_data",
+    parse=parse_pracuj_listing,
+)
+
+JJIT_LISTING_API = ListingApi(
+    url_pattern="/offers",
+    resource_types=("fetch", "xhr"),
+    body_format="json",
+    parse=parse_jjit_listing,
+)
+
+
+class ListingCapture:
+    """
+    Reads search result payloads as the browser receives them.
+
+    Offer URLs are discovered from the payloads in listing order. Listing
+    items with all stored fields become complete JobOffers, so their detail
+    pages don't have to be visited. Incomplete items are scraped from their
+    detail pages as before.
+    """
+
+    def __init__(self, api: ListingApi) -> None:
+        self.api = api
+        # Kept as plain records, a long search captures thousands of offers
+        self.offers: dict[str, OfferRecord | None] = {}
+        self.responses = 0
+        # Offer URLs by key in listing order, until taken by `take_discovered`
+        self.discovered: dict[str, str] = {}
+
+    def attach(self, page: Page) -> None:
+        """Start capturing listing responses loaded by the page."""
+        page.on("response", self._on_response)
+
+    def detach(self, page: Page) -> None:
+        page.remove_listener("response", self._on_response)
+
+    def matches(self, response: Response) -> bool:
+        return (response.request.resource_type in self.api.resource_types
+                and self.api.url_pattern in response.url and response.ok)
+
+    async def _on_response(self, response: Response) -> None:
+        await self.read(response)
+
+    async def read(self, response: Response) -> list[str]:
+        """
+        Read a response if it is a listing payload.
+
+        Returns:
+            list[str]: Offer URLs of the payload, empty for other responses.
+        """
+        if not self.matches(response):
+            return []
+        try:
+            return self.read_payload(await response.text())
+        except Exception as e:
+            logger.debug(f"Could not read listing response {response.url}: {e}")
+            return []
+
+    def add_payload(self, body: str) -> int:
+        """
+        Parse a listing response body and remember its offers.
+
+        Returns:
+            int: Number of offers found in the payload.
+        """
+        return len(self.read_payload(body))
+
+    def read_payload(self, body: str) -> list[str]:
+        """
+        Parse a listing response body and remember its offers.
+
+        Returns:
+            list[str]: Offer URLs in listing order, empty for unexpected payloads.
+        """
+        if self.api.body_format == "next_data":
+            match = NEXT_DATA_RE.search(body)
+            if not match:
+                return []
+            body = match.group(1)
+        try:
+            offers = self.api.parse(json.loads(body))
+        except (ValueError, ValidationError) as e:
+            logger.debug(f"Unexpected listing payload: {e}")
+            return []
+        for url, offer in offers.items():
+            key = offer_key(url)
+            self.discovered.setdefault(key, url)
+            if offer is not None or key not in self.offers:
+                self.offers[key] = OfferRecord.from_offer(offer) if offer is not None else None
+        self.responses += 1
+        complete = sum(offer is not None for offer in offers.values())
+        logger.debug(f"Captured {len(offers)} listing offers ({complete} complete).")
+        return list(offers)
+
+    def take_discovered(self) -> list[str]:
+        """Return offer URLs captured since the previous call, in listing order."""
+        discovered, self.discovered = list(self.discovered.values()), {}
+        return discovered
+
+    def get(self, url: str) -> JobOffer | None:
+        """Return the complete offer captured for the URL, None if it has to be scraped."""
+        record = self.offers.get(offer_key(url))
+        return record.to_offer(url=url) if record else None
@@ -21,6 +21,10 @@ class OfferPageLocators:
     position: str
     salary: str
     requirements: str
+    # locators for justjoin.it, read by a page script so plain CSS and visible labels
+    employer_css: Optional[str] = None
+    requirements_label: Optional[str] = None
+    salary_labels: tuple[str, ...] = ()
 
 # --- PRACUJ.PL ---
 PRACUJ_NAV = NavigationLocators(
@@ -48,6 +52,9 @@ JJIT_OFFER = OfferPageLocators(
     requirements = "text=Tech stack >> .. >> h4",
     salary="xpath=/html/body/div[3]/div/div/div[4]/div/div[3]/div[2]/div[1]/div/div[2]/div",
     position = "h1",
+    employer_css="div:has(h1) a[href*='/brands/']:not([name='aboutUs'])",
+    requirements_label="Tech stack",
+    salary_labels=("Net per month - B2B", "Gross per month"),
 )
 
 JJIT_NAV = NavigationLocators(
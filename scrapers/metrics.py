@@ -0,0 +1,142 @@
+import json
+import math
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+Labels = tuple[tuple[str, str], ...]
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Return the q-quantile (0..1) of the values using the nearest-rank method."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def _labels(labels: dict) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+
+class MetricsRegistry:
+    """
+    In-process timers, counters and gauges of a scrape run.
+
+    Every metric is identified by a name and optional labels, e.g. the site.
+    Timers keep all observed durations, a run observes at most a few thousand
+    per stage, so exact percentiles are cheap.
+    """
+
+    def __init__(self, prefix: str = "scraper") -> None:
+        self.prefix = prefix
+        self.timers: dict[str, dict[Labels, list[float]]] = {}
+        self.counters: dict[str, dict[Labels, float]] = {}
+        self.gauges: dict[str, dict[Labels, float]] = {}
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        """Record a duration of the named stage."""
+        self.timers.setdefault(name, {}).setdefault(_labels(labels), []).append(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """Time the enclosed block, also when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        series = self.counters.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        self.gauges.setdefault(name, {})[_labels(labels)] = value
+
+    def add_gauge(self, name: str, delta: float, **labels) -> None:
+        series = self.gauges.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0) + delta
+
+    def counter(self, name: str, **labels) -> float:
+        return self.counters.get(name, {}).get(_labels(labels), 0)
+
+    def reset(self) -> None:
+        self.timers.clear()
+        self.counters.clear()
+        self.gauges.clear()
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, series in sorted(self.counters.items()):
+            metric = f"{self.prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines += [f"{metric}{_format_labels(labels)} {value:g}" for labels, value in sorted(series.items())]
+        for name, series in sorted(self.gauges.items()):
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines += [f"{metric}{_format_labels(labels)} {value:g}" for labels, value in sorted(series.items())]
+        for name, series in sorted(self.timers.items()):
+            metric = f"{self.prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for labels, values in sorted(series.items()):
+                for q in QUANTILES:
+                    lines.append(f"{metric}{_format_labels(labels, (('quantile', str(q)),))} "
+                                 f"{percentile(values, q):.6f}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {sum(values):.6f}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {len(values)}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> dict:
+        """Return all metrics as a JSON serializable dictionary."""
+        def entries(series, value):
+            return [{"labels": dict(labels), **value(data)} for labels, data in sorted(series.items())]
+
+        return {
+            "counters": {name: entries(series, lambda v: {"value": v}) for name, series in self.counters.items()},
+            "gauges": {name: entries(series, lambda v: {"value": v}) for name, series in self.gauges.items()},
+            "timers": {name: entries(series, lambda v: {
+                "count": len(v), "sum": sum(v), **{f"p{round(q * 100)}": percentile(v, q) for q in QUANTILES}})
+                for name, series in self.timers.items()},
+        }
+
+    def summary_table(self) -> str:
+        """Format stage timings and counters as a plain text table for the run log."""
+        header = f"{'stage':<22} {'labels':<28} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'total':>9}"
+        lines = [header, "-" * len(header)]
+        for name, series in sorted(self.timers.items()):
+            for labels, values in sorted(series.items()):
+                label_text = ",".join(f"{key}={value}" for key, value in labels)
+                p50, p95, p99 = (percentile(values, q) for q in QUANTILES)
+                lines.append(f"{name:<22} {label_text:<28} {len(values):>6} {p50:>7.2f}s {p95:>7.2f}s "
+                             f"{p99:>7.2f}s {sum(values):>8.1f}s")
+        for name, series in sorted(self.counters.items()):
+            for labels, value in sorted(series.items()):
+                label_text = ",".join(f"{key}={value}" for key, value in labels)
+                lines.append(f"{name:<22} {label_text:<28} {value:>6g}")
+        return "\n".join(lines)
+
+    def export(self, prometheus_path: str = "", json_path: str = "") -> None:
+        """Write the metrics to the given files, empty paths are skipped."""
+        if prometheus_path:
+            with open(prometheus_path, "w", encoding="utf-8") as f:
+                f.write(self.to_prometheus())
+        if json_path:
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(self.to_json(), f, indent=2)
+
+
+# Registry shared by all stages of the process
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,238 @@
+"""
+Near-duplicate offers across sites and reposts.
+
+The same job is often posted on pracuj.pl and justjoin.it, or reposted under
+a new URL, so `offer_key` doesn't match. Each offer is reduced to the word
+shingles of its position, employer and requirements and signed with MinHash.
+Signatures are split into bands, offers sharing a band land in the same LSH
+bucket and only those candidates are compared, so clustering is roughly
+linear in the number of offers.
+"""
+import time
+import zlib
+from functools import lru_cache
+from typing import Iterable
+
+import numpy as np
+from loguru import logger
+
+from scrapers.metrics import REGISTRY
+from scrapers.models import JobOffer
+from scrapers.offer_index import tokenize
+from scrapers.offer_store import offer_key
+
+# Seniority words of a position, offers differing in them are different jobs with the same requirements
+SENIORITY = {"intern", "internship", "staz", "stazysta", "junior", "mid", "regular", "senior", "lead", "principal",
+             "staff", "architect", "head"}
+# Shingles hashed per numpy call, keeps the (shingles x permutations) matrix in CPU cache
+SIGN_CHUNK = 2048
+
+
+@lru_cache(maxsize=2 ** 16)
+def token_hash(token: str) -> int:
+    return zlib.crc32(token.encode("utf-8"))
+
+
+def shingles(position: str | None, employer: str | None, requirements: str | None) -> np.ndarray:
+    """
+    Hash the word shingles (pairs of consecutive words) of an offer.
+
+    Words are hashed with CRC32 and a shingle packs the hashes of its two
+    words into one 64-bit id.
+
+    Returns:
+        np.ndarray: Unique uint64 shingle ids, stable across processes.
+    """
+    tokens = tokenize(" ".join(filter(None, (position, employer, requirements))))
+    hashes = np.fromiter(map(token_hash, tokens), dtype=np.uint64, count=len(tokens))
+    if len(hashes) < 2:
+        return hashes
+    return np.unique((hashes[:-1] << np.uint64(32)) | hashes[1:])
+
+
+def seniority(position: str | None) -> frozenset[str]:
+    return frozenset(SENIORITY.intersection(tokenize(position)))
+
+
+class NearDuplicateIndex:
+    """
+    MinHash signatures of seen offers with LSH buckets.
+
+    Offers are kept in clusters, the first offer seen is the original and
+    later near-duplicates point to it. Two offers are near-duplicates when
+    their estimated Jaccard similarity reaches `threshold` and their
+    positions name the same seniority.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.7, seed: int = 1) -> None:
+        """
+        Args:
+            num_perm (int): MinHash permutations, the signature length.
+            bands (int): LSH bands, must divide num_perm. Pairs with a similarity
+                around (1 / bands) ** (bands / num_perm) become candidates.
+            threshold (float): Estimated Jaccard similarity of near-duplicates.
+            seed (int): Seed of the hash functions, signatures of different seeds don't compare.
+        """
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing, a must be odd
+        self.a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        # Per band, offers by the bytes of their signature rows in the band
+        self.buckets: list[dict[bytes, list[int]]] = [{} for _ in range(bands)]
+        self.signatures = np.zeros((0, num_perm), dtype=np.uint32)
+        self.size = 0
+        self.urls: list[str] = []
+        self.seniorities: list[frozenset[str]] = []
+        self.parent: list[int] = []
+        # URL of the original of every near-duplicate seen in this process
+        self.duplicate_of: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def sign(self, shingle_sets: list[np.ndarray]) -> np.ndarray:
+        """
+        Compute MinHash signatures.
+
+        Args:
+            shingle_sets (list[np.ndarray]): Non-empty shingle hashes of each offer.
+
+        Returns:
+            np.ndarray: uint32 array of shape (offers, num_perm).
+        """
+        signatures = np.empty((len(shingle_sets), self.num_perm), dtype=np.uint32)
+        start = 0
+        while start < len(shingle_sets):
+            end, total = start, 0
+            while end < len(shingle_sets) and (end == start or total + len(shingle_sets[end]) <= SIGN_CHUNK):
+                total += len(shingle_sets[end])
+                end += 1
+            chunk = shingle_sets[start:end]
+            lengths = np.fromiter(map(len, chunk), dtype=np.int64, count=len(chunk))
+            hashed = np.concatenate(chunk)[:, None] * self.a
+            hashed += self.b
+            hashed >>= np.uint64(32)
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            signatures[start:end] = np.minimum.reduceat(hashed, offsets, axis=0)
+            start = end
+        return signatures
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        data = signature.tobytes()
+        width = len(data) // self.bands
+        return [data[start:start + width] for start in range(0, len(data), width)]
+
+    def root(self, doc: int) -> int:
+        while self.parent[doc] != doc:
+            self.parent[doc] = self.parent[self.parent[doc]]
+            doc = self.parent[doc]
+        return doc
+
+    def _find(self, signature: np.ndarray, band_keys: list[bytes], url: str, level: frozenset[str]) -> int | None:
+        candidates = {doc for buckets, band_key in zip(self.buckets, band_keys) for doc in buckets.get(band_key, ())}
+        if not candidates:
+            return None
+        # The same offer under another URL (e.g. a resumed search) is not a duplicate of itself
+        key = offer_key(url)
+        candidates = [doc for doc in candidates
+                      if self.seniorities[doc] == level and offer_key(self.urls[doc]) != key]
+        if not candidates:
+            return None
+        similarity = (self.signatures[candidates] == signature).mean(axis=1)
+        best = int(np.argmax(similarity))
+        return candidates[best] if similarity[best] >= self.threshold else None
+
+    def _append(self, signature: np.ndarray, band_keys: list[bytes], url: str, level: frozenset[str],
+                parent: int | None) -> None:
+        if self.size == len(self.signatures):
+            grown = np.zeros((max(1024, 2 * self.size), self.num_perm), dtype=np.uint32)
+            grown[:self.size] = self.signatures[:self.size]
+            self.signatures = grown
+        doc = self.size
+        self.signatures[doc] = signature
+        self.size += 1
+        self.urls.append(url)
+        self.seniorities.append(level)
+        self.parent.append(doc if parent is None else self.root(parent))
+        for buckets, band_key in zip(self.buckets, band_keys):
+            buckets.setdefault(band_key, []).append(doc)
+
+    def add_many(self, rows: Iterable[tuple[str, str | None, str | None, str | None]]) -> list[str | None]:
+        """
+        Add offers and find their originals.
+
+        Args:
+            rows (Iterable[tuple]): url, position, employer and requirements of each offer.
+
+        Returns:
+            list[str | None]: URL of the original of each offer, None for offers
+            that are not near-duplicates of an earlier one.
+        """
+        rows = list(rows)
+        shingle_sets = [shingles(position, employer, requirements) for _, position, employer, requirements in rows]
+        signed = [index for index, hashes in enumerate(shingle_sets) if len(hashes)]
+        signatures = dict(zip(signed, self.sign([shingle_sets[index] for index in signed])))
+        originals = []
+        for index, (url, position, _, _) in enumerate(rows):
+            signature = signatures.get(index)
+            if signature is None:
+                # Nothing to compare, e.g. an offer without any text
+                originals.append(None)
+                continue
+            level = seniority(position)
+            band_keys = self._band_keys(signature)
+            match = self._find(signature, band_keys, url, level)
+            self._append(signature, band_keys, url, level, match)
+            original = None if match is None else self.urls[self.root(match)]
+            if original is not None:
+                self.duplicate_of[url] = original
+            originals.append(original)
+        return originals
+
+    def split(self, site: str, offers: list[JobOffer]) -> list[JobOffer]:
+        """
+        Add scraped offers and return those that are not near-duplicates.
+
+        Near-duplicates are remembered in `duplicate_of`.
+        """
+        originals = self.add_many((offer.url, offer.position, offer.employer, offer.requirements) for offer in offers)
+        unique = []
+        for offer, original in zip(offers, originals):
+            if original is None:
+                unique.append(offer)
+                continue
+            logger.info(f"Near-duplicate of {original}: {offer.url}")
+            REGISTRY.inc("offers_near_duplicate", site=site)
+        return unique
+
+    def clusters(self) -> list[list[str]]:
+        """URLs of every group of near-duplicates, the original first."""
+        groups: dict[int, list[str]] = {}
+        for doc in range(self.size):
+            groups.setdefault(self.root(doc), []).append(self.urls[doc])
+        return [urls for urls in groups.values() if len(urls) > 1]
+
+    @classmethod
+    def from_store(cls, store, max_age: float, **kwargs) -> "NearDuplicateIndex":
+        """
+        Build an index of the offers stored within the last `max_age` seconds, oldest first.
+
+        Args:
+            store (OfferStore): Store of scraped offers.
+            max_age (float): Age in seconds of the oldest offer a repost is compared with.
+            **kwargs: Parameters of the index, see `__init__`.
+        """
+        index = cls(**kwargs)
+        start = time.perf_counter()
+        index.add_many(store.recent_offers(max_age))
+        # Duplicates among stored offers were decided when they were scraped
+        index.duplicate_of.clear()
+        logger.info(f"Near-duplicate index of {len(index)} stored offers built in "
+                    f"{time.perf_counter() - start:.2f}s.")
+        return index
@@ -0,0 +1,109 @@
+import csv
+import json
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+
+from scrapers.models import OFFER_FIELDS, JobOffer, OfferRecord
+
+# Last sheet column, kept by hand in the sheet (e.g. "applied"), scraped rows leave it empty
+SHEET_STATUS = ""
+SHEET_COLUMNS = [*OFFER_FIELDS, "status"]
+
+
+class OfferBatch:
+    """
+    Offers stored column by column.
+
+    Sinks and exports serialize a batch straight from its columns, without a
+    dict or model per offer. pyarrow is only needed for `to_parquet`.
+    """
+    __slots__ = ("columns",)
+
+    def __init__(self, columns: dict[str, list] | None = None) -> None:
+        """
+        Args:
+            columns (dict[str, list] | None): Equally long value lists keyed by OFFER_FIELDS.
+        """
+        self.columns = columns or {name: [] for name in OFFER_FIELDS}
+
+    @classmethod
+    def from_offers(cls, offers: Iterable) -> "OfferBatch":
+        """Collect JobOffers or OfferRecords (anything with the offer attributes)."""
+        batch = cls()
+        for offer in offers:
+            batch.append(offer)
+        return batch
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> "OfferBatch":
+        """Collect rows of values in OFFER_FIELDS order, e.g. from a database cursor."""
+        columns = list(zip(*rows))
+        if not columns:
+            return cls()
+        return cls({name: list(values) for name, values in zip(OFFER_FIELDS, columns)})
+
+    def append(self, offer) -> None:
+        for name, values in self.columns.items():
+            values.append(getattr(offer, name))
+
+    def __len__(self) -> int:
+        return len(self.columns["url"])
+
+    def rows(self) -> Iterator[tuple]:
+        """Yield offers as tuples in OFFER_FIELDS order."""
+        return zip(*(self.columns[name] for name in OFFER_FIELDS))
+
+    def records(self) -> Iterator[OfferRecord]:
+        return (OfferRecord(*row) for row in self.rows())
+
+    def to_offers(self) -> list[JobOffer]:
+        """Validate the batch into JobOffers."""
+        return [record.to_offer() for record in self.records()]
+
+    def sheet_rows(self) -> list[list]:
+        """Rows in SHEET_COLUMNS order, ready for `SheetWriter.write`."""
+        return [[*row, SHEET_STATUS] for row in self.rows()]
+
+    def write_jsonl(self, f: TextIO, **extra) -> None:
+        """
+        Write one JSON object per offer, `extra` fields (e.g. site) come first.
+
+        Key prefixes are encoded once per batch and only values per offer.
+        """
+        head = "".join(f"{json.dumps(key)}: {json.dumps(value, ensure_ascii=False)}, " for key, value in extra.items())
+        keys = [f"{json.dumps(name)}: " for name in OFFER_FIELDS]
+        dumps = json.JSONEncoder(ensure_ascii=False).encode
+        for row in self.rows():
+            f.write("{" + head + ", ".join(key + dumps(value) for key, value in zip(keys, row)) + "}\n")
+
+    def write_csv(self, f: TextIO, header: bool = True) -> None:
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(OFFER_FIELDS)
+        writer.writerows(self.rows())
+
+    def to_parquet(self, path: str) -> None:
+        """
+        Write the batch to a Parquet file.
+
+        Raises:
+            ImportError: pyarrow is not installed.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export needs pyarrow, install it with `pipenv install pyarrow`.") from e
+        pq.write_table(pa.table({name: self.columns[name] for name in OFFER_FIELDS}), path)
+
+    def export(self, path: str) -> None:
+        """Write the batch to a .jsonl, .csv or .parquet file, chosen by the extension."""
+        suffix = Path(path).suffix
+        if suffix == ".parquet":
+            self.to_parquet(path)
+            return
+        writers = {".jsonl": self.write_jsonl, ".csv": self.write_csv}
+        if suffix not in writers:
+            raise ValueError(f"Unsupported export format '{suffix}', use .jsonl, .csv or .parquet")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writers[suffix](f)
@@ -0,0 +1,447 @@
+"""
+In-memory search index over collected offers.
+
+    index = OfferIndex.load("offer_index")
+    index.sync_from_store(store)
+    index.search("python AND django, salary >= 20k, Łódź")
+
+Position, employer, requirements, tech stack and the URL slug (which carries
+the city on both sites) are split into folded tokens: lowercase, without
+Polish diacritics. Each token maps to the ascending ids of the offers that
+contain it. Postings of the last snapshot live in flat numpy arrays that are
+memory-mapped on load, offers added since then go to a small delta segment
+merged in by `compact`. Salaries are the monthly salary_min/salary_max
+columns of scrapers.enrichment.
+"""
+import json
+import operator
+import re
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+from loguru import logger
+
+from scrapers.enrichment import enrich
+from scrapers.models import JobOffer
+from scrapers.offer_store import offer_fingerprint, offer_key
+
+SNAPSHOT_VERSION = 1
+FOLD = str.maketrans("ąćęłńóśźżĄĆĘŁŃÓŚŹŻ", "acelnoszzACELNOSZZ")
+# Words, versions ("3.12") and names like c++, c# or node.js
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[+#]+|\.[a-z0-9]+)*")
+# Longer tokens are cut, the token table has fixed width rows
+MAX_TOKEN = 32
+# URL path words shared by every offer of a site
+URL_STOP_TOKENS = {"praca", "oferta", "job", "offer"}
+FINGERPRINT_LENGTH = 16
+# The delta segment is merged once it outgrows the base postings, so bulk loads stay linear
+MIN_COMPACT_POSTINGS = 100_000
+# Store rows changed this many seconds before the last sync are applied again, in case
+# another process committed them late. Unchanged offers are skipped by their fingerprint.
+SYNC_OVERLAP = 60.0
+# Queries whose rarest term is in more than 1/DENSE_RATIO of the offers are answered with masks
+DENSE_RATIO = 16
+# Masks of common tokens kept between queries, 1 byte per offer each
+MAX_BITMAPS = 64
+
+PART_SPLIT_RE = re.compile(r",|\s+and\s+", re.IGNORECASE)
+SALARY_FILTER_RE = re.compile(
+    r"(?:salary|pensja|wynagrodzenie)?\s*(?P<op>>=|≥|>|<=|≤|<)\s*(?P<amount>\d[\d\s]*(?:[.,]\d+)?)\s*(?P<k>k)?")
+SALARY_OPERATORS = {">=": operator.ge, ">": operator.gt, "<=": operator.le, "<": operator.lt}
+
+# Base segment arrays, memory-mapped on load
+MAPPED_ARRAYS = ("tokens", "postings", "posting_offsets", "doc_blob", "doc_offsets")
+# Per offer columns, loaded into memory so they can grow
+DOC_COLUMNS = ("salary_min", "salary_max", "deleted", "fingerprints")
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Split text into lowercase tokens without Polish diacritics."""
+    if not text:
+        return []
+    if not text.isascii():
+        text = text.translate(FOLD)
+    return [token[:MAX_TOKEN] for token in TOKEN_RE.findall(text.lower())]
+
+
+@dataclass
+class Query:
+    """Parsed search: required and excluded tokens and monthly salary bounds."""
+    terms: list[str] = field(default_factory=list)
+    excluded: list[str] = field(default_factory=list)
+    # (operator, amount), ">=" and ">" compare salary_max, "<=" and "<" salary_min
+    salary: list[tuple[str, float]] = field(default_factory=list)
+
+
+def parse_query(text: str) -> Query:
+    """
+    Parse a query like "python AND django, salary >= 20k, Łódź".
+
+    Parts are separated by commas or AND and must all match. A part is either
+    a salary comparison (">= 20k", "salary < 15000") or words, each of which
+    must appear in the offer. Words prefixed with "-" or "NOT" must not.
+
+    Args:
+        text (str): Query typed by the user.
+
+    Returns:
+        Query: Tokens and salary bounds of the query.
+    """
+    query = Query()
+    for part in PART_SPLIT_RE.split(text):
+        part = part.strip()
+        match = SALARY_FILTER_RE.fullmatch(part.lower())
+        if match:
+            op = {"≥": ">=", "≤": "<="}.get(match["op"], match["op"])
+            amount = float(re.sub(r"\s", "", match["amount"]).replace(",", "."))
+            query.salary.append((op, amount * 1000 if match["k"] else amount))
+            continue
+        negate = False
+        for word in part.split():
+            if word == "NOT":
+                negate = True
+                continue
+            if word.startswith("-"):
+                negate, word = True, word[1:]
+            (query.excluded if negate else query.terms).extend(tokenize(word))
+            negate = False
+    return query
+
+
+@dataclass
+class Hit:
+    url: str
+    position: str
+    employer: str
+    salary_min: float | None
+    salary_max: float | None
+
+
+@dataclass
+class SearchResult:
+    """Matching offers, newest first, cut to the requested limit."""
+    total: int
+    hits: list[Hit]
+    seconds: float
+
+
+def _contains(postings: np.ndarray, docs: np.ndarray) -> np.ndarray:
+    """Mask of `docs` found in the sorted `postings`."""
+    if not len(postings):
+        return np.zeros(len(docs), dtype=bool)
+    index = np.minimum(np.searchsorted(postings, docs), len(postings) - 1)
+    return postings[index] == docs
+
+
+class OfferIndex:
+    """
+    Inverted index of offers with salary filters.
+
+    Offer ids grow in insertion order, so newer offers have higher ids and every
+    posting list is sorted. An offer added again under the same URL key with
+    a different fingerprint gets a new id, the old one is marked deleted.
+    """
+
+    def __init__(self) -> None:
+        # Base segment: sorted token table, concatenated postings and "url\tposition\temployer" documents
+        self.tokens = np.array([], dtype=f"<U{MAX_TOKEN}")
+        self.postings = np.array([], dtype=np.int32)
+        self.posting_offsets = np.zeros(1, dtype=np.int64)
+        self.doc_blob = np.array([], dtype=np.uint8)
+        self.doc_offsets = np.zeros(1, dtype=np.int64)
+        # Delta segment: offers added since the base segment was built
+        self.delta: dict[str, list[int]] = {}
+        self.delta_postings = 0
+        self.delta_docs: list[str] = []
+        # Per offer columns, allocated ahead like a list
+        self.size = 0
+        self.salary_min = np.empty(0)
+        self.salary_max = np.empty(0)
+        self.deleted = np.zeros(0, dtype=bool)
+        self.fingerprints = np.zeros(0, dtype=f"S{FINGERPRINT_LENGTH}")
+        self.synced_at = 0.0
+        self._ids: dict[str, int] | None = None
+        self._bitmaps: dict[str, np.ndarray] = {}
+        # Token to row of the token table, built on the first lookup
+        self._token_ids: dict[str, int] | None = None
+
+    def __len__(self) -> int:
+        return self.size - int(self.deleted[:self.size].sum())
+
+    @property
+    def base_docs(self) -> int:
+        return len(self.doc_offsets) - 1
+
+    def document(self, doc: int) -> tuple[str, str, str]:
+        """Return url, position and employer of an offer."""
+        if doc < self.base_docs:
+            start, end = self.doc_offsets[doc:doc + 2].tolist()
+            text = self.doc_blob[start:end].tobytes().decode("utf-8")
+        else:
+            text = self.delta_docs[doc - self.base_docs]
+        url, position, employer = text.split("\t")
+        return url, position, employer
+
+    def lookup(self, token: str) -> np.ndarray:
+        """Sorted ids of offers containing the token, deleted offers included."""
+        if self._token_ids is None:
+            self._token_ids = {name: index for index, name in enumerate(self.tokens.tolist())}
+        index = self._token_ids.get(token)
+        if index is None:
+            postings = self.postings[:0]
+        else:
+            start, end = self.posting_offsets[index:index + 2].tolist()
+            postings = self.postings[start:end]
+        delta = self.delta.get(token)
+        if delta:
+            return np.concatenate((postings, np.array(delta, dtype=np.int32)))
+        return postings
+
+    def _doc_ids(self) -> dict[str, int]:
+        """Offer key to id of indexed offers, built on the first update after a load."""
+        if self._ids is None:
+            self._ids = {offer_key(self.document(doc)[0]): doc for doc in range(self.size) if not self.deleted[doc]}
+        return self._ids
+
+    def _reserve(self) -> None:
+        if self.size < len(self.salary_min):
+            return
+        capacity = max(1024, 2 * self.size)
+        for name in DOC_COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+
+    def add(self, url: str, position: str, employer: str, requirements: str | None = None,
+            tech_stack: str | None = None, salary_min: float | None = None, salary_max: float | None = None,
+            fingerprint: str = "") -> bool:
+        """
+        Index an offer, replacing the indexed version of it.
+
+        Args:
+            url (str): Offer URL, offers are matched by `offer_key`.
+            position (str): Position, employer, requirements and tech_stack are searchable.
+            employer (str):
+            requirements (str | None):
+            tech_stack (str | None): Comma separated technology names.
+            salary_min (float | None): Monthly salary range, None without a salary.
+            salary_max (float | None):
+            fingerprint (str): `offer_fingerprint` of the offer, re-adding an unchanged offer is skipped.
+
+        Returns:
+            bool: False if the offer was already indexed unchanged.
+        """
+        key = offer_key(url)
+        fingerprint = fingerprint[:FINGERPRINT_LENGTH].encode("ascii")
+        ids = self._doc_ids()
+        old = ids.get(key)
+        if old is not None:
+            if fingerprint and self.fingerprints[old] == fingerprint:
+                return False
+            self.deleted[old] = True
+        self._reserve()
+        doc = self.size
+        self.size += 1
+        self.salary_min[doc] = np.nan if salary_min is None else salary_min
+        self.salary_max[doc] = np.nan if salary_max is None else salary_max
+        self.deleted[doc] = False
+        self.fingerprints[doc] = fingerprint
+        ids[key] = doc
+        self.delta_docs.append("\t".join((value or "").replace("\t", " ") for value in (url, position, employer)))
+
+        tokens = set(tokenize(" ".join(filter(None, (position, employer, requirements, tech_stack)))))
+        tokens.update(token for token in tokenize(urlsplit(url).path)
+                      if not token.isdigit() and token not in URL_STOP_TOKENS)
+        for token in tokens:
+            self.delta.setdefault(token, []).append(doc)
+        self.delta_postings += len(tokens)
+        self._bitmaps.clear()
+        if self.delta_postings > max(MIN_COMPACT_POSTINGS, len(self.postings)):
+            self.compact()
+        return True
+
+    def add_offers(self, offers: list[JobOffer]) -> int:
+        """
+        Index scraped offers with their derived salary and tech stack.
+
+        Returns:
+            int: Number of offers that were new or changed.
+        """
+        enrichment = enrich((offer.salary for offer in offers), (offer.requirements for offer in offers))
+        added = 0
+        for offer, (low, high, _, _, _, tech_stack) in zip(offers, enrichment.rows()):
+            added += self.add(offer.url, offer.position, offer.employer, offer.requirements, tech_stack, low, high,
+                              offer_fingerprint(offer))
+        return added
+
+    def remove(self, url: str) -> bool:
+        """Drop an offer, e.g. one that was closed. Returns False if it was not indexed."""
+        doc = self._doc_ids().pop(offer_key(url), None)
+        if doc is None:
+            return False
+        self.deleted[doc] = True
+        return True
+
+    def sync_from_store(self, store) -> int:
+        """
+        Apply offers added, changed or closed in the OfferStore since the last sync.
+
+        Returns:
+            int: Number of offers added, replaced or removed.
+        """
+        changed = 0
+        for row in store.changed_since(max(0.0, self.synced_at - SYNC_OVERLAP)):
+            if row["status"] == "open":
+                changed += self.add(row["url"], row["position"], row["employer"], row["requirements"],
+                                    row["tech_stack"], row["salary_min"], row["salary_max"], row["fingerprint"] or "")
+            else:
+                changed += self.remove(row["url"])
+            self.synced_at = max(self.synced_at, row["updated_at"])
+        if changed:
+            logger.info(f"Search index updated with {changed} offers ({len(self)} indexed).")
+        return changed
+
+    def search(self, query: Query | str, limit: int = 20) -> SearchResult:
+        """
+        Find offers matching all terms and salary bounds of the query.
+
+        Posting lists of rare terms are intersected from the shortest one,
+        common terms and salary bounds are combined as masks over all offers.
+        Offers without a salary never match a salary bound.
+
+        Args:
+            query (Query | str): Parsed query or query text, see `parse_query`.
+            limit (int): Maximum number of hits returned.
+
+        Returns:
+            SearchResult: Total number of matches and the newest `limit` of them.
+        """
+        start = time.perf_counter()
+        if isinstance(query, str):
+            query = parse_query(query)
+        postings = sorted((self.lookup(term) for term in set(query.terms)), key=len)
+        if postings and len(postings[0]) * DENSE_RATIO < self.size:
+            docs = self._match_sparse(postings, query)
+        else:
+            docs = self._match_dense(query)
+        newest = docs[::-1][:limit]
+        # NaN != NaN marks a missing salary
+        hits = [Hit(*self.document(doc), low if low == low else None, high if high == high else None)
+                for doc, low, high in zip(newest.tolist(), self.salary_min[newest].tolist(),
+                                          self.salary_max[newest].tolist())]
+        return SearchResult(len(docs), hits, time.perf_counter() - start)
+
+    def _match_sparse(self, postings: list[np.ndarray], query: Query) -> np.ndarray:
+        """Intersect posting lists from the shortest one, for queries with a rare term."""
+        docs = postings[0]
+        for other in postings[1:]:
+            docs = docs[_contains(other, docs)]
+        for term in query.excluded:
+            docs = docs[~_contains(self.lookup(term), docs)]
+        docs = docs[~self.deleted[docs]]
+        for op, amount in query.salary:
+            column = self.salary_max if op.startswith(">") else self.salary_min
+            docs = docs[SALARY_OPERATORS[op](column[docs], amount)]
+        return docs
+
+    def _match_dense(self, query: Query) -> np.ndarray:
+        """Combine masks over all offers, for queries of common terms or salary bounds only."""
+        mask = ~self.deleted[:self.size]
+        for term in query.terms:
+            mask &= self._bitmap(term)
+        for term in query.excluded:
+            mask &= ~self._bitmap(term)
+        for op, amount in query.salary:
+            column = self.salary_max if op.startswith(">") else self.salary_min
+            mask &= SALARY_OPERATORS[op](column[:self.size], amount)
+        return np.flatnonzero(mask)
+
+    def _bitmap(self, token: str) -> np.ndarray:
+        """Mask of offers containing the token, cached until the next add."""
+        bitmap = self._bitmaps.get(token)
+        if bitmap is None:
+            if len(self._bitmaps) >= MAX_BITMAPS:
+                self._bitmaps.clear()
+            bitmap = np.zeros(self.size, dtype=bool)
+            bitmap[self.lookup(token)] = True
+            self._bitmaps[token] = bitmap
+        return bitmap
+
+    def compact(self) -> None:
+        """Merge the delta segment into the base arrays, dropping deleted offers from the postings."""
+        live = ~self.deleted[:self.size]
+        tokens, postings, offsets = [], [], [0]
+        for token in sorted(set(self.tokens.tolist()) | self.delta.keys()):
+            docs = self.lookup(token)
+            docs = docs[live[docs]]
+            if len(docs):
+                tokens.append(token)
+                postings.append(docs)
+                offsets.append(offsets[-1] + len(docs))
+        encoded = [doc.encode("utf-8") for doc in self.delta_docs]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+
+        self.tokens = np.array(tokens, dtype=f"<U{MAX_TOKEN}")
+        self.postings = np.concatenate(postings) if postings else np.array([], dtype=np.int32)
+        self.posting_offsets = np.array(offsets, dtype=np.int64)
+        self.doc_blob = np.concatenate((self.doc_blob, np.frombuffer(b"".join(encoded), dtype=np.uint8)))
+        self.doc_offsets = np.concatenate((self.doc_offsets, self.doc_offsets[-1] + np.cumsum(lengths)))
+        self.delta, self.delta_postings, self.delta_docs = {}, 0, []
+        self._token_ids = None
+
+    def save(self, path: str) -> None:
+        """
+        Write a snapshot of the index to a directory, replacing the previous one.
+
+        The snapshot is written next to `path` and swapped in when complete.
+        """
+        self.compact()
+        # Detach from the memory-mapped files before they are replaced
+        for name in MAPPED_ARRAYS:
+            setattr(self, name, np.array(getattr(self, name)))
+        target = Path(path)
+        tmp = target.with_name(target.name + ".tmp")
+        old = target.with_name(target.name + ".old")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        for name in MAPPED_ARRAYS:
+            np.save(tmp / f"{name}.npy", getattr(self, name))
+        for name in DOC_COLUMNS:
+            np.save(tmp / f"{name}.npy", getattr(self, name)[:self.size])
+        meta = {"version": SNAPSHOT_VERSION, "docs": self.size, "synced_at": self.synced_at}
+        (tmp / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+        shutil.rmtree(old, ignore_errors=True)
+        if target.exists():
+            target.rename(old)
+        tmp.rename(target)
+        shutil.rmtree(old, ignore_errors=True)
+        logger.info(f"Saved search index of {len(self)} offers to '{path}'.")
+
+    @classmethod
+    def load(cls, path: str) -> "OfferIndex":
+        """
+        Open a snapshot written by `save`, postings and documents are memory-mapped.
+
+        A missing or outdated snapshot gives an empty index, which the next
+        `sync_from_store` fills from scratch.
+        """
+        index = cls()
+        meta_path = Path(path) / "meta.json"
+        if not meta_path.exists():
+            return index
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("version") != SNAPSHOT_VERSION:
+            logger.warning(f"Search index '{path}' has an outdated format, it will be rebuilt.")
+            return index
+        for name in MAPPED_ARRAYS:
+            setattr(index, name, np.load(Path(path) / f"{name}.npy", mmap_mode="r"))
+        for name in DOC_COLUMNS:
+            setattr(index, name, np.load(Path(path) / f"{name}.npy"))
+        index.size = meta["docs"]
+        index.synced_at = meta["synced_at"]
+        return index
@@ -0,0 +1,341 @@
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from typing import Iterable
+from urllib.parse import urlsplit
+
+from gspread.utils import rowcol_to_a1
+from loguru import logger
+
+from scrapers.enrichment import enrich
+from scrapers.metrics import REGISTRY
+from scrapers.models import OFFER_FIELDS, JobOffer
+from scrapers.offer_batch import OfferBatch
+
+PRACUJ_OFFER_ID_RE = re.compile(r",(\d+)$")
+
+# Columns of the offers table, new columns are added to existing databases on open
+OFFER_COLUMNS = {
+    "key": "TEXT PRIMARY KEY",
+    "site": "TEXT NOT NULL",
+    "url": "TEXT NOT NULL",
+    "employer": "TEXT",
+    "position": "TEXT",
+    "salary": "TEXT",
+    "requirements": "TEXT",
+    "added_at": "REAL NOT NULL",
+    # Revisit bookkeeping, see scrapers.revisit
+    "fingerprint": "TEXT",
+    # Fingerprint of the offer as the revisit extractor last parsed it, the baseline of later revisits
+    "revisit_fingerprint": "TEXT",
+    "etag": "TEXT",
+    "last_modified": "TEXT",
+    "last_checked": "REAL",
+    "status": "TEXT NOT NULL DEFAULT 'open'",
+    # Derived by scrapers.enrichment, salaries are monthly
+    "salary_min": "REAL",
+    "salary_max": "REAL",
+    "salary_currency": "TEXT",
+    "salary_period": "TEXT",
+    "contract_types": "TEXT",
+    "tech_stack": "TEXT",
+    "enriched": "INTEGER NOT NULL DEFAULT 0",
+    # Last change of the offer's content or status, the search index syncs rows changed after its snapshot
+    "updated_at": "REAL",
+    # URL of the offer this one is a near-duplicate of, see scrapers.near_duplicates
+    "duplicate_of": "TEXT",
+}
+ENRICHMENT_COLUMNS = ("salary_min", "salary_max", "salary_currency", "salary_period", "contract_types", "tech_stack")
+
+FINGERPRINT_FIELDS = ("employer", "position", "salary", "requirements")
+
+
+def offer_key(url: str) -> str:
+    """
+    Normalize an offer URL into a stable key.
+
+    Query string, fragment, trailing slash, scheme and "www." are dropped.
+    Pracuj offers are keyed by their numeric ID, so renamed offer slugs still match.
+
+    Args:
+        url (str): Offer URL as found on the listing page or in the sheet.
+
+    Returns:
+        str: Key used for membership lookups.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    path = parts.path.rstrip("/")
+    match = PRACUJ_OFFER_ID_RE.search(path)
+    if host.endswith("pracuj.pl") and match:
+        return f"pracuj:{match.group(1)}"
+    return f"{host}{path}"
+
+
+def offer_fingerprint(offer: JobOffer) -> str:
+    """
+    Hash the stored content of an offer.
+
+    The URL is left out, so an offer keeps its fingerprint when only its slug
+    or tracking parameters change.
+    """
+    content = json.dumps([getattr(offer, name) for name in FINGERPRINT_FIELDS], ensure_ascii=False)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class OfferStore:
+    """
+    Local SQLite store of every offer that was scraped or found in the sheet.
+
+    Membership checks use the primary key index, so deduplication costs the same
+    no matter how many offers are stored. Supports `url in store`.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        """
+        Args:
+            path (str): SQLite database file, in-memory database by default.
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        columns = ", ".join(f"{name} {definition}" for name, definition in OFFER_COLUMNS.items())
+        with self.conn:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS offers ({columns})")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS sheet_sync (site TEXT PRIMARY KEY, rows INTEGER NOT NULL, "
+                              "last_url TEXT)")
+            existing = {row[1] for row in self.conn.execute("PRAGMA table_info(offers)")}
+            for name, definition in OFFER_COLUMNS.items():
+                if name not in existing:
+                    self.conn.execute(f"ALTER TABLE offers ADD COLUMN {name} {definition}")
+            if "last_url" not in {row[1] for row in self.conn.execute("PRAGMA table_info(sheet_sync)")}:
+                self.conn.execute("ALTER TABLE sheet_sync ADD COLUMN last_url TEXT")
+
+    def __contains__(self, url: str) -> bool:
+        return self.contains(url)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def contains(self, url: str) -> bool:
+        """Return True if the offer behind the URL is already stored."""
+        row = self.conn.execute("SELECT 1 FROM offers WHERE key = ?", (offer_key(url),)).fetchone()
+        return row is not None
+
+    def count(self, site: str | None = None) -> int:
+        if site is None:
+            return self.conn.execute("SELECT COUNT(*) FROM offers").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM offers WHERE site = ?", (site,)).fetchone()[0]
+
+    def offer_batch(self, site: str | None = None) -> OfferBatch:
+        """Return stored offers with scraped details, of one site or all, as columns."""
+        query = f"SELECT {', '.join(OFFER_FIELDS)} FROM offers WHERE position IS NOT NULL"
+        if site is None:
+            return OfferBatch.from_rows(self.conn.execute(query + " ORDER BY added_at"))
+        return OfferBatch.from_rows(self.conn.execute(query + " AND site = ? ORDER BY added_at", (site,)))
+
+    def add_urls(self, site: str, urls: Iterable[str]) -> int:
+        """
+        Store bare offer URLs, e.g. ones read from the sheet.
+
+        Returns:
+            int: Number of offers that were not stored before.
+        """
+        now = time.time()
+        rows = [(offer_key(url), site, url, now) for url in urls if url and url.startswith("http")]
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO offers (key, site, url, added_at) VALUES (?, ?, ?, ?)", rows)
+            return self.conn.total_changes - before
+
+    def add_offers(self, site: str, offers: Iterable[JobOffer], duplicate_of: dict[str, str] | None = None) -> int:
+        """
+        Store scraped offers, filling in details of offers known only by URL.
+
+        Args:
+            site (str): Site the offers were scraped from.
+            offers (Iterable[JobOffer]): Scraped offers.
+            duplicate_of (dict[str, str] | None): URL of the original of near-duplicate offers, by offer URL.
+
+        Returns:
+            int: Number of offers that were inserted or updated.
+        """
+        now = time.time()
+        offers = list(offers)
+        duplicate_of = duplicate_of or {}
+        enrichment = enrich((offer.salary for offer in offers), (offer.requirements for offer in offers))
+        rows = [(offer_key(offer.url), site, offer.url, offer.employer, offer.position, offer.salary,
+                 offer.requirements, offer_fingerprint(offer), now, *derived, now, duplicate_of.get(offer.url))
+                for offer, derived in zip(offers, enrichment.rows())]
+        updates = ", ".join(f"{name} = excluded.{name}" for name in ENRICHMENT_COLUMNS)
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT INTO offers (key, site, url, employer, position, salary, requirements, fingerprint, added_at, "
+                f"{', '.join(ENRICHMENT_COLUMNS)}, enriched, updated_at, duplicate_of) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET employer = excluded.employer, position = excluded.position, "
+                "salary = excluded.salary, requirements = excluded.requirements, "
+                f"fingerprint = excluded.fingerprint, {updates}, enriched = 1, updated_at = excluded.updated_at", rows)
+            return self.conn.total_changes - before
+
+    def enrich_missing(self, batch_size: int = 5000) -> int:
+        """
+        Derive salary and tech stack columns of stored offers that don't have them yet.
+
+        Returns:
+            int: Number of offers enriched.
+        """
+        enriched = 0
+        while True:
+            rows = self.conn.execute(
+                "SELECT key, salary, requirements FROM offers WHERE enriched = 0 AND position IS NOT NULL LIMIT ?",
+                (batch_size,)).fetchall()
+            if not rows:
+                break
+            keys, salaries, requirements = zip(*rows)
+            derived = enrich(salaries, requirements).rows()
+            now = time.time()
+            assignments = ", ".join(f"{name} = ?" for name in ENRICHMENT_COLUMNS)
+            with self.conn:
+                self.conn.executemany(f"UPDATE offers SET {assignments}, enriched = 1, updated_at = ? WHERE key = ?",
+                                      [(*values, now, key) for values, key in zip(derived, keys)])
+            enriched += len(rows)
+        if enriched:
+            logger.info(f"Enriched {enriched} stored offers.")
+        return enriched
+
+    def recent_offers(self, max_age: float) -> sqlite3.Cursor:
+        """
+        Return scraped offers added within the last `max_age` seconds, oldest first.
+
+        Returns:
+            sqlite3.Cursor: (url, position, employer, requirements) rows.
+        """
+        return self.conn.execute(
+            "SELECT url, position, employer, requirements FROM offers WHERE position IS NOT NULL AND added_at >= ? "
+            "ORDER BY added_at", (time.time() - max_age,))
+
+    def due_for_revisit(self, site: str, max_age: float, interval: float, limit: int) -> list[sqlite3.Row]:
+        """
+        Return open offers of the site worth checking for changes.
+
+        Only offers with scraped details are returned, added within `max_age`
+        seconds and not checked within the last `interval` seconds. Offers
+        checked longest ago come first.
+
+        Returns:
+            list[sqlite3.Row]: Rows with url, fingerprint, revisit_fingerprint, etag,
+            last_modified and the fingerprinted fields.
+        """
+        now = time.time()
+        columns = ", ".join(("url", "fingerprint", "revisit_fingerprint", "etag", "last_modified", *FINGERPRINT_FIELDS))
+        cursor = self.conn.execute(
+            f"SELECT {columns} FROM offers WHERE site = ? AND status = 'open' AND position IS NOT NULL "
+            "AND added_at >= ? AND COALESCE(last_checked, 0) <= ? "
+            "ORDER BY COALESCE(last_checked, 0), added_at DESC LIMIT ?",
+            (site, now - max_age, now - interval, limit))
+        cursor.row_factory = sqlite3.Row
+        return cursor.fetchall()
+
+    def record_check(self, url: str, status: str = "open", etag: str | None = None,
+                     last_modified: str | None = None, fingerprint: str | None = None) -> None:
+        """
+        Remember the outcome of a revisit.
+
+        Validators and the revisit fingerprint are only overwritten when the
+        check produced new ones. A status change counts as an update of the offer.
+        """
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "UPDATE offers SET updated_at = CASE WHEN status IS ? THEN updated_at ELSE ? END, "
+                "status = ?, last_checked = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified), "
+                "revisit_fingerprint = COALESCE(?, revisit_fingerprint) WHERE key = ?",
+                (status, now, status, now, etag, last_modified, fingerprint, offer_key(url)))
+
+    def changed_since(self, timestamp: float = 0.0) -> sqlite3.Cursor:
+        """
+        Return scraped offers added, updated or closed after `timestamp`, oldest change first.
+
+        Near-duplicates of other offers are left out.
+
+        Offers stored before updated_at existed count as changed when they were added.
+
+        Returns:
+            sqlite3.Cursor: Rows with url, employer, position, requirements,
+            tech_stack, salary_min, salary_max, fingerprint, status and updated_at.
+        """
+        cursor = self.conn.execute(
+            "SELECT url, employer, position, requirements, tech_stack, salary_min, salary_max, fingerprint, status, "
+            "COALESCE(updated_at, added_at) AS updated_at FROM offers "
+            "WHERE position IS NOT NULL AND duplicate_of IS NULL AND COALESCE(updated_at, added_at) > ? "
+            "ORDER BY COALESCE(updated_at, added_at)", (timestamp,))
+        cursor.row_factory = sqlite3.Row
+        return cursor
+
+    def sync_from_sheet(self, site: str, worksheet, column: int = 5, chunk_size: int = 500) -> int:
+        """
+        Copy offer URLs that were appended to the sheet since the last sync.
+
+        Rows are appended at the bottom of the sheet, so only the rows after the
+        last synced row are read, in chunks. The first sync reads the whole column.
+        The last synced row is read again with the first chunk, if it no longer
+        holds the same URL the sheet was sorted or rows were deleted, and the
+        whole column is synced again.
+
+        Args:
+            site (str): Site the worksheet belongs to.
+            worksheet: gspread Worksheet with offer URLs.
+            column (int): 1-based index of the URL column.
+            chunk_size (int): Rows read per API call.
+
+        Returns:
+            int: Number of new offers stored.
+        """
+        synced_rows, last_url = self._sheet_sync(site)
+        overlap = 1 if last_url is not None and synced_rows > 1 else 0
+        added = 0
+        while True:
+            start_row = synced_rows + 1 - overlap
+            cell_range = f"{rowcol_to_a1(start_row, column)}:{rowcol_to_a1(start_row + chunk_size - 1, column)}"
+            with REGISTRY.timer("sheet_read", site=site):
+                rows = worksheet.get(cell_range)
+            if overlap and (rows[0][0] if rows and rows[0] else "") != last_url:
+                logger.warning(f"{site} sheet changed above row {synced_rows} since the last sync, "
+                               f"syncing the whole sheet again.")
+                REGISTRY.inc("sheet_resyncs", site=site)
+                synced_rows, overlap = 1, 0
+                continue
+            new_rows = rows[overlap:]
+            overlap = 0
+            if new_rows:
+                added += self.add_urls(site, [row[0] for row in new_rows if row])
+                synced_rows += len(new_rows)
+                last_url = new_rows[-1][0] if new_rows[-1] else ""
+            if len(rows) < chunk_size:
+                break
+        with self.conn:
+            self.conn.execute("INSERT INTO sheet_sync (site, rows, last_url) VALUES (?, ?, ?) "
+                              "ON CONFLICT(site) DO UPDATE SET rows = excluded.rows, last_url = excluded.last_url",
+                              (site, synced_rows, last_url))
+        logger.info(f"Synced {added} new {site} offers from sheet ({self.count(site)} stored).")
+        return added
+
+    def _sheet_sync(self, site: str) -> tuple[int, str | None]:
+        row = self.conn.execute("SELECT rows, last_url FROM sheet_sync WHERE site = ?", (site,)).fetchone()
+        return (row[0], row[1]) if row else (1, None)
+
+    def synced_rows(self, site: str) -> int:
+        """Return the number of sheet rows (header included) already synced for the site."""
+        return self._sheet_sync(site)[0]
+
+    def close(self) -> None:
+        self.conn.close()
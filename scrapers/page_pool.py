@@ -0,0 +1,151 @@
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+from loguru import logger
+from playwright.async_api import BrowserContext, Page
+from playwright.async_api import Error as PlaywrightError
+
+from scrapers.metrics import REGISTRY
+
+BLANK_URL = "about:blank"
+# Chromium only, other browsers report null
+HEAP_JS = "() => performance.memory ? performance.memory.usedJSHeapSize : null"
+
+
+@dataclass
+class PooledPage:
+    """A reusable tab and what is known about it."""
+    page: Page
+    uses: int = 0
+    # Per-page state set up by the first user, e.g. the BlockStats of an attached RequestBlocker
+    data: Any = None
+
+
+@dataclass
+class PagePoolStats:
+    """Counters of a page pool, reported when the pool is closed."""
+    created: int = 0
+    reused: int = 0
+    recycled: dict[str, int] = field(default_factory=dict)
+    heap_mb: list[float] = field(default_factory=list)
+
+    @property
+    def reuse_rate(self) -> float:
+        uses = self.created + self.reused
+        return self.reused / uses if uses else 0.0
+
+    def summary(self) -> str:
+        heap = (f"heap(avg={sum(self.heap_mb) / len(self.heap_mb):.1f}MB, max={max(self.heap_mb):.1f}MB)"
+                if self.heap_mb else "heap(n/a)")
+        return (f"created={self.created} reused={self.reused} reuse_rate={self.reuse_rate:.0%} "
+                f"recycled={self.recycled} {heap}")
+
+
+class PagePool:
+    """
+    Tabs of one browser context reused across offers.
+
+    A page is reset to about:blank when it is given back and kept for the next
+    offer. Pages are closed instead after `max_uses` offers, when their JS heap
+    grows over `max_heap_mb`, when the offer failed (the page may still be
+    loading) or when `size` idle pages are already kept.
+    """
+
+    def __init__(self, context: BrowserContext, size: int = 5, max_uses: int = 50, max_heap_mb: float = 150.0,
+                 name: str = "") -> None:
+        """
+        Args:
+            context (BrowserContext): Context the pages are opened in.
+            size (int): Idle pages kept for reuse, usually the open page budget.
+            max_uses (int): Offers scraped in a page before it is replaced.
+            max_heap_mb (float): JS heap size after a reset above which the page is replaced.
+            name (str): Name used in logs and metrics labels, e.g. the site.
+        """
+        self.context = context
+        self.size = size
+        self.max_uses = max_uses
+        self.max_heap_mb = max_heap_mb
+        self.name = name
+        self.idle: list[PooledPage] = []
+        self.stats = PagePoolStats()
+        self.closed = False
+
+    async def get(self) -> PooledPage:
+        """Return an idle page, or open a new one."""
+        while self.idle:
+            pooled = self.idle.pop()
+            if not pooled.page.is_closed():
+                self.stats.reused += 1
+                REGISTRY.inc("pages_reused", site=self.name)
+                pooled.uses += 1
+                return pooled
+        page = await self.context.new_page()
+        self.stats.created += 1
+        REGISTRY.inc("pages_created", site=self.name)
+        return PooledPage(page, uses=1)
+
+    async def put(self, pooled: PooledPage, healthy: bool = True) -> None:
+        """
+        Give a page back, reset it for the next offer or close it.
+
+        Args:
+            pooled (PooledPage): Page returned by `get`.
+            healthy (bool): False if the offer failed, the page is then closed.
+        """
+        reason = await self._recycle_reason(pooled, healthy)
+        if reason is None:
+            self.idle.append(pooled)
+            return
+        self.stats.recycled[reason] = self.stats.recycled.get(reason, 0) + 1
+        REGISTRY.inc("pages_recycled", site=self.name, reason=reason)
+        await self._close_page(pooled.page)
+
+    async def _recycle_reason(self, pooled: PooledPage, healthy: bool) -> str | None:
+        if self.closed or pooled.page.is_closed():
+            return "closed"
+        if not healthy:
+            return "failed"
+        if pooled.uses >= self.max_uses:
+            return "max_uses"
+        if len(self.idle) >= self.size:
+            return "surplus"
+        try:
+            await pooled.page.goto(BLANK_URL)
+            heap = await pooled.page.evaluate(HEAP_JS)
+        except PlaywrightError as e:
+            logger.debug(f"Could not reset page: {e}")
+            return "reset_failed"
+        if heap is not None:
+            heap_mb = heap / 2 ** 20
+            self.stats.heap_mb.append(heap_mb)
+            REGISTRY.set_gauge("page_heap_mb", round(heap_mb, 1), site=self.name)
+            if heap_mb > self.max_heap_mb:
+                return "memory"
+        return None
+
+    @staticmethod
+    async def _close_page(page: Page) -> None:
+        try:
+            await page.close()
+        except PlaywrightError as e:
+            logger.debug(f"Could not close page: {e}")
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[PooledPage]:
+        """Borrow a page, it is closed instead of reused if the block raises."""
+        pooled = await self.get()
+        healthy = False
+        try:
+            yield pooled
+            healthy = True
+        finally:
+            await self.put(pooled, healthy)
+
+    async def close(self) -> None:
+        """Close the idle pages, pages still in use are closed when given back."""
+        self.closed = True
+        idle, self.idle = self.idle, []
+        for pooled in idle:
+            await self._close_page(pooled.page)
+        logger.info(f"Page pool {self.name} closed: {self.stats.summary()}")
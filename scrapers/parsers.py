@@ -1,9 +1,57 @@
-import playwright.async_api
 from playwright.async_api import Page
 
 from .locators import OfferPageLocators
 from .models import JobOffer
 
+# Reads all fields in a single round trip. Missing elements resolve to null
+# immediately instead of waiting for a locator timeout.
+PRACUJ_FIELDS_JS = """
+([employer, position, salary, requirements]) => {
+    const text = selector => {
+        const element = document.querySelector(selector);
+        return element ? element.innerText : null;
+    };
+    return {
+        employer: text(employer),
+        position: text(position),
+        salary: Array.from(document.querySelectorAll(salary), element => element.innerText).join(""),
+        requirements: text(requirements),
+    };
+}
+"""
+
+JJIT_FIELDS_JS = """
+({employer, position, requirementsLabel, salaryLabels}) => {
+    const elementWithText = label => {
+        const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            const tag = node.parentElement && node.parentElement.tagName;
+            if (tag !== "SCRIPT" && tag !== "STYLE" && node.textContent.includes(label)) {
+                return node.parentElement;
+            }
+        }
+        return null;
+    };
+    const employerElement = document.querySelector(employer);
+    const positionElement = document.querySelector(position);
+    const requirementsElement = elementWithText(requirementsLabel);
+    const requirements = requirementsElement
+        ? Array.from(requirementsElement.parentElement.querySelectorAll("h4"), element => element.innerText)
+        : [];
+    const salaries = salaryLabels.map(label => {
+        const element = elementWithText(label);
+        return element && element.parentElement ? element.parentElement.innerText : "";
+    });
+    return {
+        employer: employerElement ? employerElement.innerText : null,
+        position: positionElement ? positionElement.innerText : null,
+        salary: salaries.join("\\n"),
+        requirements: requirements.join("\\n"),
+    };
+}
+"""
+
+
 class PracujOfferParser:
     "Extracts data from single offer page."
     def __init__(self, page: Page, locators: OfferPageLocators):
@@ -11,18 +59,21 @@ class PracujOfferParser:
         self.locators = locators
 
     async def parse(self) -> JobOffer:
+        await self.page.locator(self.locators.position).first.wait_for()
+        fields = await self.page.evaluate(PRACUJ_FIELDS_JS, [
+            self.locators.employer,
+            self.locators.position,
+            self.locators.salary,
+            self.locators.requirements,
+        ])
         return JobOffer(
-            employer=await self.page.locator(self.locators.employer).inner_text(),
-            position=await self.page.locator(self.locators.position).inner_text(),
-            salary=await self._get_salary(),
-            requirements=await self.page.locator(self.locators.requirements).inner_text(),
+            employer=fields["employer"],
+            position=fields["position"],
+            salary=fields["salary"],
+            requirements=fields["requirements"] or "",
             url=self.page.url
         )
 
-    async def _get_salary(self):
-        elements = self.page.locator(self.locators.salary)
-        texts = await elements.all_inner_texts()
-        return "".join(texts)
 
 class JustJoinItOfferParser:
     "Extracts data from single offer page."
@@ -32,31 +83,17 @@ class JustJoinItOfferParser:
         self.locators = locators
 
     async def parse(self) -> JobOffer:
+        await self.page.locator(self.locators.position).first.wait_for()
+        fields = await self.page.evaluate(JJIT_FIELDS_JS, {
+            "employer": self.locators.employer_css,
+            "position": self.locators.position,
+            "requirementsLabel": self.locators.requirements_label,
+            "salaryLabels": list(self.locators.salary_labels),
+        })
         return JobOffer(
-            employer=await self.page.locator(self.locators.employer).inner_text(),
-            position=await self.page.locator(self.locators.position).inner_text(),
-            salary=await self._get_salary(),
-            requirements=await self._get_requirements(),
+            employer=fields["employer"],
+            position=fields["position"],
+            salary=fields["salary"],
+            requirements=fields["requirements"],
             url=self.page.url
         )
-    async def _get_requirements(self):
-        requirements = await self.page.locator(self.locators.requirements).all_inner_texts()
-        return "\n".join(requirements)
-
-    async def _get_salary(self):
-        b2b = await self._parse_b2b_salary()
-        perm = await self._parse_perm_salary()
-        salary = b2b + '\n' + perm
-        return salary
-
-    async def _parse_b2b_salary(self):
-        try:
-            return await self.page.get_by_text("Net per month - B2B").locator("..").first.inner_text(timeout=2000)
-        except playwright.async_api.TimeoutError as e:
-            return ""
-
-    async def _parse_perm_salary(self):
-        try:
-            return await self.page.get_by_text("Gross per month").locator("..").first.inner_text(timeout=2000)
-        except playwright.async_api.TimeoutError as e:
-            return ""
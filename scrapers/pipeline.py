@@ -0,0 +1,224 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+
+from loguru import logger
+
+from scrapers.metrics import REGISTRY
+from scrapers.models import JobOffer
+from scrapers.offer_batch import OfferBatch
+
+
+class OfferSink(ABC):
+    """Destination of scraped offers, receives them in micro-batches."""
+    # Bookkeeping sinks also receive near-duplicates dropped by the pipeline, so they are not scraped again
+    keeps_duplicates = False
+
+    async def open(self) -> None:
+        """Called once before the first batch."""
+
+    @abstractmethod
+    async def write(self, site: str, offers: list[JobOffer]) -> None:
+        """
+        Persist a batch of offers scraped from a single site.
+
+        Args:
+            site (str): Site name of the scraper that produced the offers.
+            offers (list[JobOffer]): Offers to persist.
+        """
+        ...
+
+    async def close(self) -> None:
+        """Called once after the last batch."""
+
+
+class SheetSink(OfferSink):
+    """Appends offers to the worksheet of their site."""
+
+    def __init__(self, writers: dict) -> None:
+        """
+        Args:
+            writers (dict): SheetWriter per site name.
+        """
+        self.writers = writers
+
+    async def open(self) -> None:
+        # Rows spooled by a failed run are sent even if nothing new is scraped
+        for writer in self.writers.values():
+            await asyncio.to_thread(writer.write, [])
+
+    async def write(self, site: str, offers: list[JobOffer]) -> None:
+        await asyncio.to_thread(self.writers[site].write, OfferBatch.from_offers(offers).sheet_rows())
+
+
+class StoreSink(OfferSink):
+    """
+    Records offers in the local OfferStore, so they are skipped on the next run.
+
+    Near-duplicates are stored too, with the URL of their original.
+    """
+    keeps_duplicates = True
+
+    def __init__(self, store, near_duplicates=None) -> None:
+        """
+        Args:
+            store (OfferStore): Local offer store.
+            near_duplicates (NearDuplicateIndex | None): Index of the pipeline, knows the originals.
+        """
+        self.store = store
+        self.near_duplicates = near_duplicates
+
+    async def write(self, site: str, offers: list[JobOffer]) -> None:
+        self.store.add_offers(site, offers, self.near_duplicates.duplicate_of if self.near_duplicates else None)
+
+
+class IndexSink(OfferSink):
+    """Adds offers to the in-memory OfferIndex, so they are searchable while the run goes on."""
+
+    def __init__(self, index) -> None:
+        self.index = index
+
+    async def write(self, site: str, offers: list[JobOffer]) -> None:
+        self.index.add_offers(offers)
+
+
+class AckSink(OfferSink):
+    """
+    Acknowledges work queue items of written offers.
+
+    Must be the last sink, so an item is only acked after the other sinks
+    stored its offer.
+    """
+    keeps_duplicates = True
+
+    def __init__(self, queue) -> None:
+        self.queue = queue
+
+    async def write(self, site: str, offers: list[JobOffer]) -> None:
+        for offer in offers:
+            self.queue.ack(offer.url)
+
+
+class JsonlSink(OfferSink):
+    """Appends offers as JSON lines to a local file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    async def write(self, site: str, offers: list[JobOffer]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            OfferBatch.from_offers(offers).write_jsonl(f, site=site)
+
+
+class OfferPipeline:
+    """
+    Bounded queue between scrapers and sinks.
+
+    Scrapers `put` offers as soon as they are parsed. A consumer task flushes
+    them to every sink when a batch is full or `flush_interval` has passed.
+    When the sinks fall behind, `put` waits, which slows the scrapers down.
+    With a near-duplicate index, near-duplicates of earlier offers only reach
+    the sinks that keep duplicates.
+    """
+
+    def __init__(self, sinks: list[OfferSink], maxsize: int = 100, batch_size: int = 20,
+                 flush_interval: float = 5.0, near_duplicates=None) -> None:
+        """
+        Args:
+            sinks (list[OfferSink]): Destinations, written in the given order.
+            maxsize (int): Maximum number of offers waiting in the queue.
+            batch_size (int): Offers collected before a flush.
+            flush_interval (float): Maximum seconds an offer waits for a flush.
+            near_duplicates (NearDuplicateIndex | None): Index that marks near-duplicates.
+        """
+        self.sinks = sinks
+        self.near_duplicates = near_duplicates
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.written = 0
+        self._consumer: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        for sink in self.sinks:
+            await sink.open()
+        self._consumer = asyncio.create_task(self._consume())
+
+    async def put(self, site: str, offer: JobOffer) -> None:
+        """Queue an offer, waiting while the queue is full."""
+        await self.queue.put((site, offer))
+
+    async def close(self) -> None:
+        """Flush the remaining offers and close the sinks."""
+        await self.queue.put(None)
+        await self._consumer
+        for sink in self.sinks:
+            await sink.close()
+        logger.info(f"Pipeline closed, {self.written} offers written.")
+
+    async def _consume(self) -> None:
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                await self._flush(batch)
+                batch, deadline = [], None
+                continue
+            if item is None:
+                await self._flush(batch)
+                return
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch, deadline = [], None
+
+    async def _flush(self, batch: list[tuple[str, JobOffer]]) -> None:
+        by_site: dict[str, list[JobOffer]] = {}
+        for site, offer in batch:
+            by_site.setdefault(site, []).append(offer)
+        for site, offers in by_site.items():
+            unique = offers
+            if self.near_duplicates is not None:
+                with REGISTRY.timer("near_duplicates", site=site):
+                    unique = self.near_duplicates.split(site, offers)
+            if not await self._write_sinks(site, offers, unique):
+                continue
+            self.written += len(unique)
+            REGISTRY.inc("offers_written", len(unique), site=site)
+            logger.debug(f"Flushed {len(offers)} {site} offers ({len(offers) - len(unique)} near-duplicates).")
+
+    async def _write_sinks(self, site: str, offers: list[JobOffer], unique: list[JobOffer]) -> bool:
+        """
+        Write a site's batch to the sinks in order, stopping at the first failure.
+
+        Later sinks store, ack or journal the offers as done, so they must not
+        run for offers an earlier sink lost. Those offers are scraped again.
+
+        Returns:
+            bool: True if every sink wrote the batch.
+        """
+        for sink in self.sinks:
+            sink_offers = offers if sink.keeps_duplicates else unique
+            if not sink_offers:
+                continue
+            try:
+                with REGISTRY.timer("sink_write", sink=type(sink).__name__):
+                    await sink.write(site, sink_offers)
+            except Exception as e:
+                REGISTRY.inc("sink_errors", sink=type(sink).__name__)
+                logger.error(f"{type(sink).__name__} failed to write {len(sink_offers)} {site} offers: {e}. "
+                             f"Skipping the remaining sinks for this batch.")
+                return False
+        return True
+
+    async def __aenter__(self) -> "OfferPipeline":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
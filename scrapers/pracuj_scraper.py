@@ -1,13 +1,19 @@
 import asyncio
-from typing import Optional, Dict, Any, Coroutine
+from typing import Optional, Dict, Coroutine, Container, AsyncIterator
+from urllib.parse import urlsplit, parse_qsl, urlencode, urlunsplit
 
 from playwright.async_api import Locator
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from loguru import logger
 
 from .base_scraper import BaseScraper, handle_exceptions
+from .http_extractors import PracujHttpExtractor
+from .listing_capture import PRACUJ_LISTING_API
 from .locators import PRACUJ_OFFER, PRACUJ_NAV
+from .metrics import REGISTRY
+from .models import JobOffer
 from .parsers import PracujOfferParser
+from .resilience import CircuitOpenError, failure_reason
 
 
 class PracujScraper(BaseScraper):
@@ -17,10 +23,12 @@ class PracujScraper(BaseScraper):
     Handles navigation, job search, cookie acceptance, retrieving job listings,
     extracting job details, and pagination.
     """
+    site = "pracuj"
+    listing_api = PRACUJ_LISTING_API
 
-
-    def __init__(self, context, browser, semaphore_value=5):
-        super().__init__(context, browser, semaphore_value)
+    def __init__(self, context, browser, semaphore_value=5, config=None, http_client=None, scheduler=None,
+                 claimed=None):
+        super().__init__(context, browser, semaphore_value, config, http_client, scheduler, claimed)
         self.url = "https://pracuj.pl/"
         self.nav_locators = PRACUJ_NAV
 
@@ -28,31 +36,40 @@ class PracujScraper(BaseScraper):
     def get_parser(self, page):
         return PracujOfferParser(page, locators=PRACUJ_OFFER)
 
+    @classmethod
+    def get_http_extractor(cls, client):
+        return PracujHttpExtractor(client)
+
     async def search(self, keywords, location) -> None:
         """
-        Enter keywords and execute job search.
+        Enter keywords and location and execute job search.
 
         Args:
             keywords (str): The search keywords.
-            location (str): The location for job search (currently unused in method).
+            location (str): The location for job search.
         """
         keywords, location = self._validate_scraper_params(keywords, location)
         try:
             await self.type_text(self.nav_locators.search_input, keywords)
+            await self.type_text(self.nav_locators.location_input, location)
             await self.click_locator(self.nav_locators.search_button)
         except PlaywrightTimeoutError as e:
             raise PlaywrightTimeoutError(f"Search bar not found: {e}")
 
 
-    async def jobs_list(self) -> list[str]:
+    async def jobs_list(self, page=None) -> list[str]:
         """
         Retrieve a list of job offer elements from the current page.
 
+        Args:
+            page: Results page to read, the main scraper page by default.
+
         Returns:
-            Locator: Playwright locator containing all job offer elements.
+            list[str]: Offer URLs found on the results page.
         """
+        page = page or self.page
         try:
-            locator = self.page.locator(self.nav_locators.offers_list)
+            locator = page.locator(self.nav_locators.offers_list)
             await locator.first.wait_for(timeout=10000)
             all_offers = await locator.all()
         except PlaywrightTimeoutError:
@@ -96,45 +113,131 @@ class PracujScraper(BaseScraper):
 
 
     async def sort_offers_from_newest(self):
-        await self.page.wait_for_timeout(500)
+        await self.waits.for_locator(self.page.locator(self.nav_locators.offers_list), "search results",
+                                     timeout=10000)
+        previous_url = self.page.url
         dropdown = self.page.locator(self.nav_locators.sort_button)
         await dropdown.click()
         await self.page.locator(self.nav_locators.sort_option).click()
+        await self.waits.for_url_change(self.page, previous_url, "sorted results")
+
+    @staticmethod
+    def results_page_url(url: str, page_number: int) -> str:
+        """Return the search results URL pointing at the given page number."""
+        parts = urlsplit(url)
+        query = dict(parse_qsl(parts.query))
+        query["pn"] = str(page_number)
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    async def fetch_results_page(self, url: str) -> list[str] | None:
+        """
+        Open a results page in a separate tab and collect its offer links.
+
+        Links are read from the page's listing payload when it is captured,
+        from the rendered list otherwise.
 
-    async def extract_job_data(self, offer_links_from_sheet: list) -> list[Any]:
+        Args:
+            url (str): Results page URL.
+
+        Returns:
+            list[str] | None: Offer URLs, None if the page failed to load.
+        """
+        try:
+            async with self.scheduler.slot(url) as ticket:
+                page = await self.context.new_page()
+                page.set_default_navigation_timeout(self.config.page_load_timeout)
+                try:
+                    with REGISTRY.timer("listing_page", site=self.site):
+                        response = await page.goto(url)
+                        if self.listing_capture and response:
+                            urls = await self.listing_capture.read(response)
+                            if urls:
+                                REGISTRY.inc("listing_pages_from_payload", site=self.site)
+                                return urls
+                        return await self.jobs_list(page)
+                except Exception as e:
+                    ticket.failed(failure_reason(e))
+                    logger.error(f"Failed to load results page {url}: {e}")
+                    return None
+                finally:
+                    await page.close()
+        except CircuitOpenError as e:
+            logger.error(f"Skipped results page {url}: {e}")
+            return None
+
+    async def extract_job_data(self, known_offers: Container[str]) -> AsyncIterator[JobOffer]:
         """
         Iterate through all pages and offers to extract job data.
 
-        Stores extracted jobs in the `all_jobs` attribute.
+        Results pages are opened directly by page number, up to
+        `listing_lookahead` pages ahead, while offers of earlier pages are
+        still being scraped. Pages are still processed in order, so the
+        duplicate limit stops the walk at the same place. A resumed search
+        starts after the last page recorded in its checkpoint. Pages are only
+        recorded up to the first one that failed to load, so a resumed search
+        retries it.
+
+        Yields offers as soon as they are scraped.
         """
         consecutive_duplicates = 0
         DUPLICATE_LIMIT = 10
-        new_jobs = []
         max_page = await self.max_page()
-        for page_number in range(max_page):
-            offer_urls = await self.jobs_list()
-            unique_offers_urls = []
-            should_stop_scraping = False
-            for url in offer_urls:
-                if url in offer_links_from_sheet:
-                    consecutive_duplicates += 1
-                    logger.info(f"URL already exists: {url}")
-                    if consecutive_duplicates >= DUPLICATE_LIMIT:
-                        logger.info("Duplicate limit reached. Stopping.")
-                        should_stop_scraping = True
-                        break
+        start_page = self.checkpoint.progress.last_page + 1 if self.checkpoint else 1
+        first_page = await self.jobs_list() if start_page == 1 else None
+        search_url = self.page.url
+        listings: dict[int, asyncio.Task] = {}
+        offer_tasks: set[asyncio.Task] = set()
+        seen = set()
+        # The checkpoint keeps the highest page done, pages after a failed one can't be recorded
+        record_pages = self.checkpoint is not None
+        try:
+            for page_number in range(start_page, max_page + 1):
+                lookahead = max(1, self.config.listing_lookahead)
+                for ahead in range(page_number, min(page_number + lookahead, max_page) + 1):
+                    if ahead not in listings and not (ahead == 1 and first_page is not None):
+                        listings[ahead] = asyncio.create_task(
+                            self.fetch_results_page(self.results_page_url(search_url, ahead)))
+                if page_number == 1 and first_page is not None:
+                    offer_urls = first_page
                 else:
-                    unique_offers_urls.append(url)
-            tasks = [self.scrape_single_offer(url) for url in unique_offers_urls]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            for job_data in results:
+                    listing = listings.pop(page_number)
+                    # Hand out offers finished while waiting for the results page
+                    while not listing.done():
+                        done, _ = await asyncio.wait(offer_tasks | {listing}, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done - {listing}:
+                            offer_tasks.discard(task)
+                            if task.result():
+                                yield task.result()
+                    offer_urls = listing.result()
+                    if offer_urls is None:
+                        record_pages = False
+                        offer_urls = []
+
+                should_stop_scraping = False
+                for url in offer_urls:
+                    # Offers move to the next page when new ones are published during the walk
+                    if url in seen:
+                        continue
+                    seen.add(url)
+                    if url in known_offers:
+                        REGISTRY.inc("offers_known", site=self.site)
+                        consecutive_duplicates += 1
+                        logger.info(f"URL already exists: {url}")
+                        if consecutive_duplicates >= DUPLICATE_LIMIT:
+                            logger.info("Duplicate limit reached. Stopping.")
+                            should_stop_scraping = True
+                            break
+                    elif self.claim(url):
+                        offer_tasks.add(asyncio.create_task(self.scrape_single_offer(url)))
+                if should_stop_scraping:
+                    break
+                if record_pages:
+                    self.checkpoint.page_done(page_number)
+
+            for task in asyncio.as_completed(offer_tasks):
+                job_data = await task
                 if job_data:
-                    new_jobs.append(job_data)
-            if should_stop_scraping:
-                break
-
-            if page_number + 1 < max_page:
-                await self.next_page()
-                await self.page.wait_for_timeout(500)
-        return new_jobs
+                    yield job_data
+        finally:
+            for task in [*listings.values(), *offer_tasks]:
+                task.cancel()
@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`, so short
+    bursts are allowed while the long-term rate stays under the limit.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float): Maximum number of stored tokens (burst size).
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Take tokens from the bucket, going into debt if there are not enough.
+
+        Returns:
+            float: Seconds the caller has to wait before using the tokens.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= tokens
+        return max(0.0, -self.tokens / self.rate)
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Block until the tokens are available."""
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: float = 1) -> None:
+        """Wait until the tokens are available without blocking the event loop."""
+        delay = self.reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
@@ -0,0 +1,168 @@
+import random
+import time
+from collections import deque
+
+from loguru import logger
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from scrapers.metrics import percentile
+
+# Markers of bot challenges (pracuj.pl uses Cloudflare, captcha widgets are embedded as iframes)
+CAPTCHA_JS = """
+() => {
+    const text = (document.title + " " + location.href).toLowerCase();
+    return text.includes("captcha") || text.includes("just a moment") ||
+        document.querySelector("iframe[src*='captcha'], #challenge-form, #cf-challenge-running, .g-recaptcha") !== null;
+}
+"""
+
+TRANSIENT_NETWORK_ERRORS = ("net::ERR_", "NS_ERROR_", "Target closed", "Navigation failed because page crashed")
+
+
+class CaptchaDetected(Exception):
+    """The site answered with a bot challenge instead of the offer."""
+
+
+class CircuitOpenError(Exception):
+    """Requests to the domain are paused after a burst of failures."""
+
+
+async def detect_captcha(page: Page) -> bool:
+    """Return True if the page shows a bot challenge."""
+    try:
+        return await page.evaluate(CAPTCHA_JS)
+    except PlaywrightError:
+        return False
+
+
+def failure_reason(error: BaseException) -> str:
+    """Classify an exception raised while scraping a page, used in logs and metrics."""
+    if isinstance(error, CaptchaDetected):
+        return "captcha"
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(error, PlaywrightTimeoutError):
+        return "timeout"
+    if isinstance(error, PlaywrightError) and any(marker in str(error) for marker in TRANSIENT_NETWORK_ERRORS):
+        return "network"
+    return "error"
+
+
+def is_transient(reason: str) -> bool:
+    """Timeouts and network errors are worth retrying, challenges and parser errors are not."""
+    return reason in ("timeout", "network")
+
+
+class AdaptiveTimeout:
+    """
+    Navigation timeout derived from recent page load times.
+
+    The timeout is a multiple of the p95 of the last `window` successful loads,
+    clamped between `min_ms` and `max_ms`. Until enough loads were observed the
+    initial (configured) timeout is used.
+    """
+
+    def __init__(self, initial_ms: int, min_ms: int = 3000, max_ms: int | None = None, multiplier: float = 3.0,
+                 window: int = 50, min_samples: int = 10) -> None:
+        self.initial_ms = initial_ms
+        self.min_ms = min_ms
+        self.max_ms = max_ms or initial_ms
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self.samples: deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def current(self) -> int:
+        """Return the timeout in milliseconds."""
+        if len(self.samples) < self.min_samples:
+            return self.initial_ms
+        timeout = percentile(list(self.samples), 0.95) * 1000 * self.multiplier
+        return int(min(self.max_ms, max(self.min_ms, timeout)))
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a domain after a burst of failures.
+
+    The circuit opens after `threshold` failures within `window` seconds, a
+    captcha opens it right away. After `cooldown` seconds one probe request is
+    let through (half-open). Its success closes the circuit, its failure opens
+    it for another cooldown. A probe that never reports back is replaced by a
+    new one after another cooldown.
+    """
+
+    def __init__(self, name: str, threshold: int = 5, window: float = 30.0, cooldown: float = 60.0) -> None:
+        self.name = name
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self.failures: deque[float] = deque()
+        self.opened_at: float | None = None
+        self.probe_started: float | None = None
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    @property
+    def probing(self) -> bool:
+        return self.probe_started is not None and time.monotonic() - self.probe_started < self.cooldown
+
+    @property
+    def paused(self) -> bool:
+        """True while requests are refused, unlike `allow` this doesn't start a probe."""
+        state = self.state
+        return state == "open" or (state == "half_open" and self.probing)
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.probing:
+            self.probe_started = time.monotonic()
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info(f"Circuit of {self.name} closed.")
+        self.opened_at = None
+        self.probe_started = None
+        self.failures.clear()
+
+    def record_failure(self, reason: str) -> None:
+        now = time.monotonic()
+        self.failures.append(now)
+        while self.failures and now - self.failures[0] > self.window:
+            self.failures.popleft()
+        if self.probing or reason == "captcha" or len(self.failures) >= self.threshold:
+            self._open(now, reason)
+
+    def _open(self, now: float, reason: str) -> None:
+        if self.opened_at is None or self.probing:
+            self.trips += 1
+            logger.warning(f"Circuit of {self.name} opened ({reason}, {len(self.failures)} recent failures), "
+                           f"pausing for {self.cooldown:.0f}s.")
+        self.opened_at = now
+        self.probe_started = None
+
+
+class RetryPolicy:
+    """Number of attempts and jittered exponential backoff between them."""
+
+    def __init__(self, attempts: int = 3, base_delay: float = 1.0, max_delay: float = 15.0) -> None:
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before retrying after the given (1-based) attempt failed."""
+        return min(self.max_delay, self.base_delay * 2 ** (attempt - 1)) + random.uniform(0, self.base_delay)
@@ -0,0 +1,162 @@
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+
+import httpx
+from loguru import logger
+
+from scrapers.http_extractors import HttpOfferExtractor
+from scrapers.models import JobOffer
+from scrapers.offer_store import OfferStore, offer_fingerprint
+from scrapers.resilience import CircuitOpenError
+from scrapers.scheduler import CrawlScheduler
+
+CLOSED_STATUS_CODES = {404, 410}
+
+UPDATED = "updated"
+CLOSED = "closed"
+UNCHANGED = "unchanged"
+
+
+@dataclass
+class RevisitEvent:
+    """Outcome of re-checking a single stored offer."""
+    kind: str  # UPDATED, CLOSED or UNCHANGED
+    site: str
+    url: str
+    offer: Optional[JobOffer] = None  # New content of an updated offer
+
+
+@dataclass
+class RevisitStats:
+    """Counters of a single revisit run."""
+    checked: int = 0
+    not_modified: int = 0
+    events: dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+
+
+class OfferRevisitor:
+    """
+    Re-checks recently scraped offers for salary changes and expired postings.
+
+    Every check is a conditional GET using the ETag and Last-Modified values of
+    the previous check, so an unchanged offer usually costs a 304 without a body.
+    Full responses are parsed by the site's HTTP extractor and compared with the
+    fingerprint of the previous revisit. Only changed offers are written back to
+    the store.
+
+    The first revisit of an offer only records that fingerprint. The stored offer
+    may come from a listing payload or the browser parser, which format salary
+    and requirements differently than the HTTP extractor.
+    """
+
+    def __init__(self, store: OfferStore, extractor: HttpOfferExtractor, scheduler: CrawlScheduler,
+                 max_age: float, interval: float, limit: int = 200) -> None:
+        """
+        Args:
+            store (OfferStore): Store with offers and their fingerprints.
+            extractor (HttpOfferExtractor): Fetches and parses offers of one site.
+            scheduler (CrawlScheduler): Shared politeness budget.
+            max_age (float): Only offers added within this many seconds are checked.
+            interval (float): Minimum seconds between two checks of the same offer.
+            limit (int): Maximum number of offers checked per run.
+        """
+        self.store = store
+        self.extractor = extractor
+        self.scheduler = scheduler
+        self.max_age = max_age
+        self.interval = interval
+        self.limit = limit
+        self.stats = RevisitStats()
+
+    async def revisit(self, site: str) -> AsyncIterator[RevisitEvent]:
+        """
+        Check due offers of the site concurrently and yield events as they complete.
+
+        Args:
+            site (str): Site name the offers are stored under.
+        """
+        self.stats = RevisitStats()
+        rows = self.store.due_for_revisit(site, self.max_age, self.interval, self.limit)
+        logger.info(f"Revisiting {len(rows)} {site} offers.")
+        tasks = [asyncio.create_task(self.check(site, row)) for row in rows]
+        try:
+            for task in asyncio.as_completed(tasks):
+                event = await task
+                if event:
+                    self.stats.events[event.kind] = self.stats.events.get(event.kind, 0) + 1
+                    yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+            logger.info(f"Revisit of {site} finished: {self.stats}")
+
+    async def check(self, site: str, row) -> RevisitEvent | None:
+        """
+        Re-check a single stored offer.
+
+        Returns:
+            RevisitEvent | None: The outcome, None if the offer could not be checked.
+        """
+        url = row["url"]
+        headers = {}
+        if row["etag"]:
+            headers["If-None-Match"] = row["etag"]
+        if row["last_modified"]:
+            headers["If-Modified-Since"] = row["last_modified"]
+        try:
+            async with self.scheduler.slot(url, uses_page=False) as ticket:
+                try:
+                    response = await self.extractor.client.get(self.extractor.request_url(url), headers=headers)
+                except httpx.HTTPError as e:
+                    ticket.failed("timeout" if isinstance(e, httpx.TimeoutException) else "network")
+                    self.stats.errors += 1
+                    logger.debug(f"Revisit of {url} failed: {e}")
+                    return None
+        except CircuitOpenError as e:
+            self.stats.errors += 1
+            logger.debug(f"Revisit of {url} skipped: {e}")
+            return None
+        self.stats.checked += 1
+
+        if response.status_code == 304:
+            self.stats.not_modified += 1
+            self.store.record_check(url)
+            return RevisitEvent(UNCHANGED, site, url)
+        if response.status_code in CLOSED_STATUS_CODES:
+            self.store.record_check(url, status=CLOSED)
+            return RevisitEvent(CLOSED, site, url)
+        if response.is_error:
+            self.stats.errors += 1
+            logger.debug(f"Revisit of {url} returned {response.status_code}")
+            return None
+
+        validators = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+        offer = self.extractor.try_parse(url, response.text)
+        if offer is None:
+            # Page is there but without offer data, check again next interval
+            self.store.record_check(url, **validators)
+            return None
+
+        fingerprint = offer_fingerprint(offer)
+        baseline = row["revisit_fingerprint"]
+        if baseline is None or fingerprint == baseline:
+            self.store.record_check(url, fingerprint=fingerprint, **validators)
+            return RevisitEvent(UNCHANGED, site, url)
+        self.store.add_offers(site, [offer])
+        self.store.record_check(url, fingerprint=fingerprint, **validators)
+        return RevisitEvent(UPDATED, site, url, offer)
+
+
+def write_events(path: str, events: list[RevisitEvent]) -> None:
+    """Append update and close events as JSON lines for downstream consumers."""
+    with open(path, "a", encoding="utf-8") as f:
+        for event in events:
+            if event.kind == UNCHANGED:
+                continue
+            record = {"event": event.kind, "site": event.site, "url": event.url}
+            if event.offer:
+                record["offer"] = event.offer.model_dump()
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
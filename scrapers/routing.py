@@ -0,0 +1,128 @@
+from dataclasses import dataclass, field
+
+from loguru import logger
+from playwright.async_api import Page, Route
+
+# Rough transfer sizes (bytes) of resources we abort. The real size of an
+# aborted request is never known, so saved bandwidth is an estimate.
+ESTIMATED_RESOURCE_SIZE = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 30_000,
+    "stylesheet": 20_000,
+    "script": 50_000,
+}
+DEFAULT_RESOURCE_SIZE = 5_000
+
+TRACKING_URL_PATTERNS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "adservice.google.",
+    "facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+)
+
+
+@dataclass(frozen=True)
+class RoutingRules:
+    """
+    Allow/deny lists for requests made by offer pages.
+
+    A request is aborted when its resource type or URL matches the deny lists,
+    unless its URL matches one of the allowed patterns. URL patterns are plain
+    substrings of the request URL.
+    """
+    blocked_resource_types: frozenset[str] = frozenset({"image", "media", "font"})
+    blocked_url_patterns: tuple[str, ...] = TRACKING_URL_PATTERNS
+    allowed_url_patterns: tuple[str, ...] = ()
+
+
+@dataclass
+class BlockStats:
+    """Requests aborted on a single page."""
+    requests: int = 0
+    estimated_bytes: int = 0
+    by_type: dict[str, int] = field(default_factory=dict)
+
+    def add(self, resource_type: str) -> None:
+        self.requests += 1
+        self.estimated_bytes += ESTIMATED_RESOURCE_SIZE.get(resource_type, DEFAULT_RESOURCE_SIZE)
+        self.by_type[resource_type] = self.by_type.get(resource_type, 0) + 1
+
+    def reset(self) -> None:
+        self.requests = 0
+        self.estimated_bytes = 0
+        self.by_type = {}
+
+    def merge(self, other: "BlockStats") -> None:
+        self.requests += other.requests
+        self.estimated_bytes += other.estimated_bytes
+        for resource_type, count in other.by_type.items():
+            self.by_type[resource_type] = self.by_type.get(resource_type, 0) + count
+
+
+class RequestBlocker:
+    """Aborts requests that are not needed to read offer data from a page."""
+
+    def __init__(self, rules: RoutingRules) -> None:
+        self.rules = rules
+        self.totals = BlockStats()
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """
+        Decide whether a request should be aborted.
+
+        Args:
+            resource_type (str): Playwright resource type, e.g. "image" or "script".
+            url (str): Request URL.
+
+        Returns:
+            bool: True if the request should be aborted.
+        """
+        if any(pattern in url for pattern in self.rules.allowed_url_patterns):
+            return False
+        if resource_type in self.rules.blocked_resource_types:
+            return True
+        return any(pattern in url for pattern in self.rules.blocked_url_patterns)
+
+    async def attach(self, page: Page) -> BlockStats:
+        """
+        Install the routing handler on a page.
+
+        Args:
+            page (Page): Page to intercept requests on.
+
+        Returns:
+            BlockStats: Counters updated while the page is loading.
+        """
+        stats = BlockStats()
+
+        async def handle(route: Route) -> None:
+            request = route.request
+            if self.should_block(request.resource_type, request.url):
+                stats.add(request.resource_type)
+                self.totals.add(request.resource_type)
+                await route.abort()
+            else:
+                # Let routes of the context (e.g. the benchmark fixture server) see the request
+                await route.fallback()
+
+        await page.route("**/*", handle)
+        return stats
+
+    @staticmethod
+    def log_stats(url: str, stats: BlockStats) -> None:
+        logger.debug(f"Blocked {stats.requests} requests (~{stats.estimated_bytes // 1024} KiB) "
+                     f"on {url}: {stats.by_type}")
+
+
+PRACUJ_ROUTING = RoutingRules(
+    blocked_url_patterns=TRACKING_URL_PATTERNS + ("gemius.pl", "adocean.pl"),
+)
+
+JJIT_ROUTING = RoutingRules(
+    blocked_url_patterns=TRACKING_URL_PATTERNS + ("intercom.io", "sentry.io"),
+)
@@ -0,0 +1,200 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from scrapers.metrics import REGISTRY
+from scrapers.rate_limit import TokenBucket
+from scrapers.resilience import AdaptiveTimeout, CircuitBreaker, CircuitOpenError, failure_reason
+
+
+@dataclass(frozen=True)
+class DomainPolicy:
+    """
+    Politeness budget of a single site.
+
+    Concurrency starts at `initial_concurrency` and adapts between the minimum
+    and maximum: it grows by one slot per window of successful requests and is
+    halved when a request fails or is slower than `target_latency` seconds.
+    After `failure_threshold` failures within `failure_window` seconds (or one
+    captcha) the domain is paused for `breaker_cooldown` seconds.
+    """
+    max_concurrency: int = 5
+    min_concurrency: int = 1
+    initial_concurrency: int = 3
+    requests_per_second: float = 2.0
+    target_latency: float = 10.0
+    failure_threshold: int = 5
+    failure_window: float = 30.0
+    breaker_cooldown: float = 60.0
+
+
+DEFAULT_POLICIES = {
+    "pracuj.pl": DomainPolicy(max_concurrency=5, requests_per_second=1.5),
+    "justjoin.it": DomainPolicy(max_concurrency=8, requests_per_second=3.0),
+}
+
+
+class Ticket:
+    """Handle of a scheduled request, used to report its outcome."""
+
+    def __init__(self) -> None:
+        self.ok = True
+        self.reason = None
+
+    def failed(self, reason: str = "error") -> None:
+        """Mark the request as failed, `reason` is e.g. "timeout", "network" or "captcha"."""
+        self.ok = False
+        self.reason = reason
+
+
+class DomainState:
+    """Adaptive (AIMD) concurrency limit, rate limiter, page timeout and circuit breaker of a single domain."""
+
+    def __init__(self, name: str, policy: DomainPolicy, page_timeout: int = 30000) -> None:
+        self.name = name
+        self.policy = policy
+        self.timeout = AdaptiveTimeout(page_timeout)
+        self.breaker = CircuitBreaker(name, policy.failure_threshold, policy.failure_window, policy.breaker_cooldown)
+        self.limit = float(min(policy.initial_concurrency, policy.max_concurrency))
+        self.in_flight = 0
+        self.bucket = TokenBucket(rate=policy.requests_per_second, capacity=max(1.0, policy.requests_per_second))
+        self.condition = asyncio.Condition()
+        self.last_decrease = 0.0
+        self.completed = 0
+        self.failed = 0
+
+    async def acquire(self) -> None:
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency: float, ok: bool, reason: str | None = None) -> None:
+        async with self.condition:
+            self.in_flight -= 1
+            self.completed += 1
+            if ok:
+                self.breaker.record_success()
+            else:
+                self.failed += 1
+                self.breaker.record_failure(reason or "error")
+            if ok and latency <= self.policy.target_latency:
+                self.limit = min(self.policy.max_concurrency, self.limit + 1 / self.limit)
+            else:
+                self._decrease()
+            self.condition.notify_all()
+
+    async def cancel(self) -> None:
+        """Give back a slot that wasn't used for a request, nothing is recorded."""
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def _decrease(self) -> None:
+        # A burst of failures from one congested window halves the limit only once
+        now = time.monotonic()
+        if now - self.last_decrease < self.policy.target_latency:
+            return
+        self.last_decrease = now
+        previous = self.limit
+        self.limit = max(self.policy.min_concurrency, self.limit / 2)
+        logger.warning(f"Slowing down {self.name}: concurrency {previous:.1f} -> {self.limit:.1f}")
+
+
+class CrawlScheduler:
+    """
+    Central budget for every request made by the scrapers.
+
+    Owns the global number of open offer pages and a DomainState per site.
+    Scrapers wrap each request in `slot(url)`.
+    """
+
+    def __init__(self, max_open_pages: int = 5, policies: dict[str, DomainPolicy] | None = None,
+                 default_policy: DomainPolicy = DomainPolicy(), page_timeout: int = 30000) -> None:
+        """
+        Args:
+            max_open_pages (int): Offer pages open at the same time, across all sites.
+            policies (dict[str, DomainPolicy] | None): Policy per domain suffix.
+            default_policy (DomainPolicy): Policy of domains without an entry.
+            page_timeout (int): Initial and maximum navigation timeout of offer pages in ms.
+        """
+        self.max_open_pages = max_open_pages
+        self.page_timeout = page_timeout
+        self.policies = DEFAULT_POLICIES if policies is None else policies
+        self.default_policy = default_policy
+        self.pages = asyncio.Semaphore(max_open_pages)
+        self.domains: dict[str, DomainState] = {}
+
+    @classmethod
+    def from_config(cls, config) -> "CrawlScheduler":
+        return cls(config.max_open_pages, config.domain_policies, page_timeout=config.page_load_timeout)
+
+    def domain(self, url: str) -> DomainState:
+        """Return the state of the domain (policy key) the URL belongs to."""
+        host = urlsplit(url).netloc.lower()
+        name = next((suffix for suffix in self.policies if host == suffix or host.endswith("." + suffix)), host)
+        if name not in self.domains:
+            self.domains[name] = DomainState(name, self.policies.get(name, self.default_policy), self.page_timeout)
+        return self.domains[name]
+
+    @asynccontextmanager
+    async def slot(self, url: str, uses_page: bool = True) -> AsyncIterator[Ticket]:
+        """
+        Wait for a free slot of the URL's domain (and a page, if needed).
+
+        Args:
+            url (str): URL that is going to be requested.
+            uses_page (bool): Count the request against the open page budget.
+
+        Yields:
+            Ticket: Call `ticket.failed()` when the request did not succeed.
+
+        Raises:
+            CircuitOpenError: The domain's circuit breaker is open, checked again
+                once the slots are free, as the breaker may open while waiting.
+        """
+        state = self.domain(url)
+        if state.breaker.paused:
+            raise CircuitOpenError(f"{state.name} is paused after repeated failures")
+        ticket = Ticket()
+        admitted = False
+        await state.acquire()
+        start = time.monotonic()
+        try:
+            if uses_page:
+                await self.pages.acquire()
+                REGISTRY.add_gauge("open_pages", 1)
+            try:
+                await state.bucket.acquire_async()
+                if not state.breaker.allow():
+                    raise CircuitOpenError(f"{state.name} was paused while the request waited for a slot")
+                admitted = True
+                start = time.monotonic()
+                try:
+                    yield ticket
+                except Exception as e:
+                    if ticket.ok:
+                        ticket.failed(failure_reason(e))
+                    raise
+            finally:
+                if uses_page:
+                    self.pages.release()
+                    REGISTRY.add_gauge("open_pages", -1)
+        finally:
+            if admitted:
+                await state.release(time.monotonic() - start, ticket.ok, ticket.reason)
+            else:
+                await state.cancel()
+
+    def snapshot(self) -> dict[str, dict]:
+        """Current limits and counters per domain."""
+        return {
+            name: {"limit": round(state.limit, 2), "in_flight": state.in_flight,
+                   "completed": state.completed, "failed": state.failed, "circuit": state.breaker.state,
+                   "page_timeout_ms": state.timeout.current()}
+            for name, state in self.domains.items()
+        }
@@ -0,0 +1,193 @@
+"""
+Warm browser sessions kept between runs.
+
+Each site has a few session slots, each a Playwright storage state file
+(cookies and local storage) with bookkeeping in `<site>.json`:
+
+    sessions/
+        pracuj.json      {"0": {"saved_at": ..., "challenged_at": ..., "challenges": ..., "uses": ...}}
+        pracuj-0.json    storage state written by `context.storage_state`
+
+A context starts from the newest usable slot and its state is written back
+to the same slot when the context is closed, unless the site challenged it.
+A challenged slot rests for `challenge_cooldown` seconds, the next context
+starts from another slot, or from scratch.
+"""
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from loguru import logger
+from playwright.async_api import BrowserContext
+from playwright.async_api import Error as PlaywrightError
+
+from scrapers.metrics import REGISTRY
+
+
+@dataclass
+class SessionSlot:
+    """Bookkeeping of one saved session of a site."""
+    saved_at: float = 0.0
+    challenged_at: float = 0.0
+    challenges: int = 0
+    uses: int = 0
+
+
+@dataclass
+class ActiveSession:
+    """Slot a site context was started from and will be saved to."""
+    slot: int
+    path: str | None  # Storage state the context was created with, None for a fresh context
+    known_good: bool = False
+    challenged: bool = False
+
+
+class SessionStateManager:
+    """
+    Rotates and refreshes per-site Playwright storage states.
+
+    A state is usable when its file parses, it was saved within `max_age`
+    seconds and its slot was not challenged within `challenge_cooldown`.
+    It is known good when, in addition, none of its cookies has expired.
+    Scrapers skip the cookie consent banner of a known good state.
+    """
+
+    def __init__(self, directory: str = "sessions", slots: int = 3, max_age: float = 7 * 86400,
+                 challenge_cooldown: float = 6 * 3600) -> None:
+        """
+        Args:
+            directory (str): Directory of the state files, created on the first save.
+            slots (int): Sessions kept per site.
+            max_age (float): Seconds after which a saved state is not used anymore.
+            challenge_cooldown (float): Seconds a challenged state is not used.
+        """
+        self.directory = Path(directory)
+        self.slots = slots
+        self.max_age = max_age
+        self.challenge_cooldown = challenge_cooldown
+        self.active: dict[str, ActiveSession] = {}
+
+    def state_path(self, site: str, slot: int) -> Path:
+        return self.directory / f"{site}-{slot}.json"
+
+    def load_slots(self, site: str) -> dict[int, SessionSlot]:
+        path = self.directory / f"{site}.json"
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return {int(slot): SessionSlot(**values) for slot, values in data.items()}
+        except FileNotFoundError:
+            return {}
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable session index '{path}': {e}")
+            return {}
+
+    def _write_slots(self, site: str, slots: dict[int, SessionSlot]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{site}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({str(slot): asdict(values) for slot, values in sorted(slots.items())}),
+                       encoding="utf-8")
+        os.replace(tmp, path)
+
+    def validate(self, site: str, slot: int, info: SessionSlot, now: float | None = None) -> tuple[bool, bool]:
+        """
+        Check a saved state.
+
+        Returns:
+            tuple[bool, bool]: Whether the state is usable and whether it is known good.
+        """
+        now = time.time() if now is None else now
+        if not info.saved_at or now - info.saved_at > self.max_age:
+            return False, False
+        if info.challenged_at and now - info.challenged_at < self.challenge_cooldown:
+            return False, False
+        try:
+            state = json.loads(self.state_path(site, slot).read_text(encoding="utf-8"))
+            cookies = state["cookies"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return False, False
+        # Session cookies have expires -1
+        expired = any(0 < cookie.get("expires", -1) < now for cookie in cookies)
+        return True, bool(cookies) and not expired
+
+    def choose(self, site: str) -> str | None:
+        """
+        Pick the state a new context of the site starts from.
+
+        Returns:
+            str | None: Path of the newest usable state, None to start a fresh
+            session. The fresh session is saved to an empty or the oldest slot.
+        """
+        slots = self.load_slots(site)
+        now = time.time()
+        for slot, info in sorted(slots.items(), key=lambda item: item[1].saved_at, reverse=True):
+            usable, known_good = self.validate(site, slot, info, now)
+            if usable:
+                self.active[site] = ActiveSession(slot, str(self.state_path(site, slot)), known_good)
+                info.uses += 1
+                self._write_slots(site, slots)
+                REGISTRY.inc("session_states", site=site, state="known_good" if known_good else "stale")
+                logger.info(f"Starting {site} from session slot {slot} (known good: {known_good})")
+                return self.active[site].path
+        empty = [slot for slot in range(self.slots) if slot not in slots]
+        target = empty[0] if empty else min(slots, key=lambda slot: slots[slot].saved_at)
+        self.active[site] = ActiveSession(target, None)
+        REGISTRY.inc("session_states", site=site, state="fresh")
+        logger.info(f"No usable {site} session, starting fresh (saved to slot {target})")
+        return None
+
+    def known_good(self, site: str) -> bool:
+        """True if the site's context started from a valid state, so consent banners were already handled."""
+        active = self.active.get(site)
+        return bool(active and active.known_good and not active.challenged)
+
+    def is_challenged(self, site: str) -> bool:
+        active = self.active.get(site)
+        return bool(active and active.challenged)
+
+    def challenged(self, site: str) -> None:
+        """Record a bot challenge, the current state is rested and not saved."""
+        active = self.active.get(site)
+        if active is None or active.challenged:
+            return
+        active.challenged = True
+        REGISTRY.inc("session_challenges", site=site)
+        slots = self.load_slots(site)
+        info = slots.setdefault(active.slot, SessionSlot())
+        info.challenged_at = time.time()
+        info.challenges += 1
+        self._write_slots(site, slots)
+        logger.warning(f"{site} session slot {active.slot} was challenged, rotating on the next context.")
+
+    async def save(self, site: str, context: BrowserContext) -> bool:
+        """
+        Write the context's storage state to its slot, unless it was challenged.
+
+        Returns:
+            bool: True if the state was saved.
+        """
+        active = self.active.get(site)
+        if active is None or active.challenged:
+            return False
+        path = self.state_path(site, active.slot)
+        tmp = path.with_suffix(".tmp")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        try:
+            await context.storage_state(path=str(tmp))
+        except PlaywrightError as e:
+            logger.warning(f"Could not save {site} session: {e}")
+            return False
+        os.replace(tmp, path)
+        slots = self.load_slots(site)
+        info = slots.setdefault(active.slot, SessionSlot())
+        info.saved_at = time.time()
+        info.challenged_at = 0.0
+        self._write_slots(site, slots)
+        logger.info(f"Saved {site} session to slot {active.slot}")
+        return True
+
+    def forget(self, site: str) -> None:
+        """Drop the active session of a closed context, the next context chooses again."""
+        self.active.pop(site, None)
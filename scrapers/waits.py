@@ -0,0 +1,94 @@
+import time
+from typing import Awaitable, Callable, Literal
+
+from loguru import logger
+from playwright.async_api import Locator, Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+INPUT_FOCUSED_JS = """
+() => {
+    const element = document.activeElement;
+    return element !== null && (element.tagName === "INPUT" || element.isContentEditable);
+}
+"""
+
+
+class Waits:
+    """
+    Waits on concrete page conditions instead of fixed sleeps.
+
+    Every wait logs how long it actually took and returns False on timeout
+    instead of raising, so a slow page degrades like the old sleeps did.
+    Durations are kept in `timings` by wait name.
+    """
+
+    def __init__(self, timeout: int = 5000) -> None:
+        """
+        Args:
+            timeout (int): Default wait timeout in milliseconds.
+        """
+        self.timeout = timeout
+        self.timings: dict[str, list[float]] = {}
+
+    async def _run(self, name: str, wait: Awaitable, timeout: int) -> bool:
+        start = time.perf_counter()
+        try:
+            await wait
+            met = True
+        except PlaywrightTimeoutError:
+            met = False
+        elapsed = time.perf_counter() - start
+        self.timings.setdefault(name, []).append(elapsed)
+        if met:
+            logger.debug(f"Waited {elapsed * 1000:.0f}ms for {name}")
+        else:
+            logger.warning(f"Gave up waiting for {name} after {timeout}ms")
+        return met
+
+    async def for_locator(self, locator: Locator, name: str, state: str = "visible",
+                          timeout: int | None = None) -> bool:
+        """Wait until the first element of the locator reaches the given state."""
+        timeout = timeout or self.timeout
+        return await self._run(name, locator.first.wait_for(state=state, timeout=timeout), timeout)
+
+    async def for_url_change(self, page: Page, previous_url: str, name: str, timeout: int | None = None) -> bool:
+        """Wait until the page navigates away from `previous_url` (client side routing included)."""
+        timeout = timeout or self.timeout
+        return await self._run(name, page.wait_for_url(lambda url: url != previous_url, timeout=timeout,
+                                                       wait_until="commit"), timeout)
+
+    async def for_condition(self, page: Page, expression: str, name: str, polling: Literal["raf"] | float = 100,
+                            timeout: int | None = None) -> bool:
+        """
+        Wait until a JavaScript function evaluated in the page returns a truthy value.
+
+        `polling` is "raf" (every animation frame) or an interval in milliseconds,
+        Playwright rejects any other value.
+        """
+        timeout = timeout or self.timeout
+        wait = page.wait_for_function(expression, polling=polling, timeout=timeout)
+        return await self._run(name, wait, timeout)
+
+    async def for_input_focus(self, page: Page, name: str, timeout: int | None = None) -> bool:
+        """Wait until a text input has keyboard focus."""
+        return await self.for_condition(page, INPUT_FOCUSED_JS, name, polling="raf", timeout=timeout)
+
+    async def for_response(self, page: Page, predicate: Callable, action: Callable[[], Awaitable], name: str,
+                           timeout: int | None = None) -> bool:
+        """
+        Run an action and wait for the network response it triggers.
+
+        Args:
+            page (Page): Page making the request.
+            predicate (Callable): Receives a Response, returns True for the awaited one.
+            action (Callable): Coroutine function triggering the request, e.g. a click.
+            name (str): Name used in logs and timings.
+        """
+        timeout = timeout or self.timeout
+
+        async def wait():
+            async with page.expect_response(predicate, timeout=timeout) as response_info:
+                await action()
+            await response_info.value
+
+        return await self._run(name, wait(), timeout)
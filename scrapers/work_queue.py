@@ -0,0 +1,167 @@
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Iterable
+
+from loguru import logger
+
+from scrapers.offer_store import offer_key
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class WorkItem:
+    """An offer URL leased by a worker."""
+    key: str
+    site: str
+    url: str
+    attempts: int
+
+
+class WorkQueue:
+    """
+    Durable queue of offer URLs shared by worker processes through a SQLite file.
+
+    Workers lease items for a limited time and either ack them once the offer is
+    stored or nack them to retry later. Leases of a crashed worker expire and
+    their items go back to the queue, so no offer is lost. Items are keyed like
+    the offer store, so an offer is queued only once.
+    """
+
+    def __init__(self, path: str = ":memory:", shards: int = 1) -> None:
+        """
+        Args:
+            path (str): SQLite database file, in-memory database by default.
+            shards (int): Number of shards new items are spread over.
+        """
+        self.path = path
+        self.shards = max(1, shards)
+        # Autocommit mode, transactions are opened explicitly with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS work_items (key TEXT PRIMARY KEY, site TEXT NOT NULL, url TEXT NOT NULL, "
+            "shard INTEGER NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+            "lease_owner TEXT, lease_expires REAL, error TEXT, updated_at REAL NOT NULL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS work_items_status ON work_items (status, shard)")
+
+    def shard_of(self, key: str) -> int:
+        return zlib.crc32(key.encode("utf-8")) % self.shards
+
+    def enqueue(self, site: str, urls: Iterable[str]) -> int:
+        """
+        Queue offer URLs, skipping ones queued before.
+
+        Returns:
+            int: Number of newly queued items.
+        """
+        now = time.time()
+        rows = []
+        for url in urls:
+            key = offer_key(url)
+            rows.append((key, site, url, self.shard_of(key), PENDING, now))
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO work_items (key, site, url, shard, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return self.conn.total_changes - before
+
+    def lease(self, owner: str, limit: int, lease_seconds: float, shard: int | None = None) -> list[WorkItem]:
+        """
+        Take up to `limit` pending items for `lease_seconds` seconds.
+
+        Expired leases are reclaimed first. The lease runs in a write
+        transaction, so concurrent workers never get the same item.
+
+        Args:
+            owner (str): Worker name, only the owner can nack its items.
+            limit (int): Maximum number of items.
+            lease_seconds (float): Time after which the items are handed out again.
+            shard (int | None): Only lease items of this shard, any shard when None.
+
+        Returns:
+            list[WorkItem]: Leased items, oldest first.
+        """
+        now = time.time()
+        shard_filter, params = ("AND shard = ?", (shard,)) if shard is not None else ("", ())
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._reclaim(now)
+            rows = self.conn.execute(
+                f"SELECT key, site, url, attempts FROM work_items WHERE status = ? {shard_filter} "
+                "ORDER BY updated_at LIMIT ?", (PENDING, *params, limit)).fetchall()
+            self.conn.executemany(
+                "UPDATE work_items SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE key = ?", [(LEASED, owner, now + lease_seconds, now, row[0]) for row in rows])
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return [WorkItem(key, site, url, attempts + 1) for key, site, url, attempts in rows]
+
+    def ack(self, url: str) -> None:
+        """Mark the offer as done, whoever holds its lease."""
+        self.conn.execute("UPDATE work_items SET status = ?, lease_owner = NULL, lease_expires = NULL, "
+                          "updated_at = ? WHERE key = ?", (DONE, time.time(), offer_key(url)))
+
+    def nack(self, url: str, owner: str, max_attempts: int, error: str = "") -> bool:
+        """
+        Give back a failed item, it's retried until `max_attempts` is reached.
+
+        Returns:
+            bool: True if the item was requeued, False if it failed for good or
+            the lease is no longer held by `owner`.
+        """
+        cursor = self.conn.execute(
+            "UPDATE work_items SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, lease_owner = NULL, "
+            "lease_expires = NULL, error = ?, updated_at = ? WHERE key = ? AND status = ? AND lease_owner = ? "
+            "RETURNING status", (max_attempts, FAILED, PENDING, error, time.time(), offer_key(url), LEASED, owner))
+        row = cursor.fetchone()
+        return row is not None and row[0] == PENDING
+
+    def reclaim_expired(self) -> int:
+        """
+        Return items with expired leases to the queue.
+
+        Returns:
+            int: Number of reclaimed items.
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            reclaimed = self._reclaim(time.time())
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return reclaimed
+
+    def _reclaim(self, now: float) -> int:
+        cursor = self.conn.execute(
+            "UPDATE work_items SET status = ?, lease_owner = NULL, lease_expires = NULL "
+            "WHERE status = ? AND lease_expires < ?", (PENDING, LEASED, now))
+        if cursor.rowcount:
+            logger.warning(f"Reclaimed {cursor.rowcount} work items with expired leases.")
+        return cursor.rowcount
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of items per status."""
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM work_items GROUP BY status").fetchall())
+
+    def unfinished(self) -> int:
+        """Return the number of pending and leased items."""
+        counts = self.counts()
+        return counts.get(PENDING, 0) + counts.get(LEASED, 0)
+
+    def close(self) -> None:
+        self.conn.close()
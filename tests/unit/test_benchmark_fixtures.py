@@ -0,0 +1,54 @@
+import httpx
+
+from benchmarks.fixture_site import FaultProfile, FixtureOffer, FixtureServer, FixtureSite, RewriteTransport
+from benchmarks.run import comparison_table
+from scrapers.http_extractors import JustJoinItHttpExtractor, PracujHttpExtractor
+
+
+def test_pracuj_results_are_paginated():
+    site = FixtureSite(offers=60, pracuj_page_size=50)
+
+    status, _, body = site.render("pracuj.pl", "/praca/python;kw", {"pn": ["2"]})
+
+    assert status == 200
+    assert body.count('data-test="link-offer"') == 10
+    assert '<span data-test="top-pagination-max-page-number">2</span>' in body
+
+
+def test_jjit_listing_api_pages_offers():
+    site = FixtureSite(offers=45, jjit_page_size=20)
+
+    _, content_type, body = site.render("justjoin.it", "/api/offers", {"page": ["3"]})
+
+    assert content_type == "application/json"
+    assert '"totalPages": 3' in body and body.count('"slug"') == 5
+
+
+async def test_http_fast_path_reads_fixture_offers():
+    with FixtureServer(FixtureSite(offers=10)) as server:
+        async with httpx.AsyncClient(transport=RewriteTransport(server)) as client:
+            pracuj = await PracujHttpExtractor(client).extract(FixtureOffer(3).pracuj_url)
+            jjit = await JustJoinItHttpExtractor(client).extract("https://justjoin.it/job-offer/" + FixtureOffer(4).slug)
+
+    assert (pracuj.employer, pracuj.position) == (FixtureOffer(3).employer, FixtureOffer(3).position)
+    assert jjit.requirements == "\n".join(FixtureOffer(4).skills)
+
+
+def test_failures_are_injected_into_offer_requests_only():
+    with FixtureServer(FixtureSite(offers=10), FaultProfile(failure_rate=1.0)) as server:
+        with httpx.Client() as client:
+            listing = client.get(server.local_url("https://pracuj.pl/praca/python;kw?sc=0"))
+            offer = client.get(server.local_url(FixtureOffer(1).pracuj_url))
+
+    assert (listing.status_code, offer.status_code) == (200, 503)
+    assert (server.requests, server.failures) == (2, 1)
+
+
+def test_comparison_table_lists_runs():
+    result = {"timestamp": "2026-10-18T10:00:00", "commit": "abc1234", "label": "baseline", "offers": 200,
+              "offers_per_second": 12.5, "stages": {"offer_http,pracuj": {"p95": 0.31}},
+              "memory": {"process_peak_rss_mb": 180.0}}
+
+    table = comparison_table([result])
+
+    assert "baseline" in table and "12.50" in table and "0.31s" in table
@@ -0,0 +1,76 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from scrapers.browser_pool import BrowserPool
+
+
+@pytest.fixture
+def playwright_mock():
+    with patch("scrapers.browser_pool.async_playwright") as async_playwright_mock:
+        playwright = MagicMock()
+        playwright.stop = AsyncMock()
+        browser = MagicMock()
+        browser.close = AsyncMock()
+        browser.new_context = AsyncMock(side_effect=lambda **kwargs: MagicMock(close=AsyncMock()))
+        playwright.chromium.launch = AsyncMock(return_value=browser)
+        async_playwright_mock.return_value.start = AsyncMock(return_value=playwright)
+        yield playwright
+
+
+async def test_browser_is_launched_once(playwright_mock):
+    async with BrowserPool() as pool:
+        await pool.acquire("pracuj")
+        await pool.acquire("justjoinit")
+
+    playwright_mock.chromium.launch.assert_awaited_once()
+    assert playwright_mock.chromium.launch.call_args.kwargs["headless"] is True
+
+
+async def test_context_is_reused_per_site(playwright_mock):
+    async with BrowserPool() as pool:
+        first = await pool.acquire("pracuj", storage_state="state.json")
+        await pool.release("pracuj")
+        second = await pool.acquire("pracuj")
+        other = await pool.acquire("justjoinit")
+
+        assert first is second
+        assert first is not other
+        assert pool.browser.new_context.call_args_list[0].kwargs["storage_state"] == "state.json"
+        assert len(pool.timings.acquire) == 3
+        assert len(pool.timings.release) == 1
+
+
+async def test_release_with_close_drops_context(playwright_mock):
+    async with BrowserPool() as pool:
+        first = await pool.acquire("pracuj")
+        await pool.release("pracuj", close=True)
+        second = await pool.acquire("pracuj")
+
+        first.close.assert_awaited_once()
+        assert first is not second
+
+
+async def test_page_pool_is_shared_per_site_and_closed_with_context(playwright_mock):
+    async with BrowserPool() as pool:
+        context = await pool.acquire("pracuj")
+        page_pool = pool.page_pool("pracuj", size=3)
+
+        assert pool.page_pool("pracuj") is page_pool
+        assert page_pool.context is context and page_pool.size == 3
+
+        await pool.release("pracuj", close=True)
+        assert page_pool.closed
+
+
+async def test_challenged_context_is_closed_on_release(playwright_mock):
+    sessions = MagicMock(choose=MagicMock(return_value="sessions/pracuj-1.json"), save=AsyncMock(),
+                         is_challenged=MagicMock(return_value=True))
+    async with BrowserPool(sessions=sessions) as pool:
+        first = await pool.acquire("pracuj", storage_state="state.json")
+        await pool.release("pracuj")
+
+        first.close.assert_awaited_once()
+        sessions.save.assert_awaited_once_with("pracuj", first)
+        sessions.forget.assert_called_once_with("pracuj")
+        assert pool.browser.new_context.call_args.kwargs["storage_state"] == "sessions/pracuj-1.json"
@@ -0,0 +1,90 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from scrapers.checkpoint import CheckpointJournal, ResumedOffers
+from scrapers.config import ScraperConfig
+from scrapers.models import JobOffer
+from scrapers.pracuj_scraper import PracujScraper
+
+URLS = [f"https://www.pracuj.pl/praca/offer,{i}" for i in range(4)]
+
+
+def interrupted_run(path):
+    journal = CheckpointJournal(path)
+    search = journal.search("pracuj", "python @ Łódź")
+    for url in URLS:
+        search.discovered(url)
+    search.page_done(2)
+    journal.mark_done(URLS[:1])
+    journal.search("pracuj", "java @ Łódź").finished()
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"event": "done", "url": ')  # killed mid-write
+
+
+def test_resumed_journal_restores_progress(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    interrupted_run(path)
+
+    journal = CheckpointJournal(path, resume=True)
+    search = journal.search("pracuj", "python @ Łódź")
+
+    assert search.progress.last_page == 2
+    assert search.pending({URLS[1]}) == URLS[2:], "done and stored offers are not scraped again"
+    assert journal.search("pracuj", "java @ Łódź").progress.finished
+    journal.close()
+
+
+def test_new_run_starts_empty_journal(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    interrupted_run(path)
+
+    CheckpointJournal(path).close()
+
+    assert CheckpointJournal(path, resume=True).searches == {}
+
+
+def test_offers_discovered_before_interruption_are_not_known():
+    known = ResumedOffers({URLS[0], URLS[1]}, {"pracuj:0"})
+
+    assert URLS[0] not in known
+    assert URLS[1] in known
+
+
+async def test_pracuj_resumes_after_last_page(tmp_path):
+    journal = CheckpointJournal(str(tmp_path / "checkpoint.jsonl"))
+    scraper = PracujScraper(MagicMock(), MagicMock(), config=ScraperConfig(listing_lookahead=2))
+    scraper.checkpoint = journal.search("pracuj", "python @ Łódź")
+    scraper.checkpoint.page_done(2)
+    scraper.page = MagicMock(url="https://www.pracuj.pl/praca/python;kw?sc=0")
+    scraper.max_page = AsyncMock(return_value=4)
+    scraper.jobs_list = AsyncMock()
+    scraper.fetch_results_page = AsyncMock(side_effect=lambda url: [URLS[int(url[-1])-1]])
+    scraper.scrape_single_offer = AsyncMock(
+        side_effect=lambda url: JobOffer(position="Dev", salary="", requirements="Python", url=url))
+
+    offers = [job async for job in scraper.extract_job_data(set())]
+
+    scraper.jobs_list.assert_not_called()
+    assert [c.args[0][-4:] for c in scraper.fetch_results_page.call_args_list] == ["pn=3", "pn=4"]
+    assert sorted(job.url for job in offers) == URLS[2:]
+    assert scraper.checkpoint.progress.last_page == 4
+    assert scraper.checkpoint.progress.discovered == URLS[2:]
+    journal.close()
+
+
+async def test_pracuj_does_not_record_pages_after_a_failed_one(tmp_path):
+    journal = CheckpointJournal(str(tmp_path / "checkpoint.jsonl"))
+    scraper = PracujScraper(MagicMock(), MagicMock(), config=ScraperConfig(listing_lookahead=2))
+    scraper.checkpoint = journal.search("pracuj", "python @ Łódź")
+    scraper.page = MagicMock(url="https://www.pracuj.pl/praca/python;kw?sc=0")
+    scraper.max_page = AsyncMock(return_value=4)
+    scraper.jobs_list = AsyncMock(return_value=URLS[:1])
+    scraper.fetch_results_page = AsyncMock(side_effect=lambda url: None if url.endswith("pn=3") else [])
+    scraper.scrape_single_offer = AsyncMock(
+        side_effect=lambda url: JobOffer(position="Dev", salary="", requirements="Python", url=url))
+
+    [job async for job in scraper.extract_job_data(set())]
+
+    assert scraper.fetch_results_page.call_count == 3
+    assert scraper.checkpoint.progress.last_page == 2
+    journal.close()
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from scrapers.enrichment import enrich, parse_salaries, tech_stack
+from scrapers.models import JobOffer
+from scrapers.offer_store import OfferStore
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("12 000–18 000 zł brutto / mies.", [(12000, 18000, "PLN", "month", "employment")]),
+    ("10 000–14 000 złnetto (+ VAT) / mies.", [(10000, 14000, "PLN", "month", "b2b")]),
+    ("120–150 zł netto (+ VAT) / godz.", [(120, 150, "PLN", "hour", "b2b")]),
+    ("18000–24000 PLN / b2b month\n15000–20000 PLN / permanent month",
+     [(18000, 24000, "PLN", "month", "b2b"), (15000, 20000, "PLN", "month", "employment")]),
+    ("18 000 - 24 000 PLN\nNet per month - B2B\n15 000 - 20 000 PLN\nGross per month",
+     [(18000, 24000, "PLN", "month", "b2b"), (15000, 20000, "PLN", "month", "employment")]),
+    ("12000 PLN / MONTH", [(12000, 12000, "PLN", "month", None)]),
+    ("15k - 20k EUR", [(15000, 20000, "EUR", "month", None)]),
+    ("Umowa zlecenie: 1,234.50 - 1,500 USD / hour brutto", [(1234.5, 1500, "USD", "hour", "mandate")]),
+    ("Undisclosed salary", []),
+])
+def test_salary_texts_are_parsed(text, expected):
+    salaries = parse_salaries([text])
+
+    assert list(zip(salaries.low, salaries.high, salaries.currency, salaries.period, salaries.contract)) == expected
+
+
+def test_tech_stack_is_normalized():
+    assert tech_stack("Python 3\nDjango REST Framework\nk8s\nGo") == ["Python", "Django", "Kubernetes", "Go"]
+    assert tech_stack("Experience with C++ and .NET Core, nice to have: node.js") == ["C++", ".NET", "Node.js"]
+    assert tech_stack("Ready to go the extra mile, rest assured") == []
+
+
+def test_batch_columns_support_filtering_and_aggregation():
+    enrichment = enrich(
+        ["18000–24000 PLN / b2b month\n15000–20000 PLN / permanent month", "", "100 - 150 PLN / hour"],
+        ["Python\nDocker", "Java", "Python"])
+
+    np.testing.assert_array_equal(enrichment.salary_min, [15000, np.nan, 16800])
+    np.testing.assert_array_equal(enrichment.salary_max, [24000, np.nan, 25200])
+    assert list(enrichment.contracts) == ["b2b,employment", None, None]
+    assert list(enrichment.has("Python")) == [True, False, True]
+    assert enrichment.tech_counts() == {"Python": 2, "Java": 1, "Docker": 1}
+    assert enrichment.rows()[1] == (None, None, None, None, None, "Java")
+
+
+def test_store_enriches_new_and_existing_offers():
+    store = OfferStore()
+    offer = JobOffer(employer="Acme", position="Dev", salary="12 000–18 000 zł brutto / mies.",
+                     requirements="Python\nDjango", url="https://www.pracuj.pl/praca/dev,oferta,1")
+    store.add_offers("pracuj", [offer])
+    store.conn.execute("UPDATE offers SET enriched = 0, salary_min = NULL")
+
+    assert store.enrich_missing() == 1
+    assert store.enrich_missing() == 0
+    row = store.conn.execute("SELECT salary_min, salary_max, contract_types, tech_stack FROM offers").fetchone()
+    store.close()
+    assert row == (12000, 18000, "employment", "Python,Django")
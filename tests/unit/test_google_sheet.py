@@ -1,18 +1,42 @@
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 import pytest
 
-from google_sheets_client import GoogleSheetClient
+from gspread.exceptions import APIError
+from requests.exceptions import ReadTimeout
+
+from google_sheets_client import GoogleSheetClient, SheetWriter
+from scrapers.config import SearchQuery
+from scrapers.rate_limit import TokenBucket
 from main import main
 
 @pytest.mark.asyncio
+@patch("main.OfferStore")
+@patch("main.create_http_client")
+@patch("main.BrowserPool")
 @patch("main.run_scraper")
 @patch("main.GoogleSheetClient")
 @patch("main.ScraperConfig")
-async def test_main(scraper_config_mock, google_sheet_client_mock, mock_run_scraper):
+async def test_main(scraper_config_mock, google_sheet_client_mock, mock_run_scraper, browser_pool_mock,
+                    create_http_client_mock, offer_store_mock, tmp_path):
     mock_config = scraper_config_mock.from_env.return_value
     mock_config.spreadsheet_name = "job-offers"
     mock_config.config = "fake.json"
+    mock_config.pipeline_queue_size = 10
+    mock_config.pipeline_batch_size = 5
+    mock_config.pipeline_flush_interval = 1
+    mock_config.jsonl_output_path = ""
+    mock_config.max_open_pages = 5
+    mock_config.domain_policies = {}
+    mock_config.searches = [SearchQuery("python", "Łódź"), SearchQuery("java", "Łódź")]
+    mock_config.concurrent_searches = 2
+    mock_config.revisit = False
+    mock_config.checkpoint_path = str(tmp_path / "checkpoint.jsonl")
+    mock_config.metrics_prometheus_path = ""
+    mock_config.metrics_json_path = ""
+    mock_config.index_path = ""
+    mock_config.near_duplicates = False
+    mock_config.session_dir = ""
 
     mock_google = google_sheet_client_mock.return_value
     mock_spreadsheet = mock_google.spreadsheet
@@ -21,10 +45,15 @@ async def test_main(scraper_config_mock, google_sheet_client_mock, mock_run_scra
     mock_worksheet.col_values.return_value = ["url1", "url2"]
     mock_spreadsheet.get_worksheet.return_value = mock_worksheet
 
-    mock_run_scraper.return_value = []
+    mock_run_scraper.return_value = 0
+    create_http_client_mock.return_value.aclose = AsyncMock()
     await main()
 
     mock_google.open_spreadsheet.assert_called_once_with("job-offers")
+    assert offer_store_mock.return_value.sync_from_sheet.call_count == 2
+    assert mock_run_scraper.call_count == 4, "every search runs on every site"
+    claimed_sets = {id(call.args[8]) for call in mock_run_scraper.call_args_list}
+    assert len(claimed_sets) == 1, "searches share the claimed offers"
 
 @patch("google_sheets_client.os.path.exists")
 def test_init_raises_error(mock_exists):
@@ -32,3 +61,74 @@ def test_init_raises_error(mock_exists):
     with pytest.raises(FileNotFoundError):
         GoogleSheetClient()
     mock_exists.assert_called_once_with('credentials.json')
+
+
+def api_error(code):
+    response = MagicMock()
+    response.json.return_value = {"error": {"code": code, "message": "error", "status": "ERROR"}}
+    return APIError(response)
+
+
+@pytest.fixture
+def no_sleep():
+    with patch("google_sheets_client.time.sleep") as sleep_mock:
+        yield sleep_mock
+
+
+def make_writer(worksheet, tmp_path, **kwargs):
+    return SheetWriter(worksheet, str(tmp_path / "spool" / "worksheet_0.jsonl"),
+                       TokenBucket(rate=1000, capacity=1000), base_delay=0.01, **kwargs)
+
+
+def test_writer_appends_rows_in_chunks(tmp_path, no_sleep):
+    worksheet = MagicMock()
+    rows = [[str(i)] for i in range(5)]
+
+    written = make_writer(worksheet, tmp_path, chunk_size=2).write(rows)
+
+    assert written == 5
+    assert [c.args[0] for c in worksheet.append_rows.call_args_list] == [rows[0:2], rows[2:4], rows[4:5]]
+
+
+def test_writer_retries_quota_errors(tmp_path, no_sleep):
+    worksheet = MagicMock()
+    worksheet.append_rows.side_effect = [api_error(429), api_error(503), None]
+
+    written = make_writer(worksheet, tmp_path).write([["a"]])
+
+    assert written == 1
+    assert worksheet.append_rows.call_count == 3
+    assert no_sleep.call_count == 2
+
+
+def test_writer_spools_failed_rows_and_retries_them_next_run(tmp_path, no_sleep):
+    worksheet = MagicMock()
+    worksheet.append_rows.side_effect = api_error(429)
+    writer = make_writer(worksheet, tmp_path, max_retries=1)
+
+    assert writer.write([["a"], ["b"]]) == 0
+    assert (tmp_path / "spool" / "worksheet_0.jsonl").exists()
+
+    worksheet.append_rows.reset_mock(side_effect=True)
+    assert writer.write([["c"]]) == 3
+    worksheet.append_rows.assert_called_once()
+    assert worksheet.append_rows.call_args.args[0] == [["a"], ["b"], ["c"]]
+    assert not (tmp_path / "spool" / "worksheet_0.jsonl").exists()
+
+
+def test_writer_does_not_retry_client_errors(tmp_path, no_sleep):
+    worksheet = MagicMock()
+    worksheet.append_rows.side_effect = api_error(400)
+
+    assert make_writer(worksheet, tmp_path).write([["a"]]) == 0
+    worksheet.append_rows.assert_called_once()
+
+
+def test_writer_spools_rows_after_network_timeouts(tmp_path, no_sleep):
+    worksheet = MagicMock()
+    worksheet.append_rows.side_effect = ReadTimeout("read timed out")
+
+    assert make_writer(worksheet, tmp_path, max_retries=2, max_delay=0.02).write([["a"]]) == 0
+    assert worksheet.append_rows.call_count == 3
+    assert all(c.args[0] < 0.03 for c in no_sleep.call_args_list)
+    assert (tmp_path / "spool" / "worksheet_0.jsonl").exists()
@@ -0,0 +1,80 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from scrapers.harvester import INSTALL_JS, PENDING_JS, TAKE_JS, InfiniteScrollHarvester
+
+
+def page_mock(batches):
+    """Page whose harvester returns the given batches of hrefs, one batch per step."""
+    batches = iter(batches)
+
+    async def evaluate(expression, arg=None):
+        if expression == TAKE_JS:
+            hrefs, at_bottom = next(batches)
+            return {"hrefs": hrefs, "atBottom": at_bottom}
+        return None
+
+    page = MagicMock()
+    page.evaluate = AsyncMock(side_effect=evaluate)
+    return page
+
+
+def make_harvester(**kwargs):
+    waits = MagicMock()
+    waits.for_condition = AsyncMock(return_value=True)
+    return InfiniteScrollHarvester("a.offer-card", "https://justjoin.it", waits, **kwargs)
+
+
+async def test_harvest_yields_only_new_links_and_stops_at_known_offer():
+    page = page_mock([(["/job-offer/a?x=1", "/job-offer/b"], False), (["/job-offer/c", "/job-offer/old"], False)])
+    harvester = make_harvester()
+
+    urls = [url async for url in harvester.harvest(page, {"https://justjoin.it/job-offer/old"})]
+
+    assert urls == ["https://justjoin.it/job-offer/a", "https://justjoin.it/job-offer/b", "https://justjoin.it/job-offer/c"]
+    assert page.evaluate.call_args_list[0].args == (INSTALL_JS, "a.offer-card")
+    assert harvester.metrics.scrolls == 1
+    assert harvester.metrics.round_trips == 2
+    assert harvester.metrics.stop_reason.startswith("known offer")
+
+
+async def test_harvest_keeps_scrolling_until_bottom_stays_idle():
+    page = page_mock([(["/job-offer/a"], False), ([], False), (["/job-offer/b"], True), ([], True), ([], True)])
+    harvester = make_harvester(max_idle_scrolls=2)
+
+    urls = [url async for url in harvester.harvest(page, set())]
+
+    assert urls == ["https://justjoin.it/job-offer/a", "https://justjoin.it/job-offer/b"]
+    assert harvester.metrics.stop_reason == "end of list"
+    assert harvester.metrics.new_urls == 2
+
+
+async def test_harvest_respects_scroll_limit():
+    page = page_mock([([f"/job-offer/{i}"], False) for i in range(10)])
+    harvester = make_harvester(max_scrolls=3)
+
+    urls = [url async for url in harvester.harvest(page, set())]
+
+    assert len(urls) == 4
+    assert harvester.metrics.stop_reason == "scroll limit"
+
+
+async def test_harvest_waits_for_new_links_with_idle_timeout():
+    page = page_mock([(["/job-offer/a"], True), ([], True), ([], True)])
+    harvester = make_harvester(idle_timeout=300)
+
+    [url async for url in harvester.harvest(page, set())]
+
+    harvester.waits.for_condition.assert_awaited_with(page, PENDING_JS, "new offer links", polling="raf",
+                                                      timeout=300)
+
+
+async def test_harvest_takes_captured_links_before_rendered_ones():
+    page = page_mock([(["/job-offer/a", "/job-offer/b"], False), (["/job-offer/c"], True), ([], True), ([], True)])
+    captured = iter([["https://justjoin.it/job-offer/a", "https://justjoin.it/job-offer/c"], [], [], []])
+    harvester = make_harvester()
+
+    urls = [url async for url in harvester.harvest(page, set(), lambda: next(captured))]
+
+    assert urls == ["https://justjoin.it/job-offer/a", "https://justjoin.it/job-offer/c",
+                    "https://justjoin.it/job-offer/b"]
+    assert harvester.metrics.harvested == 3
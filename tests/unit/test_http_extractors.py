@@ -0,0 +1,73 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import httpx
+
+from scrapers.http_extractors import JustJoinItHttpExtractor, PracujHttpExtractor
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def read_fixture(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def test_pracuj_parses_ld_json():
+    offer = PracujHttpExtractor(MagicMock()).parse("https://www.pracuj.pl/praca/python,1", read_fixture("pracuj_offer_ld.html"))
+
+    assert offer.employer == "Acme Sp. z o.o."
+    assert offer.position == "Python Developer"
+    assert offer.salary == "12000–18000 PLN / MONTH"
+    assert offer.requirements == "Python\nDjango\nPostgreSQL"
+
+
+def test_pracuj_parses_next_data():
+    offer = PracujHttpExtractor(MagicMock()).parse("https://www.pracuj.pl/praca/test,2", read_fixture("pracuj_offer_next_data.html"))
+
+    assert offer.employer == "Beta S.A."
+    assert offer.position == "Test Automation Engineer"
+    assert offer.salary == "9000–13000 PLN / mies."
+    assert offer.requirements == "Python\npytest\nPlaywright\nDocker"
+
+
+def test_pracuj_returns_none_without_embedded_data():
+    html = "<html><body><h1>Python Developer</h1></body></html>"
+    assert PracujHttpExtractor(MagicMock()).parse("https://www.pracuj.pl/praca/x,3", html) is None
+
+
+def test_justjoinit_parses_api_json():
+    extractor = JustJoinItHttpExtractor(MagicMock())
+    url = "https://justjoin.it/job-offer/gamma-python-developer-lodz-python"
+
+    offer = extractor.parse(url, read_fixture("jjit_offer.json"))
+
+    assert extractor.request_url(url).endswith("/offers/gamma-python-developer-lodz-python")
+    assert offer.employer == "Gamma"
+    assert offer.salary == "18000–24000 PLN / b2b month\n15000–20000 PLN / permanent month"
+    assert offer.requirements == "Python\nFastAPI"
+    assert offer.url == url
+
+
+async def test_extract_returns_none_on_http_error():
+    transport = httpx.MockTransport(lambda request: httpx.Response(403, text="captcha"))
+    async with httpx.AsyncClient(transport=transport) as client:
+        assert await PracujHttpExtractor(client).extract("https://www.pracuj.pl/praca/x,3") is None
+
+
+async def test_extract_fetches_and_parses():
+    html = read_fixture("pracuj_offer_ld.html")
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text=html))
+    async with httpx.AsyncClient(transport=transport) as client:
+        offer = await PracujHttpExtractor(client).extract("https://www.pracuj.pl/praca/python,1")
+    assert offer.position == "Python Developer"
+
+
+async def test_extract_returns_none_for_wrong_shaped_json():
+    url = "https://justjoin.it/job-offer/gamma-python-developer-lodz-python"
+    bodies = ['[{"title": "Python Developer"}]',
+              '{"title": ["Python Developer"], "requiredSkills": ["Python"]}',
+              '{"title": "Python Developer", "requiredSkills": ["Python"], "employmentTypes": ["b2b"]}']
+    for body in bodies:
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, text=body))
+        async with httpx.AsyncClient(transport=transport) as client:
+            assert await JustJoinItHttpExtractor(client).extract(url) is None
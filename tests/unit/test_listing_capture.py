@@ -0,0 +1,49 @@
+from pathlib import Path
+
+from scrapers.listing_capture import JJIT_LISTING_API, PRACUJ_LISTING_API, ListingCapture
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_jjit_listing_items_become_offers():
+    capture = ListingCapture(JJIT_LISTING_API)
+
+    assert capture.add_payload((FIXTURES / "jjit_listing.json").read_text(encoding="utf-8")) == 2
+
+    offer = capture.get("https://justjoin.it/job-offer/gamma-python-developer-lodz-python")
+    assert offer.employer == "Gamma"
+    assert offer.requirements == "Python\nDjango"
+    assert capture.get("https://justjoin.it/job-offer/delta-qa-engineer-lodz-testing") is None, \
+        "offers without requirements need the detail page"
+
+
+def test_pracuj_listing_is_read_from_next_data():
+    capture = ListingCapture(PRACUJ_LISTING_API)
+
+    assert capture.add_payload((FIXTURES / "pracuj_listing.html").read_text(encoding="utf-8")) == 2
+
+    offer = capture.get("https://www.pracuj.pl/praca/python-developer-lodz,oferta,1001")
+    assert offer.position == "Python Developer"
+    assert offer.salary == "12 000–18 000 zł brutto / mies."
+    assert offer.url == "https://www.pracuj.pl/praca/python-developer-lodz,oferta,1001"
+    assert capture.get("https://www.pracuj.pl/praca/tester-lodz,oferta,1002") is None
+
+
+def test_unexpected_payload_is_ignored():
+    capture = ListingCapture(JJIT_LISTING_API)
+
+    assert capture.add_payload("<html>not json</html>") == 0
+    assert capture.offers == {}
+
+
+def test_payload_urls_are_discovered_in_listing_order():
+    capture = ListingCapture(PRACUJ_LISTING_API)
+    payload = (FIXTURES / "pracuj_listing.html").read_text(encoding="utf-8")
+
+    urls = capture.read_payload(payload)
+
+    assert urls == ["https://www.pracuj.pl/praca/python-developer-lodz,oferta,1001",
+                    "https://www.pracuj.pl/praca/tester-lodz,oferta,1002"]
+    capture.read_payload(payload)
+    assert capture.take_discovered() == urls
+    assert capture.take_discovered() == []
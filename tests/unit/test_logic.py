@@ -2,6 +2,7 @@
 import pytest
 
 from scrapers.base_scraper import BaseScraper
+from scrapers.config import ScraperConfig, SearchQuery, parse_searches
 
 
 @pytest.mark.parametrize("url, expected_url", [("https://url.pl/some_data?xyz", "https://url.pl/some_data"),
@@ -24,3 +25,15 @@ def test_validate_params_with_valid_params():
 def test_validate_params_with_invalid_params(keywords, location):
     with pytest.raises(ValueError):
         BaseScraper._validate_scraper_params(keywords, location)
+
+
+def test_parse_searches_expands_matrix():
+    searches = parse_searches("python, java @ Łódź, Warszawa; python @ Łódź; ;golang@Kraków")
+
+    assert [str(query) for query in searches] == ["python @ Łódź", "python @ Warszawa", "java @ Łódź",
+                                                  "java @ Warszawa", "golang @ Kraków"]
+
+
+def test_single_search_is_used_without_matrix():
+    config = ScraperConfig(search_keywords="python", search_location="Łódź", searches=[])
+    assert config.searches == [SearchQuery("python", "Łódź")]
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from scrapers.metrics import MetricsRegistry, percentile
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    for seconds in range(1, 101):
+        registry.observe("offer_goto", seconds / 100, site="pracuj")
+    registry.inc("offers_scraped", site="pracuj", source="http")
+    registry.inc("offers_scraped", 2, site="pracuj", source="http")
+    registry.add_gauge("open_pages", 1)
+    return registry
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert [percentile(values, q) for q in (0.5, 0.95, 0.99)] == [50, 95, 99]
+    assert percentile([], 0.5) == 0.0
+
+
+def test_timer_records_duration_when_block_raises():
+    registry = MetricsRegistry()
+    with pytest.raises(ValueError):
+        with registry.timer("search", site="justjoinit"):
+            raise ValueError
+    assert len(registry.timers["search"][(("site", "justjoinit"),)]) == 1
+
+
+def test_prometheus_text_format(registry):
+    text = registry.to_prometheus()
+
+    assert 'scraper_offers_scraped_total{site="pracuj",source="http"} 3' in text
+    assert "scraper_open_pages 1" in text
+    assert 'scraper_offer_goto_seconds{site="pracuj",quantile="0.95"} 0.950000' in text
+    assert 'scraper_offer_goto_seconds_count{site="pracuj"} 100' in text
+
+
+def test_json_export_and_summary(registry, tmp_path):
+    registry.export(json_path=str(tmp_path / "metrics.json"))
+    data = json.loads((tmp_path / "metrics.json").read_text())
+
+    [timer] = data["timers"]["offer_goto"]
+    assert timer["labels"] == {"site": "pracuj"}
+    assert (timer["count"], timer["p50"], timer["p99"]) == (100, 0.5, 0.99)
+    assert data["counters"]["offers_scraped"][0]["value"] == 3
+
+    table = registry.summary_table()
+    assert "offer_goto" in table and "site=pracuj" in table
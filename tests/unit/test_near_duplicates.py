@@ -0,0 +1,74 @@
+import pytest
+
+from scrapers.models import JobOffer
+from scrapers.near_duplicates import NearDuplicateIndex
+from scrapers.offer_store import OfferStore
+from scrapers.pipeline import OfferPipeline, SheetSink, StoreSink
+
+REQUIREMENTS = ("Min. 3 lata doświadczenia w Pythonie\nZnajomość Django i Django REST Framework\n"
+                "Doświadczenie z PostgreSQL oraz Redis\nDocker, Kubernetes, CI/CD w GitLab\n"
+                "Testy jednostkowe w pytest\nAngielski na poziomie B2")
+PRACUJ = JobOffer(employer="Acme sp. z o.o.", position="Python Developer", salary="18 000 zł",
+                  requirements=REQUIREMENTS, url="https://www.pracuj.pl/praca/python-developer-lodz,oferta,1")
+# The same job on justjoin.it, one requirement line shorter
+JJIT = JobOffer(employer="Acme sp. z o.o.", position="Python Developer", salary="18000 PLN",
+                requirements=REQUIREMENTS.rsplit("\n", 1)[0], url="https://justjoin.it/job-offer/acme-python-developer")
+SENIOR = JJIT.model_copy(update={"position": "Senior Python Developer", "url": "https://justjoin.it/job-offer/acme-s"})
+OTHER = JobOffer(employer="Beta", position="QA Engineer", salary="",
+                 requirements="Selenium, Cypress\nTestowanie manualne", url="https://justjoin.it/job-offer/beta-qa")
+
+
+def rows(*offers):
+    return [(offer.url, offer.position, offer.employer, offer.requirements) for offer in offers]
+
+
+def test_cross_site_repost_is_found_and_clustered():
+    index = NearDuplicateIndex()
+
+    assert index.add_many(rows(PRACUJ, OTHER, JJIT)) == [None, None, PRACUJ.url]
+    assert index.clusters() == [[PRACUJ.url, JJIT.url]]
+    assert index.duplicate_of == {JJIT.url: PRACUJ.url}
+
+
+def test_other_seniority_or_same_offer_is_not_a_duplicate():
+    index = NearDuplicateIndex()
+    index.add_many(rows(PRACUJ))
+
+    assert index.add_many(rows(SENIOR)) == [None]
+    # The same offer under a tracking URL is deduplicated by its key, not here
+    assert index.add_many([(PRACUJ.url + "?s=1", PRACUJ.position, PRACUJ.employer, PRACUJ.requirements)]) == [None]
+
+
+def test_signatures_are_stable_across_instances():
+    first, second = NearDuplicateIndex(), NearDuplicateIndex()
+    first.add_many(rows(PRACUJ))
+    second.add_many(rows(PRACUJ))
+
+    assert (first.signatures[0] == second.signatures[0]).all()
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(num_perm=64, bands=10)
+
+
+async def test_pipeline_stores_duplicates_but_keeps_them_out_of_the_sheet():
+    class Writer:
+        def __init__(self):
+            self.rows = []
+
+        def write(self, rows):
+            self.rows.extend(rows)
+
+    store = OfferStore()
+    store.add_offers("pracuj", [PRACUJ])
+    index = NearDuplicateIndex.from_store(store, max_age=86400)
+    writer = Writer()
+
+    async with OfferPipeline([SheetSink({"justjoinit": writer}), StoreSink(store, index)],
+                             near_duplicates=index) as pipeline:
+        await pipeline.put("justjoinit", JJIT)
+        await pipeline.put("justjoinit", OTHER)
+
+    assert [row[4] for row in writer.rows] == [OTHER.url]
+    assert JJIT.url in store
+    assert store.conn.execute("SELECT duplicate_of FROM offers WHERE url = ?", (JJIT.url,)).fetchone() == (PRACUJ.url,)
+    assert [row["url"] for row in store.changed_since()] == [PRACUJ.url, OTHER.url]
+    assert pipeline.written == 1
@@ -0,0 +1,53 @@
+import io
+import json
+
+import pytest
+
+from scrapers.models import JobOffer, OfferRecord
+from scrapers.offer_batch import OfferBatch
+from scrapers.offer_store import OfferStore
+
+OFFERS = [
+    JobOffer(employer="Acme", position="Dev", salary="10 000 zł", requirements="Python", url="https://a.pl/1"),
+    JobOffer(employer=None, position="Tester \"QA\"", salary="", requirements="Łódź, pytest", url="https://a.pl/2"),
+]
+
+
+def test_sheet_rows_have_empty_status_column():
+    batch = OfferBatch.from_offers(OFFERS)
+
+    assert len(batch) == 2
+    assert batch.sheet_rows() == [["Acme", "Dev", "10 000 zł", "Python", "https://a.pl/1", ""],
+                                  [None, "Tester \"QA\"", "", "Łódź, pytest", "https://a.pl/2", ""]]
+
+
+def test_jsonl_matches_model_dump():
+    f = io.StringIO()
+    OfferBatch.from_offers(OFFERS).write_jsonl(f, site="pracuj")
+
+    lines = f.getvalue().splitlines()
+    assert lines == [json.dumps({"site": "pracuj", **offer.model_dump()}, ensure_ascii=False) for offer in OFFERS]
+
+
+def test_records_round_trip_with_validation():
+    batch = OfferBatch.from_offers(OfferRecord.from_offer(offer) for offer in OFFERS)
+
+    assert batch.to_offers() == OFFERS
+    with pytest.raises(ValueError):
+        OfferRecord(None, None, "", "", "https://a.pl/3").to_offer()
+
+
+def test_store_exports_csv(tmp_path):
+    store = OfferStore()
+    store.add_offers("pracuj", OFFERS)
+    store.add_urls("pracuj", ["https://a.pl/only-url"])
+    path = tmp_path / "offers.csv"
+
+    store.offer_batch("pracuj").export(str(path))
+    store.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "employer,position,salary,requirements,url"
+    assert len(lines) == 3, "offers known only by URL are not exported"
+    with pytest.raises(ValueError):
+        OfferBatch().export(str(tmp_path / "offers.xlsx"))
@@ -0,0 +1,93 @@
+import pytest
+
+from scrapers.models import JobOffer
+from scrapers.offer_index import OfferIndex, Query, parse_query, tokenize
+from scrapers.offer_store import OfferStore
+
+OFFERS = [
+    JobOffer(employer="Acme", position="Python Developer", salary="18 000–24 000 zł brutto / mies.",
+             requirements="Python\nDjango\nPostgreSQL", url="https://www.pracuj.pl/praca/python-developer-lodz,oferta,1"),
+    JobOffer(employer="Beta", position="QA Engineer", salary="12 000 - 15 000 PLN",
+             requirements="Python, pytest, Selenium", url="https://www.pracuj.pl/praca/qa-engineer-warszawa,oferta,2"),
+    JobOffer(employer="Gamma Łódź", position="Backend Developer", salary="",
+             requirements="Python, Django, C#", url="https://justjoin.it/job-offer/gamma-backend-lodz-python"),
+]
+
+
+def urls(result):
+    return [hit.url for hit in result.hits]
+
+
+@pytest.fixture
+def index():
+    index = OfferIndex()
+    index.add_offers(OFFERS)
+    return index
+
+
+def test_tokenize_folds_case_and_polish_diacritics():
+    assert tokenize("Łódź, Kraków; C# i Node.js 3.12 C++") == ["lodz", "krakow", "c#", "i", "node.js", "3.12", "c++"]
+
+
+def test_parse_query():
+    assert parse_query("python AND django, salary >= 20k, Łódź") == Query(["python", "django", "lodz"], [],
+                                                                         [(">=", 20000.0)])
+    assert parse_query("tester -senior NOT java, ≤ 15 000") == Query(["tester"], ["senior", "java"], [("<=", 15000.0)])
+
+
+def test_all_terms_must_match_newest_first(index):
+    assert urls(index.search("python AND django")) == [OFFERS[2].url, OFFERS[0].url]
+    # The city is taken from the URL slug
+    assert urls(index.search("python, Łódź, -gamma")) == [OFFERS[0].url]
+    assert index.search("python rust").total == 0
+
+
+def test_salary_bounds_skip_offers_without_salary(index):
+    assert urls(index.search("salary >= 20k")) == [OFFERS[0].url]
+    assert urls(index.search("python, salary < 16000")) == [OFFERS[1].url]
+    hit = index.search("qa").hits[0]
+    assert (hit.salary_min, hit.salary_max) == (12000.0, 15000.0)
+
+
+def test_readding_an_offer_replaces_it_only_when_changed(index):
+    assert index.add_offers(OFFERS[:1]) == 0
+
+    changed = OFFERS[0].model_copy(update={"position": "Senior Python Developer", "url": OFFERS[0].url + "?s=1"})
+    assert index.add_offers([changed]) == 1
+    assert len(index) == 3
+    assert urls(index.search("senior")) == [changed.url]
+    assert index.search("acme").total == 1
+
+    assert index.remove(changed.url)
+    assert index.search("acme").total == 0
+
+
+def test_snapshot_round_trip_keeps_accepting_offers(index, tmp_path):
+    index.save(str(tmp_path / "index"))
+    loaded = OfferIndex.load(str(tmp_path / "index"))
+
+    assert len(loaded) == 3
+    assert urls(loaded.search("django")) == urls(index.search("django"))
+    # Updates after a load go to the delta segment and survive the next save
+    loaded.add(
+        "https://www.pracuj.pl/praca/django-dev-lodz,oferta,4", "Django Dev", "Delta", salary_min=30000,
+        salary_max=35000)
+    assert urls(loaded.search("django, >= 20k")) == ["https://www.pracuj.pl/praca/django-dev-lodz,oferta,4",
+                                                     OFFERS[0].url]
+    loaded.save(str(tmp_path / "index"))
+    assert OfferIndex.load(str(tmp_path / "index")).search("django").total == 3
+
+
+def test_sync_from_store_applies_new_and_closed_offers():
+    store = OfferStore()
+    store.add_offers("pracuj", OFFERS[:2])
+    index = OfferIndex()
+
+    assert index.sync_from_store(store) == 2
+    store.record_check(OFFERS[1].url, status="closed")
+    store.add_offers("justjoin", OFFERS[2:])
+
+    assert index.sync_from_store(store) == 2
+    assert urls(index.search("python")) == [OFFERS[2].url, OFFERS[0].url]
+    hit = index.search("acme").hits[0]
+    assert hit.salary_max == 24000.0
@@ -0,0 +1,79 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from scrapers.models import JobOffer
+from scrapers.offer_store import OfferStore, offer_key
+
+
+@pytest.fixture
+def store():
+    store = OfferStore()
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize("url, expected_key", [
+    ("https://www.pracuj.pl/praca/python-developer-lodz,oferta,1004580674?s=3bed36ad", "pracuj:1004580674"),
+    ("https://pracuj.pl/praca/renamed-offer,oferta,1004580674/", "pracuj:1004580674"),
+    ("https://justjoin.it/job-offer/warszawa-javascript-0a939ea0?filters", "justjoin.it/job-offer/warszawa-javascript-0a939ea0"),
+])
+def test_offer_key(url, expected_key):
+    assert offer_key(url) == expected_key
+
+
+def test_membership_uses_normalized_url(store):
+    store.add_urls("pracuj", ["url", "https://www.pracuj.pl/praca/python,oferta,1"])
+
+    assert "https://pracuj.pl/praca/python,oferta,1?searchId=abc" in store
+    assert "https://www.pracuj.pl/praca/python,oferta,2" not in store
+    assert len(store) == 1
+
+
+def test_add_offers_fills_details_of_known_url(store):
+    url = "https://justjoin.it/job-offer/gamma-python"
+    store.add_urls("justjoinit", [url])
+
+    store.add_offers("justjoinit", [JobOffer(employer="Gamma", position="Dev", salary="", requirements="Python", url=url)])
+
+    assert store.count("justjoinit") == 1
+    assert store.conn.execute("SELECT employer FROM offers").fetchone() == ("Gamma",)
+
+
+def sheet_column(urls):
+    """Worksheet whose column E holds the given URLs below a header row."""
+    worksheet = MagicMock()
+
+    def get(cell_range):
+        first, last = (int(cell[1:]) for cell in cell_range.split(":"))
+        return [[url] for url in urls[max(0, first - 2):last - 1]]
+
+    worksheet.get.side_effect = get
+    return worksheet
+
+
+def test_sync_reads_only_rows_appended_since_last_sync(store):
+    column = [f"https://justjoin.it/job-offer/offer-{i}" for i in range(5)]
+    worksheet = sheet_column(column)
+
+    assert store.sync_from_sheet("justjoinit", worksheet, chunk_size=2) == 5
+    assert store.synced_rows("justjoinit") == 6
+
+    worksheet.get.reset_mock()
+    column.append("https://justjoin.it/job-offer/offer-5")
+
+    assert store.sync_from_sheet("justjoinit", worksheet, chunk_size=3) == 1
+    # The last synced row is read again to check the sheet wasn't reordered
+    worksheet.get.assert_called_once_with("E6:E8")
+    assert store.synced_rows("justjoinit") == 7
+
+
+def test_sync_reads_whole_sheet_again_after_rows_were_deleted(store):
+    column = [f"https://justjoin.it/job-offer/offer-{i}" for i in range(5)]
+    store.sync_from_sheet("justjoinit", sheet_column(column), chunk_size=2)
+
+    del column[1:3]
+    column += ["https://justjoin.it/job-offer/offer-5", "https://justjoin.it/job-offer/offer-6"]
+
+    assert store.sync_from_sheet("justjoinit", sheet_column(column), chunk_size=2) == 2
+    assert store.synced_rows("justjoinit") == 6
@@ -0,0 +1,78 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from scrapers.page_pool import PagePool
+
+
+def make_page(heap_mb=10):
+    return MagicMock(is_closed=MagicMock(return_value=False), goto=AsyncMock(), close=AsyncMock(),
+                     evaluate=AsyncMock(return_value=heap_mb * 2 ** 20))
+
+
+@pytest.fixture
+def context():
+    return MagicMock(new_page=AsyncMock(side_effect=lambda: make_page()))
+
+
+async def test_pages_are_reset_and_reused(context):
+    pool = PagePool(context, size=2, name="pracuj")
+
+    for _ in range(5):
+        async with pool.page() as pooled:
+            page = pooled.page
+
+    assert context.new_page.await_count == 1
+    assert pool.stats.created == 1 and pool.stats.reused == 4
+    assert pool.stats.reuse_rate == 0.8
+    page.goto.assert_awaited_with("about:blank")
+    page.close.assert_not_awaited()
+
+
+async def test_page_is_replaced_after_max_uses(context):
+    pool = PagePool(context, size=2, max_uses=3)
+
+    for _ in range(4):
+        async with pool.page():
+            pass
+
+    assert context.new_page.await_count == 2
+    assert pool.stats.recycled == {"max_uses": 1}
+
+
+async def test_page_with_heap_growth_is_replaced():
+    context = MagicMock(new_page=AsyncMock(side_effect=lambda: make_page(heap_mb=300)))
+    pool = PagePool(context, size=2, max_heap_mb=150)
+
+    async with pool.page() as pooled:
+        pass
+
+    pooled.page.close.assert_awaited_once()
+    assert pool.stats.recycled == {"memory": 1}
+    assert pool.stats.heap_mb == [300]
+
+
+async def test_failed_page_is_closed_not_reused(context):
+    pool = PagePool(context, size=2)
+
+    with pytest.raises(TimeoutError):
+        async with pool.page() as pooled:
+            raise TimeoutError()
+
+    pooled.page.close.assert_awaited_once()
+    pooled.page.goto.assert_not_awaited()
+    assert pool.idle == []
+    assert pool.stats.recycled == {"failed": 1}
+
+
+async def test_only_size_idle_pages_are_kept(context):
+    pool = PagePool(context, size=1)
+
+    first, second = await pool.get(), await pool.get()
+    await pool.put(first)
+    await pool.put(second)
+    await pool.close()
+
+    assert pool.stats.recycled == {"surplus": 1}
+    first.page.close.assert_awaited_once()
+    second.page.close.assert_awaited_once()
@@ -0,0 +1,48 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from scrapers.locators import JJIT_OFFER, PRACUJ_OFFER
+from scrapers.parsers import JustJoinItOfferParser, PracujOfferParser
+
+
+def page_mock(fields):
+    page = MagicMock()
+    page.url = "https://example.com/offer"
+    page.locator.return_value.first.wait_for = AsyncMock()
+    page.evaluate = AsyncMock(return_value=fields)
+    return page
+
+
+async def test_pracuj_parser_reads_fields_in_one_evaluate():
+    page = page_mock({"employer": "Acme", "position": "Tester", "salary": "10 000 zł",
+                      "requirements": "Python"})
+
+    offer = await PracujOfferParser(page, PRACUJ_OFFER).parse()
+
+    page.evaluate.assert_awaited_once()
+    assert page.evaluate.call_args.args[1] == [PRACUJ_OFFER.employer, PRACUJ_OFFER.position,
+                                               PRACUJ_OFFER.salary, PRACUJ_OFFER.requirements]
+    assert offer.employer == "Acme"
+    assert offer.url == "https://example.com/offer"
+
+
+async def test_pracuj_parser_accepts_missing_optional_fields():
+    page = page_mock({"employer": None, "position": "Tester", "salary": "", "requirements": None})
+
+    offer = await PracujOfferParser(page, PRACUJ_OFFER).parse()
+
+    assert offer.employer is None
+    assert offer.salary == ""
+    assert offer.requirements == ""
+
+
+async def test_justjoinit_parser_passes_labels():
+    page = page_mock({"employer": "Gamma", "position": "Python Developer",
+                      "salary": "20 000 PLN\n", "requirements": "Python\nDjango"})
+
+    offer = await JustJoinItOfferParser(page, JJIT_OFFER).parse()
+
+    arguments = page.evaluate.call_args.args[1]
+    assert arguments["employer"] == JJIT_OFFER.employer_css
+    assert arguments["requirementsLabel"] == "Tech stack"
+    assert arguments["salaryLabels"] == ["Net per month - B2B", "Gross per month"]
+    assert offer.requirements == "Python\nDjango"
@@ -0,0 +1,84 @@
+import asyncio
+import json
+
+from scrapers.models import JobOffer
+from scrapers.pipeline import JsonlSink, OfferPipeline, OfferSink
+
+
+class RecordingSink(OfferSink):
+    def __init__(self):
+        self.batches = []
+
+    async def write(self, site, offers):
+        self.batches.append((site, [offer.url for offer in offers]))
+
+
+def make_offer(i):
+    return JobOffer(employer="Acme", position="Dev", salary="", requirements="Python", url=f"https://a.pl/{i}")
+
+
+async def test_pipeline_flushes_full_batches_per_site():
+    sink = RecordingSink()
+    async with OfferPipeline([sink], batch_size=3, flush_interval=60) as pipeline:
+        for i in range(3):
+            await pipeline.put("pracuj" if i % 2 else "justjoinit", make_offer(i))
+        await asyncio.sleep(0.01)
+        assert sink.batches == [("justjoinit", ["https://a.pl/0", "https://a.pl/2"]),
+                                ("pracuj", ["https://a.pl/1"])]
+        await pipeline.put("pracuj", make_offer(3))
+
+    assert sink.batches[-1] == ("pracuj", ["https://a.pl/3"])
+    assert pipeline.written == 4
+
+
+async def test_pipeline_flushes_after_interval():
+    sink = RecordingSink()
+    async with OfferPipeline([sink], batch_size=100, flush_interval=0.01) as pipeline:
+        await pipeline.put("pracuj", make_offer(0))
+        await asyncio.sleep(0.05)
+        assert sink.batches == [("pracuj", ["https://a.pl/0"])]
+
+
+async def test_pipeline_put_waits_when_queue_is_full():
+    class SlowSink(RecordingSink):
+        async def write(self, site, offers):
+            await asyncio.sleep(3600)
+
+    pipeline = OfferPipeline([SlowSink()], maxsize=1, batch_size=1)
+    await pipeline.start()
+    await pipeline.put("pracuj", make_offer(0))
+    await pipeline.put("pracuj", make_offer(1))
+
+    blocked_put = asyncio.create_task(pipeline.put("pracuj", make_offer(2)))
+    await asyncio.sleep(0.01)
+    assert not blocked_put.done()
+
+    blocked_put.cancel()
+    pipeline._consumer.cancel()
+
+
+async def test_failed_sink_stops_the_remaining_sinks_of_the_batch():
+    class FailingSink(RecordingSink):
+        async def write(self, site, offers):
+            if site == "pracuj":
+                raise ConnectionError("sheet unavailable")
+            await super().write(site, offers)
+
+    first, bookkeeping = FailingSink(), RecordingSink()
+    async with OfferPipeline([first, bookkeeping], batch_size=2) as pipeline:
+        await pipeline.put("pracuj", make_offer(0))
+        await pipeline.put("justjoinit", make_offer(1))
+
+    assert bookkeeping.batches == [("justjoinit", ["https://a.pl/1"])]
+    assert pipeline.written == 1
+
+
+async def test_jsonl_sink_appends_lines(tmp_path):
+    path = tmp_path / "offers.jsonl"
+    sink = JsonlSink(str(path))
+
+    await sink.write("pracuj", [make_offer(0), make_offer(1)])
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["url"] for line in lines] == ["https://a.pl/0", "https://a.pl/1"]
+    assert lines[0]["site"] == "pracuj"
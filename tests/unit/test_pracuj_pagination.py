@@ -0,0 +1,70 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from scrapers.config import ScraperConfig
+from scrapers.models import JobOffer
+from scrapers.pracuj_scraper import PracujScraper
+
+
+def offer(url):
+    return JobOffer(employer="Acme", position="Dev", salary="", requirements="Python", url=url)
+
+
+@pytest.fixture
+def scraper():
+    scraper = PracujScraper(MagicMock(), MagicMock(), config=ScraperConfig(listing_lookahead=2))
+    scraper.page = MagicMock(url="https://www.pracuj.pl/praca/python;kw?sc=0")
+    scraper.max_page = AsyncMock(return_value=4)
+    scraper.jobs_list = AsyncMock(return_value=["https://www.pracuj.pl/praca/a,1", "https://www.pracuj.pl/praca/b,2"])
+    scraper.scrape_single_offer = AsyncMock(side_effect=offer)
+    return scraper
+
+
+def test_results_page_url_keeps_query():
+    url = PracujScraper.results_page_url("https://www.pracuj.pl/praca/python;kw?sc=0&pn=1", 3)
+    assert url == "https://www.pracuj.pl/praca/python;kw?sc=0&pn=3"
+
+
+async def test_results_pages_are_fetched_ahead(scraper):
+    pages = {2: ["https://www.pracuj.pl/praca/c,3"], 3: ["https://www.pracuj.pl/praca/b,2"], 4: []}
+    scraper.fetch_results_page = AsyncMock(side_effect=lambda url: pages[int(url[-1])])
+
+    offers = [job async for job in scraper.extract_job_data(set())]
+
+    assert sorted(job.url for job in offers) == ["https://www.pracuj.pl/praca/a,1", "https://www.pracuj.pl/praca/b,2",
+                                                  "https://www.pracuj.pl/praca/c,3"]
+    assert [c.args[0][-4:] for c in scraper.fetch_results_page.call_args_list] == ["pn=2", "pn=3", "pn=4"]
+
+
+async def test_duplicate_limit_stops_pagination(scraper):
+    known = {f"https://www.pracuj.pl/praca/known,{i}" for i in range(10)}
+    pages = {2: sorted(known)[:6], 3: sorted(known)[6:] + ["https://www.pracuj.pl/praca/new,99"], 4: ["never"]}
+    scraper.fetch_results_page = AsyncMock(side_effect=lambda url: pages[int(url[-1])])
+
+    offers = [job async for job in scraper.extract_job_data(known)]
+
+    assert len(offers) == 2
+    assert "never" not in [c.args[0] for c in scraper.scrape_single_offer.call_args_list]
+    assert "https://www.pracuj.pl/praca/new,99" not in [c.args[0] for c in scraper.scrape_single_offer.call_args_list]
+
+
+async def test_offers_claimed_by_another_search_are_skipped(scraper):
+    scraper.max_page = AsyncMock(return_value=1)
+    other_search = PracujScraper(MagicMock(), MagicMock(), claimed=scraper.claimed)
+    assert other_search.claim("https://pracuj.pl/praca/renamed,1?s=x")
+
+    offers = [job async for job in scraper.extract_job_data(set())]
+
+    assert [job.url for job in offers] == ["https://www.pracuj.pl/praca/b,2"]
+
+
+async def test_search_enters_keywords_and_location(scraper):
+    scraper.type_text = AsyncMock()
+    scraper.click_locator = AsyncMock()
+
+    await scraper.search("python", "Łódź")
+
+    assert [c.args for c in scraper.type_text.call_args_list] == [(scraper.nav_locators.search_input, "python"),
+                                                                   (scraper.nav_locators.location_input, "Łódź")]
+    scraper.click_locator.assert_awaited_once_with(scraper.nav_locators.search_button)
@@ -0,0 +1,106 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from scrapers.config import ScraperConfig
+from scrapers.metrics import REGISTRY
+from scrapers.models import JobOffer
+from scrapers.pracuj_scraper import PracujScraper
+from scrapers.resilience import AdaptiveTimeout, CircuitBreaker, CircuitOpenError, RetryPolicy
+from scrapers.scheduler import CrawlScheduler, DomainPolicy
+
+URL = "https://www.pracuj.pl/praca/python-developer,oferta,1"
+OFFER = JobOffer(employer="Acme", position="Dev", salary="", requirements="Python", url=URL)
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    REGISTRY.reset()
+    yield REGISTRY
+    REGISTRY.reset()
+
+
+def make_scraper(goto_effects, captcha=False, policy=DomainPolicy(requests_per_second=1000)):
+    pages = []
+
+    def new_page():
+        page = MagicMock(url=URL, goto=AsyncMock(side_effect=goto_effects.pop(0)),
+                         evaluate=AsyncMock(return_value=captcha), close=AsyncMock())
+        pages.append(page)
+        return page
+
+    context = MagicMock(new_page=AsyncMock(side_effect=new_page))
+    config = ScraperConfig(listing_capture=False, block_resources=False, retry_attempts=3, retry_base_delay=0,
+                           retry_max_delay=0, page_load_timeout=20000)
+    scheduler = CrawlScheduler(5, {"pracuj.pl": policy}, page_timeout=config.page_load_timeout)
+    scraper = PracujScraper(context, MagicMock(), config=config, scheduler=scheduler)
+    scraper.get_parser = MagicMock(return_value=MagicMock(parse=AsyncMock(return_value=OFFER)))
+    return scraper, pages
+
+
+def test_timeout_follows_observed_latency():
+    timeout = AdaptiveTimeout(initial_ms=30000, min_ms=2000, min_samples=5)
+    assert timeout.current() == 30000, "too few samples"
+
+    for seconds in (1.0, 1.0, 1.0, 1.5, 2.0):
+        timeout.observe(seconds)
+    assert timeout.current() == 6000
+
+    timeout.observe(60.0)
+    assert timeout.current() == 30000, "capped at the configured timeout"
+
+
+def test_breaker_opens_on_failure_burst_and_probes_after_cooldown():
+    breaker = CircuitBreaker("a.pl", threshold=3, cooldown=0.0)
+    for _ in range(2):
+        breaker.record_failure("timeout")
+    assert breaker.state == "closed"
+
+    breaker.record_failure("timeout")
+    assert breaker.opened_at is not None and breaker.trips == 1
+    assert breaker.allow(), "half-open after the cooldown lets one probe through"
+
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_captcha_opens_breaker_at_once():
+    breaker = CircuitBreaker("a.pl", threshold=5, cooldown=60.0)
+    breaker.record_failure("captcha")
+
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_retry_delay_grows_and_is_capped():
+    policy = RetryPolicy(attempts=5, base_delay=1.0, max_delay=4.0)
+
+    assert 1.0 <= policy.delay(1) <= 2.0
+    assert 2.0 <= policy.delay(2) <= 3.0
+    assert 4.0 <= policy.delay(5) <= 5.0
+
+
+async def test_timeout_is_retried_on_a_fresh_page(registry):
+    scraper, pages = make_scraper([PlaywrightTimeoutError("goto timed out"), None])
+
+    assert await scraper.scrape_single_offer(URL) == OFFER
+    assert len(pages) == 2 and all(page.close.await_count == 1 for page in pages)
+    pages[0].set_default_navigation_timeout.assert_called_once_with(20000)
+    pages[0].set_default_timeout.assert_called_once_with(scraper.config.element_wait_timeout)
+    assert registry.counters["offer_retries"][(("reason", "timeout"), ("site", "pracuj"))] == 1
+
+
+async def test_captcha_is_not_retried_and_pauses_domain(registry):
+    scraper, pages = make_scraper([None, None], captcha=True)
+
+    assert await scraper.scrape_single_offer(URL) is None
+    assert len(pages) == 1
+    assert registry.counters["offer_give_ups"][(("reason", "captcha"), ("site", "pracuj"))] == 1
+
+    assert await scraper.scrape_single_offer(URL) is None
+    assert len(pages) == 1, "open circuit does not open a page"
+    assert registry.counters["offer_give_ups"][(("reason", "circuit_open"), ("site", "pracuj"))] == 1
+    with pytest.raises(CircuitOpenError):
+        async with scraper.scheduler.slot(URL, uses_page=False):
+            pass
@@ -0,0 +1,105 @@
+from pathlib import Path
+
+import httpx
+import pytest
+
+from scrapers.http_extractors import JustJoinItHttpExtractor, PracujHttpExtractor
+from scrapers.listing_capture import PRACUJ_LISTING_API, ListingCapture
+from scrapers.offer_store import OfferStore
+from scrapers.revisit import CLOSED, UNCHANGED, UPDATED, OfferRevisitor
+from scrapers.scheduler import CrawlScheduler, DomainPolicy
+
+BASE = "https://justjoin.it/job-offer/"
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def api_offer(salary_to):
+    return {"title": "Python Developer", "companyName": "Gamma", "requiredSkills": ["Python"],
+            "employmentTypes": [{"from": 10000, "to": salary_to, "currency": "pln", "type": "b2b", "unit": "month"}]}
+
+
+@pytest.fixture
+def store():
+    store = OfferStore()
+    extractor = JustJoinItHttpExtractor(None)
+    offers = [extractor.offer_from_json(BASE + slug, api_offer(15000)) for slug in ("same", "raised", "gone", "etag")]
+    store.add_offers("justjoinit", offers)
+    # As if revisited before, the stored offers come from the same extractor
+    store.conn.execute("UPDATE offers SET revisit_fingerprint = fingerprint")
+    store.record_check(BASE + "etag", etag='"v1"')
+    yield store
+    store.close()
+
+
+def make_revisitor(store, handler, extractor_class=JustJoinItHttpExtractor):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scheduler = CrawlScheduler(policies={"justjoin.it": DomainPolicy(requests_per_second=1000),
+                                         "www.pracuj.pl": DomainPolicy(requests_per_second=1000)})
+    return OfferRevisitor(store, extractor_class(client), scheduler, max_age=3600, interval=0)
+
+
+async def test_revisit_emits_events_and_updates_store(store):
+    requests = {}
+
+    def handler(request):
+        slug = request.url.path.rsplit("/", 1)[-1]
+        requests[slug] = request
+        if slug == "gone":
+            return httpx.Response(404)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=api_offer(18000 if slug == "raised" else 15000), headers={"ETag": '"v2"'})
+
+    revisitor = make_revisitor(store, handler)
+    events = {event.url.rsplit("/", 1)[-1]: event async for event in revisitor.revisit("justjoinit")}
+
+    assert {slug: event.kind for slug, event in events.items()} == {
+        "same": UNCHANGED, "raised": UPDATED, "gone": CLOSED, "etag": UNCHANGED}
+    assert events["raised"].offer.salary == "10000–18000 PLN / b2b month"
+    assert revisitor.stats.not_modified == 1
+    salary, etag = store.conn.execute("SELECT salary, etag FROM offers WHERE url = ?", (BASE + "raised",)).fetchone()
+    assert (salary, etag) == ("10000–18000 PLN / b2b month", '"v2"')
+
+
+async def test_checked_and_closed_offers_are_not_due_again(store):
+    revisitor = make_revisitor(store, lambda request: httpx.Response(410))
+    assert len([event async for event in revisitor.revisit("justjoinit")]) == 4
+
+    assert store.due_for_revisit("justjoinit", max_age=3600, interval=0, limit=10) == []
+
+
+def test_only_scraped_recent_offers_are_due(store):
+    store.add_urls("justjoinit", [BASE + "from-sheet"])
+    store.record_check(BASE + "same")
+
+    due = store.due_for_revisit("justjoinit", max_age=3600, interval=60, limit=10)
+
+    assert [row["url"].rsplit("/", 1)[-1] for row in due] == ["raised", "gone"]
+    assert store.due_for_revisit("justjoinit", max_age=-1, interval=0, limit=10) == []
+
+
+async def test_first_revisit_of_listing_offer_only_records_baseline():
+    store = OfferStore()
+    capture = ListingCapture(PRACUJ_LISTING_API)
+    capture.add_payload((FIXTURES / "pracuj_listing.html").read_text(encoding="utf-8"))
+    url = "https://www.pracuj.pl/praca/python-developer-lodz,oferta,1001"
+    store.add_offers("pracuj", [capture.get(url)])
+    body = (FIXTURES / "pracuj_offer_ld.html").read_text(encoding="utf-8")
+    revisitor = make_revisitor(store, lambda request: httpx.Response(200, text=body), PracujHttpExtractor)
+
+    assert [event.kind async for event in revisitor.revisit("pracuj")] == [UNCHANGED]
+    assert store.conn.execute("SELECT salary FROM offers").fetchone() == ("12 000–18 000 zł brutto / mies.",)
+    assert [event.kind async for event in revisitor.revisit("pracuj")] == [UNCHANGED]
+    store.close()
+
+
+async def test_wrong_shaped_offer_data_does_not_abort_the_revisit(store):
+    def handler(request):
+        if request.url.path.endswith("/raised"):
+            return httpx.Response(200, text='[{"title": "Python Developer"}]')
+        return httpx.Response(200, json=api_offer(15000))
+
+    revisitor = make_revisitor(store, handler)
+    events = [event.url.rsplit("/", 1)[-1] async for event in revisitor.revisit("justjoinit")]
+
+    assert sorted(events) == ["etag", "gone", "same"]
@@ -0,0 +1,40 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from scrapers.routing import RequestBlocker, RoutingRules
+
+
+@pytest.mark.parametrize("resource_type, url, expected", [
+    ("image", "https://www.pracuj.pl/logo.png", True),
+    ("font", "https://fonts.gstatic.com/font.woff2", True),
+    ("script", "https://www.googletagmanager.com/gtm.js", True),
+    ("script", "https://www.pracuj.pl/app.js", False),
+    ("document", "https://www.pracuj.pl/praca/python,1", False),
+    ("image", "https://cdn.example.com/allowed/logo.png", False),
+])
+def test_should_block(resource_type, url, expected):
+    blocker = RequestBlocker(RoutingRules(allowed_url_patterns=("/allowed/",)))
+    assert blocker.should_block(resource_type, url) is expected
+
+
+async def test_attach_counts_blocked_requests():
+    blocker = RequestBlocker(RoutingRules())
+    page = MagicMock()
+    page.route = AsyncMock()
+    stats = await blocker.attach(page)
+    handler = page.route.call_args.args[1]
+
+    routes = []
+    for resource_type, url in [("image", "https://a.pl/1.png"), ("document", "https://a.pl/")]:
+        route = MagicMock(abort=AsyncMock(), fallback=AsyncMock())
+        route.request.resource_type = resource_type
+        route.request.url = url
+        await handler(route)
+        routes.append(route)
+
+    assert stats.requests == 1
+    assert stats.by_type == {"image": 1}
+    assert stats.estimated_bytes > 0
+    assert blocker.totals.requests == 1
+    routes[1].fallback.assert_awaited_once()
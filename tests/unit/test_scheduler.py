@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from scrapers.resilience import CircuitOpenError
+from scrapers.scheduler import CrawlScheduler, DomainPolicy
+
+FAST_POLICY = DomainPolicy(max_concurrency=4, initial_concurrency=2, requests_per_second=1000)
+
+
+async def run_concurrently(scheduler, urls, hold=0.01):
+    peak = {"pages": 0, "current": 0}
+
+    async def request(url):
+        async with scheduler.slot(url):
+            peak["current"] += 1
+            peak["pages"] = max(peak["pages"], peak["current"])
+            await asyncio.sleep(hold)
+            peak["current"] -= 1
+
+    await asyncio.gather(*(request(url) for url in urls))
+    return peak["pages"]
+
+
+async def test_global_page_budget_is_shared_by_domains():
+    scheduler = CrawlScheduler(max_open_pages=3, policies={"a.pl": FAST_POLICY, "b.pl": FAST_POLICY})
+    urls = [f"https://www.a.pl/{i}" for i in range(6)] + [f"https://b.pl/{i}" for i in range(6)]
+
+    assert await run_concurrently(scheduler, urls) == 3
+
+
+async def test_domain_limit_is_applied():
+    scheduler = CrawlScheduler(max_open_pages=10, policies={"a.pl": FAST_POLICY})
+
+    assert await run_concurrently(scheduler, [f"https://a.pl/{i}" for i in range(8)]) <= 4
+    assert scheduler.domain("https://api.a.pl/x").name == "a.pl"
+
+
+async def test_limit_grows_on_success_and_halves_on_failure():
+    scheduler = CrawlScheduler(max_open_pages=10, policies={"a.pl": FAST_POLICY})
+    state = scheduler.domain("https://a.pl/")
+
+    for _ in range(10):
+        async with scheduler.slot("https://a.pl/"):
+            pass
+    assert state.limit == FAST_POLICY.max_concurrency
+
+    async with scheduler.slot("https://a.pl/") as ticket:
+        ticket.failed()
+    assert state.limit == FAST_POLICY.max_concurrency / 2
+
+    with pytest.raises(RuntimeError):
+        async with scheduler.slot("https://a.pl/"):
+            raise RuntimeError("captcha")
+    assert state.limit == FAST_POLICY.max_concurrency / 2, "one congestion window halves the limit once"
+    assert scheduler.snapshot()["a.pl"]["failed"] == 2
+    assert state.in_flight == 0
+
+
+async def test_queued_requests_are_refused_when_breaker_opens_while_waiting():
+    scheduler = CrawlScheduler(max_open_pages=1, policies={"a.pl": FAST_POLICY})
+    state = scheduler.domain("https://a.pl/")
+    sent = []
+
+    async def request(i):
+        async with scheduler.slot(f"https://a.pl/{i}") as ticket:
+            sent.append(i)
+            if i == 0:
+                await asyncio.sleep(0.01)
+                ticket.failed("captcha")
+
+    results = await asyncio.gather(*(request(i) for i in range(4)), return_exceptions=True)
+
+    assert sent == [0]
+    assert all(isinstance(result, CircuitOpenError) for result in results[1:])
+    assert state.in_flight == 0
+    assert scheduler.snapshot()["a.pl"]["completed"] == 1
@@ -0,0 +1,69 @@
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+from scrapers.session_state import SessionStateManager
+
+
+def make_context(cookies):
+    async def storage_state(path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"cookies": cookies, "origins": []}, f)
+    return MagicMock(storage_state=AsyncMock(side_effect=storage_state))
+
+
+CONSENT = [{"name": "gp__cfXfiDZP", "value": "1", "expires": time.time() + 86400}]
+
+
+async def test_saved_session_is_reused_and_known_good(tmp_path):
+    sessions = SessionStateManager(str(tmp_path))
+    assert sessions.choose("pracuj") is None
+    assert not sessions.known_good("pracuj")
+    assert await sessions.save("pracuj", make_context(CONSENT))
+    sessions.forget("pracuj")
+
+    assert sessions.choose("pracuj") == str(tmp_path / "pracuj-0.json")
+    assert sessions.known_good("pracuj")
+    assert sessions.load_slots("pracuj")[0].uses == 1
+
+
+async def test_expired_cookies_make_state_stale(tmp_path):
+    sessions = SessionStateManager(str(tmp_path))
+    sessions.choose("pracuj")
+    await sessions.save("pracuj", make_context([{"name": "consent", "value": "1", "expires": 1.0}]))
+    sessions.forget("pracuj")
+
+    assert sessions.choose("pracuj") is not None
+    assert not sessions.known_good("pracuj")
+
+
+async def test_challenged_session_is_not_saved_and_rotated(tmp_path):
+    sessions = SessionStateManager(str(tmp_path), slots=2)
+    sessions.choose("pracuj")
+    await sessions.save("pracuj", make_context(CONSENT))
+    sessions.forget("pracuj")
+
+    sessions.choose("pracuj")
+    sessions.challenged("pracuj")
+    context = make_context(CONSENT)
+    assert not await sessions.save("pracuj", context)
+    context.storage_state.assert_not_awaited()
+    sessions.forget("pracuj")
+
+    # Slot 0 rests, a fresh session is started and saved to the empty slot 1
+    assert sessions.choose("pracuj") is None
+    assert sessions.active["pracuj"].slot == 1
+    await sessions.save("pracuj", make_context(CONSENT))
+    sessions.forget("pracuj")
+    assert sessions.choose("pracuj") == str(tmp_path / "pracuj-1.json")
+    assert sessions.load_slots("pracuj")[0].challenges == 1
+
+
+async def test_old_session_is_not_used(tmp_path):
+    sessions = SessionStateManager(str(tmp_path), max_age=60)
+    sessions.choose("justjoinit")
+    await sessions.save("justjoinit", make_context(CONSENT))
+    sessions.forget("justjoinit")
+
+    slots = sessions.load_slots("justjoinit")
+    assert sessions.validate("justjoinit", 0, slots[0], now=time.time() + 120) == (False, False)
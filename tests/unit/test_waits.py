@@ -0,0 +1,26 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from scrapers.waits import Waits
+
+
+async def test_wait_records_duration_when_condition_is_met():
+    waits = Waits(timeout=1000)
+    locator = MagicMock()
+    locator.first.wait_for = AsyncMock()
+
+    assert await waits.for_locator(locator, "results") is True
+
+    locator.first.wait_for.assert_awaited_once_with(state="visible", timeout=1000)
+    assert len(waits.timings["results"]) == 1
+
+
+async def test_wait_returns_false_on_timeout():
+    waits = Waits()
+    page = MagicMock()
+    page.wait_for_function = AsyncMock(side_effect=PlaywrightTimeoutError("timeout"))
+
+    assert await waits.for_condition(page, "() => false", "new links", polling=50, timeout=10) is False
+    assert page.wait_for_function.call_args.kwargs["polling"] == 50
+    assert "new links" in waits.timings
@@ -0,0 +1,78 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from scrapers.work_queue import DONE, FAILED, LEASED, PENDING, WorkQueue
+from worker import process_item
+
+URLS = [f"https://justjoin.it/job-offer/offer-{i}" for i in range(4)]
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.db"))
+    yield queue
+    queue.close()
+
+
+def test_enqueue_skips_known_offers(queue):
+    assert queue.enqueue("justjoinit", URLS) == 4
+    assert queue.enqueue("justjoinit", [URLS[0] + "?filters"]) == 0
+    assert queue.counts() == {PENDING: 4}
+
+
+def test_workers_never_lease_the_same_item(queue, tmp_path):
+    queue.enqueue("justjoinit", URLS)
+    other_process = WorkQueue(str(tmp_path / "queue.db"))
+
+    first = queue.lease("a", limit=3, lease_seconds=60)
+    second = other_process.lease("b", limit=3, lease_seconds=60)
+    other_process.close()
+
+    assert [item.url for item in first] == URLS[:3]
+    assert [item.url for item in second] == URLS[3:]
+
+
+def test_nack_requeues_until_max_attempts(queue):
+    queue.enqueue("justjoinit", URLS[:1])
+
+    for attempt in range(1, 3):
+        [item] = queue.lease("a", limit=1, lease_seconds=60)
+        assert item.attempts == attempt
+        assert not queue.nack(item.url, "b", max_attempts=2), "only the lease owner can nack"
+        requeued = queue.nack(item.url, "a", max_attempts=2)
+
+    assert not requeued
+    assert queue.counts() == {FAILED: 1}
+
+
+def test_expired_lease_of_crashed_worker_is_reclaimed(queue):
+    queue.enqueue("justjoinit", URLS[:2])
+    queue.lease("crashed", limit=2, lease_seconds=-1)
+    queue.ack(URLS[0])
+
+    assert queue.reclaim_expired() == 1
+    assert [item.url for item in queue.lease("b", limit=5, lease_seconds=60)] == [URLS[1]]
+    assert queue.counts() == {DONE: 1, LEASED: 1}
+
+
+def test_lease_only_from_own_shard(tmp_path):
+    queue = WorkQueue(str(tmp_path / "sharded.db"), shards=2)
+    queue.enqueue("justjoinit", URLS)
+
+    shards = [{item.key for item in queue.lease(f"w{shard}", 10, 60, shard=shard)} for shard in range(2)]
+    queue.close()
+
+    assert shards[0].isdisjoint(shards[1])
+    assert len(shards[0] | shards[1]) == 4
+
+
+async def test_stored_offer_is_acked_without_scraping(queue):
+    queue.enqueue("justjoinit", URLS[:1])
+    [item] = queue.lease("a", limit=1, lease_seconds=60)
+    scraper = AsyncMock()
+
+    await process_item(item, scraper, "a", queue, {URLS[0]}, AsyncMock(), None)
+
+    scraper.scrape_single_offer.assert_not_called()
+    assert queue.counts() == {DONE: 1}
@@ -0,0 +1,113 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+
+from loguru import logger
+
+from google_sheets_client import GoogleSheetClient
+from main import SCRAPERS, create_sinks, near_duplicate_index_for, page_pool_for, session_manager_for, storage_state_for
+from scrapers.browser_pool import BrowserPool
+from scrapers.config import ScraperConfig
+from scrapers.http_extractors import create_http_client
+from scrapers.metrics import REGISTRY
+from scrapers.offer_store import OfferStore
+from scrapers.pipeline import AckSink, OfferPipeline
+from scrapers.scheduler import CrawlScheduler
+from scrapers.work_queue import WorkItem, WorkQueue
+
+
+async def process_item(item: WorkItem, scraper, name, queue, store, pipeline, config) -> None:
+    """Scrape a leased offer, the AckSink acks it once the offer is written."""
+    if item.url in store:
+        # Written by a worker that crashed before acking
+        queue.ack(item.url)
+        return
+    try:
+        offer = await scraper.scrape_single_offer(item.url)
+        error = "no offer data"
+    except Exception as e:
+        offer, error = None, repr(e)
+    if offer:
+        await pipeline.put(item.site, offer)
+    elif not queue.nack(item.url, name, config.work_max_attempts, error):
+        logger.warning(f"Gave up on {item.url} after {item.attempts} attempts: {error}")
+
+
+async def run_worker(name, shard=None, follow=False):
+    """
+    Lease offer URLs from the work queue and scrape them until the queue is empty.
+
+    Args:
+        name (str): Worker name, unique across processes and machines.
+        shard (int | None): Only take URLs of this shard.
+        follow (bool): Keep polling for new URLs instead of exiting on an empty queue.
+    """
+    config = ScraperConfig.from_env()
+    queue = WorkQueue(config.work_queue_path, config.work_queue_shards)
+    store = OfferStore(config.offer_store_path)
+    gc = GoogleSheetClient(config.credentials_path)
+    gc.open_spreadsheet(config.spreadsheet_name)
+    # Seeded with the offers stored when the worker starts, offers of other workers stored later are not compared
+    near_duplicates = near_duplicate_index_for(config, store)
+    sinks = create_sinks(config, gc, store, near_duplicates=near_duplicates) + [AckSink(queue)]
+    http_client = create_http_client(config) if config.http_fast_path else None
+    scheduler = CrawlScheduler.from_config(config)
+    batch_size = max(1, config.max_open_pages * 2)
+    processed = 0
+    try:
+        async with OfferPipeline(sinks, config.pipeline_queue_size, config.pipeline_batch_size,
+                                 config.pipeline_flush_interval, near_duplicates) as pipeline:
+            async with BrowserPool(headless=config.headless, sessions=session_manager_for(config)) as pool:
+                scrapers = {}
+                for scraper_class in SCRAPERS:
+                    context = await pool.acquire(scraper_class.site, storage_state_for(scraper_class))
+                    scraper = scraper_class(context, pool.browser, config.max_open_pages, config, http_client,
+                                            scheduler)
+                    scraper.page_pool = page_pool_for(pool, scraper_class.site, config)
+                    scraper.sessions = pool.sessions
+                    scrapers[scraper_class.site] = scraper
+                while True:
+                    items = queue.lease(name, batch_size, config.work_lease_seconds, shard)
+                    if not items:
+                        if not follow and not queue.unfinished():
+                            break
+                        await asyncio.sleep(config.work_poll_interval)
+                        continue
+                    await asyncio.gather(*(process_item(item, scrapers[item.site], name, queue, store, pipeline,
+                                                        config) for item in items))
+                    processed += len(items)
+        logger.info(f"Worker {name} finished after {processed} items, queue: {queue.counts()}")
+    finally:
+        logger.info(f"Worker {name} summary:\n{REGISTRY.summary_table()}")
+        if http_client:
+            await http_client.aclose()
+        queue.close()
+        store.close()
+
+
+def start_worker(index, shard, follow):
+    name = f"{socket.gethostname()}-{os.getpid()}-{index}"
+    asyncio.run(run_worker(name, shard, follow))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape offers queued by `main.py --coordinator`.")
+    parser.add_argument("--processes", type=int, default=1, help="number of worker processes to start")
+    parser.add_argument("--shard", type=int, default=None, help="only take offers of this shard")
+    parser.add_argument("--follow", action="store_true", help="keep waiting for new offers when the queue is empty")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.processes == 1:
+        start_worker(0, args.shard, args.follow)
+    else:
+        processes = [multiprocessing.Process(target=start_worker, args=(i, args.shard, args.follow))
+                     for i in range(args.processes)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()